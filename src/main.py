@@ -1,4 +1,5 @@
 import sys
+from pathlib import Path
 from typing import cast
 
 from prometheus_client import start_http_server
@@ -11,16 +12,23 @@ from src.metrics.logging import logging
 from src.metrics.prometheus.basic import ENV_VARIABLES_INFO, BUILD_INFO
 from src.modules.accounting.accounting import Accounting
 from src.modules.ejector.ejector import Ejector
+from src.providers.consensus.slots_index import SlotsIndex
+from src.providers.consensus.snapshots import ValidatorsSnapshotStore
+from src.providers.keys.store import LidoKeysStore
 from src.typings import OracleModule
 from src.utils.build import get_build_info
+from src.web3py.batch_provider import BatchMultiProvider
 from src.web3py.extensions import (
     LidoContracts,
     TransactionUtils,
     ConsensusClientModule,
     KeysAPIClientModule,
     LidoValidatorsProvider,
+    ValidatorSetStatsProvider,
 )
+from src.web3py.events_index import EventsIndex
 from src.web3py.middleware import metrics_collector
+from src.web3py.responses_cache import ELResponsesCache, construct_responses_cache_middleware
 from src.web3py.typings import Web3
 
 from src.web3py.contract_tweak import tweak_w3_contracts
@@ -56,7 +64,7 @@ def main(module_name: OracleModule):
     start_http_server(variables.PROMETHEUS_PORT)
 
     logger.info({'msg': 'Initialize multi web3 provider.'})
-    web3 = Web3(MultiProvider(variables.EXECUTION_CLIENT_URI))
+    web3 = Web3(BatchMultiProvider(variables.EXECUTION_CLIENT_URI))
 
     logger.info({'msg': 'Modify web3 with custom contract function call.'})
     tweak_w3_contracts(web3)
@@ -64,35 +72,69 @@ def main(module_name: OracleModule):
     logger.info({'msg': 'Initialize consensus client.'})
     cc = ConsensusClientModule(variables.CONSENSUS_CLIENT_URI, web3)
 
+    if variables.CACHE_PATH:
+        logger.info({'msg': 'Initialize validators snapshots store.'})
+        cc.validators_snapshots = ValidatorsSnapshotStore(
+            Path(variables.CACHE_PATH) / 'validators',
+            variables.VALIDATORS_SNAPSHOTS_MAX_SIZE_MB * 2 ** 20,
+        )
+
+        logger.info({'msg': 'Load slots index.'})
+        cc.slots_index = SlotsIndex(
+            Path(variables.CACHE_PATH) / 'slots.index',
+            cc.get_genesis().genesis_validators_root,
+        )
+
     logger.info({'msg': 'Initialize keys api client.'})
     kac = KeysAPIClientModule(variables.KEYS_API_URI, web3)
+    # Keys are kept in memory if cache path is not set
+    kac.keys_store = LidoKeysStore(Path(variables.CACHE_PATH) / 'keys' if variables.CACHE_PATH else None)
 
     web3.attach_modules({
         'lido_contracts': LidoContracts,
         'lido_validators': LidoValidatorsProvider,
+        'validator_set_stats': ValidatorSetStatsProvider,
         'transaction': TransactionUtils,
         'cc': lambda: cc,  # type: ignore[dict-item]
         'kac': lambda: kac,  # type: ignore[dict-item]
     })
 
+    # Events logs are kept in memory if cache path is not set
+    web3.lido_contracts.events_index = EventsIndex(
+        Path(variables.CACHE_PATH) / 'events.sqlite' if variables.CACHE_PATH else None,
+    )
+
     logger.info({'msg': 'Add metrics middleware for ETH1 requests.'})
     web3.middleware_onion.add(metrics_collector)
     web3.middleware_onion.add(simple_cache_middleware)
 
+    if variables.CACHE_PATH:
+        logger.info({'msg': 'Add persistent cache middleware for ETH1 responses.'})
+        responses_cache = ELResponsesCache(
+            Path(variables.CACHE_PATH) / 'el_responses.sqlite',
+            variables.EL_RESPONSES_CACHE_MAX_SIZE_MB * 2 ** 20,
+        )
+        # Innermost, so raw responses are cached
+        web3.middleware_onion.inject(construct_responses_cache_middleware(responses_cache), layer=0)
+
     logger.info({'msg': 'Sanity checks.'})
     check_providers_chain_ids(web3)
 
-    if module_name == OracleModule.ACCOUNTING:
-        logger.info({'msg': 'Initialize Accounting module.'})
-        accounting = Accounting(web3)
-        accounting.check_contract_configs()
-        accounting.run_as_daemon()
-        #  todo  EJECTOR 上报的内容是什么？ 对应什么预言机？
-    elif module_name == OracleModule.EJECTOR:
-        logger.info({'msg': 'Initialize Ejector module.'})
-        ejector = Ejector(web3)
-        ejector.check_contract_configs()
-        ejector.run_as_daemon()
+    try:
+        if module_name == OracleModule.ACCOUNTING:
+            logger.info({'msg': 'Initialize Accounting module.'})
+            accounting = Accounting(web3)
+            accounting.check_contract_configs()
+            accounting.run_as_daemon()
+            #  todo  EJECTOR 上报的内容是什么？ 对应什么预言机？
+        elif module_name == OracleModule.EJECTOR:
+            logger.info({'msg': 'Initialize Ejector module.'})
+            ejector = Ejector(web3)
+            ejector.check_contract_configs()
+            ejector.run_as_daemon()
+    finally:
+        logger.info({'msg': 'Close consensus client connections.'})
+        cc.close()
 
 
 def check_required_variables():
@@ -58,12 +58,47 @@ KEYS_API_REQUESTS_DURATION = Histogram(
     namespace=PROMETHEUS_PREFIX,
 )
 
+CL_REQUESTS_COALESCED = Counter(
+    'cl_requests_coalesced',
+    'Count of requests to CL API answered by the same in-flight request',
+    ['endpoint'],
+    namespace=PROMETHEUS_PREFIX,
+)
+
+KEYS_API_REQUESTS_COALESCED = Counter(
+    'keys_api_requests_coalesced',
+    'Count of requests to Keys API answered by the same in-flight request',
+    ['endpoint'],
+    namespace=PROMETHEUS_PREFIX,
+)
+
 KEYS_API_LATEST_BLOCKNUMBER = Gauge(
     'keys_api_latest_blocknumber',
     'Latest blocknumber from Keys API metadata',
     namespace=PROMETHEUS_PREFIX,
 )
 
+CACHE_HITS = Counter(
+    'cache_hits',
+    'Count of cache hits by region',
+    ['region'],
+    namespace=PROMETHEUS_PREFIX,
+)
+
+CACHE_MISSES = Counter(
+    'cache_misses',
+    'Count of cache misses by region',
+    ['region'],
+    namespace=PROMETHEUS_PREFIX,
+)
+
+CACHE_SIZE = Gauge(
+    'cache_size',
+    'Count of entries in the cache region',
+    ['region'],
+    namespace=PROMETHEUS_PREFIX,
+)
+
 TRANSACTIONS_COUNT = Counter(
     'transactions_count',
     'Total count of transactions. Success or failure',
@@ -1,6 +1,5 @@
 import logging
 from collections import defaultdict
-from functools import lru_cache
 from time import sleep
 
 from web3.types import Wei
@@ -21,7 +20,9 @@ from src.services.withdrawal import Withdrawal
 from src.services.bunker import BunkerService
 from src.typings import BlockStamp, Gwei, ReferenceBlockStamp
 from src.utils.abi import named_tuple_to_dataclass
+from src.utils.cache import cached
 from src.variables import ALLOW_NEGATIVE_REBASE_REPORTING
+from src.web3py.batch_provider import batch_requests
 from src.web3py.typings import Web3
 from src.web3py.extensions.lido_validators import StakingModule, NodeOperatorGlobalIndex, StakingModuleId
 
@@ -84,7 +85,7 @@ class Accounting(BaseModule, ConsensusModule):
         self.w3.transaction.check_and_send_transaction(tx, variables.ACCOUNT)
 
     # Consensus module: main build report method
-    @lru_cache(maxsize=1)
+    @cached()
     @duration_meter()
     def build_report(self, blockstamp: ReferenceBlockStamp) -> tuple:
         report_data = self._calculate_report(blockstamp)
@@ -118,7 +119,7 @@ class Accounting(BaseModule, ConsensusModule):
         logger.warning({'msg': '!' * 50})
         return ALLOW_NEGATIVE_REBASE_REPORTING
 
-    @lru_cache(maxsize=1)
+    @cached()
     def _get_processing_state(self, blockstamp: BlockStamp) -> AccountingProcessingState:
         ps = named_tuple_to_dataclass(
             self.report_contract.functions.getProcessingState().call(block_identifier=blockstamp.block_hash),
@@ -191,7 +192,7 @@ class Accounting(BaseModule, ConsensusModule):
 
         return list(module_stats.keys()), list(module_stats.values())
 
-    @lru_cache(maxsize=1)
+    @cached()
     def _get_consensus_lido_state(self, blockstamp: ReferenceBlockStamp) -> tuple[int, Gwei]:
         lido_validators = self.w3.lido_validators.get_lido_validators(blockstamp)
 
@@ -206,8 +207,10 @@ class Accounting(BaseModule, ConsensusModule):
         frame_config = self.get_frame_config(blockstamp)
 
         is_bunker = self._is_bunker(blockstamp)
-        withdrawal_vault_balance = self.w3.lido_contracts.get_withdrawal_balance(blockstamp)
-        el_rewards_vault_balance = self.w3.lido_contracts.get_el_vault_balance(blockstamp)
+        withdrawal_vault_balance, el_rewards_vault_balance = batch_requests(self.w3, [
+            lambda: self.w3.lido_contracts.get_withdrawal_balance(blockstamp),
+            lambda: self.w3.lido_contracts.get_el_vault_balance(blockstamp),
+        ])
         finalization_share_rate = self._get_finalization_shares_rate(blockstamp)
 
         withdrawal_service = Withdrawal(self.w3, blockstamp, chain_config, frame_config)
@@ -220,7 +223,7 @@ class Accounting(BaseModule, ConsensusModule):
         logger.info({'msg': 'Calculate last withdrawal id to finalize.', 'value': withdrawal_batches})
         return withdrawal_batches
 
-    @lru_cache(maxsize=1)
+    @cached()
     def _get_finalization_shares_rate(self, blockstamp: ReferenceBlockStamp) -> int:
         simulation = self.simulate_full_rebase(blockstamp)
         shares_rate = simulation.post_total_pooled_ether * SHARE_RATE_PRECISION_E27 // simulation.post_total_shares
@@ -303,7 +306,7 @@ class Accounting(BaseModule, ConsensusModule):
 
         return slots_elapsed
 
-    @lru_cache(maxsize=1)
+    @cached()
     def _is_bunker(self, blockstamp: ReferenceBlockStamp) -> bool:
         frame_config = self.get_frame_config(blockstamp)
         chain_config = self.get_chain_config(blockstamp)
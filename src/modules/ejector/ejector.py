@@ -1,5 +1,6 @@
 import logging
-from functools import lru_cache, reduce
+from bisect import bisect_right
+from itertools import accumulate
 
 from web3.types import Wei
 
@@ -23,11 +24,9 @@ from src.services.prediction import RewardsPredictionService
 from src.services.validator_state import LidoValidatorStateService
 from src.typings import BlockStamp, EpochNumber, ReferenceBlockStamp
 from src.utils.abi import named_tuple_to_dataclass
-from src.utils.validator_state import (
-    is_active_validator,
-    is_fully_withdrawable_validator,
-    is_partially_withdrawable_validator,
-)
+from src.utils.cache import cached
+from src.utils.validator_state import is_fully_withdrawable_validator
+from src.web3py.batch_provider import batch_requests
 from src.web3py.extensions.lido_validators import LidoValidator, NodeOperatorGlobalIndex
 from src.web3py.typings import Web3
 
@@ -91,7 +90,7 @@ class Ejector(BaseModule, ConsensusModule):
         self.process_report(report_blockstamp)
         return ModuleExecuteDelay.NEXT_SLOT
 
-    @lru_cache(maxsize=1)
+    @cached()
     @duration_meter()
     def build_report(self, blockstamp: ReferenceBlockStamp) -> tuple:
         validators: list[tuple[NodeOperatorGlobalIndex, LidoValidator]] = self.get_validators_to_eject(blockstamp)
@@ -174,35 +173,40 @@ class Ejector(BaseModule, ConsensusModule):
     def _is_paused(self, blockstamp: ReferenceBlockStamp) -> bool:
         return self.report_contract.functions.isPaused().call(block_identifier=blockstamp.block_hash)
 
-    @lru_cache(maxsize=1)
     def _get_withdrawable_lido_validators_balance(self, blockstamp: BlockStamp, on_epoch: EpochNumber) -> Wei:
-        lido_validators = self.w3.lido_validators.get_lido_validators(blockstamp=blockstamp)
+        withdrawable_epochs, cumulative_balances = self._get_lido_validators_withdrawals(blockstamp)
+        withdrawn_count = bisect_right(withdrawable_epochs, on_epoch)
+        return Wei(cumulative_balances[withdrawn_count - 1]) if withdrawn_count else Wei(0)
 
-        def get_total_withdrawable_balance(balance: Wei, validator: Validator) -> Wei:
-            if is_fully_withdrawable_validator(validator, on_epoch):
-                balance = Wei(
-                    balance + self._get_predicted_withdrawable_balance(validator)
-                )
+    @cached()
+    def _get_lido_validators_withdrawals(self, blockstamp: BlockStamp) -> tuple[list[int], list[int]]:
+        """
+        Returns withdrawable epochs of lido validators in ascending order
+        and cumulative predicted withdrawable balances of the validators in the same order.
 
-            return balance
+        Validator is fully withdrawable on epoch if it is fully withdrawable at all and its withdrawable epoch has come,
+        so withdrawable balance on any epoch is a prefix sum found with binary search.
+        """
+        lido_validators = self.w3.lido_validators.get_lido_validators(blockstamp=blockstamp)
 
-        result = reduce(
-            get_total_withdrawable_balance,
-            lido_validators,
-            Wei(0),
+        withdrawals = sorted(
+            (int(validator.validator.withdrawable_epoch), self._get_predicted_withdrawable_balance(validator))
+            for validator in lido_validators
+            # Withdrawable epoch is checked separately
+            if is_fully_withdrawable_validator(validator, EpochNumber(FAR_FUTURE_EPOCH))
         )
 
-        return result
+        return [epoch for epoch, _ in withdrawals], list(accumulate(balance for _, balance in withdrawals))
 
     def _get_predicted_withdrawable_balance(self, validator: Validator) -> Wei:
         return self.w3.to_wei(min(int(validator.balance), MAX_EFFECTIVE_BALANCE), 'gwei')
 
     def _get_total_el_balance(self, blockstamp: BlockStamp) -> Wei:
-        total_el_balance = Wei(
-            self.w3.lido_contracts.get_el_vault_balance(blockstamp) +
-            self.w3.lido_contracts.get_withdrawal_balance(blockstamp) +
-            self._get_buffer_ether(blockstamp)
-        )
+        total_el_balance = Wei(sum(batch_requests(self.w3, [
+            lambda: self.w3.lido_contracts.get_el_vault_balance(blockstamp),
+            lambda: self.w3.lido_contracts.get_withdrawal_balance(blockstamp),
+            lambda: self._get_buffer_ether(blockstamp),
+        ])))
         logger.info({'msg': 'Calculate total el balance.', 'value': total_el_balance})
         return total_el_balance
 
@@ -257,49 +261,23 @@ class Ejector(BaseModule, ConsensusModule):
         """
         return blockstamp.ref_epoch + 1 + MAX_SEED_LOOKAHEAD
 
-    @lru_cache(maxsize=1)
-    def _get_latest_exit_epoch(self, blockstamp: BlockStamp) -> tuple[EpochNumber, int]:
+    def _get_latest_exit_epoch(self, blockstamp: ReferenceBlockStamp) -> tuple[EpochNumber, int]:
         """
         Returns the latest exit epoch and amount of validators that are exiting in this epoch
         """
-        max_exit_epoch_number = EpochNumber(0)
-        latest_to_exit_validators_count = 0
-
-        for validator in self.w3.cc.get_validators(blockstamp):
-            val_exit_epoch = EpochNumber(int(validator.validator.exit_epoch))
-
-            if val_exit_epoch == FAR_FUTURE_EPOCH:
-                continue
-
-            if val_exit_epoch == max_exit_epoch_number:
-                latest_to_exit_validators_count += 1
-
-            elif val_exit_epoch > max_exit_epoch_number:
-                max_exit_epoch_number = val_exit_epoch
-                latest_to_exit_validators_count = 1
-
-        return max_exit_epoch_number, latest_to_exit_validators_count
+        stats = self.w3.validator_set_stats.get_validator_set_stats(blockstamp)
+        return stats.max_exit_epoch, stats.max_exit_epoch_validators_count
 
     def _get_sweep_delay_in_epochs(self, blockstamp: ReferenceBlockStamp):
-        validators = self.w3.cc.get_validators(blockstamp)
-
-        total_withdrawable_validators = len(list(filter(lambda validator: (
-            # 判断validator是否可以部分提款
-            is_partially_withdrawable_validator(validator) or
-            # 判断验证者是否可以全额提款
-            is_fully_withdrawable_validator(validator, blockstamp.ref_epoch)
-        ), validators)))
+        total_withdrawable_validators = self.w3.validator_set_stats.get_validator_set_stats(
+            blockstamp
+        ).withdrawable_validators_count
 
         chain_config = self.get_chain_config(blockstamp)
         return int(total_withdrawable_validators * self.AVG_EXPECTING_WITHDRAWALS_SWEEP_DURATION_MULTIPLIER / MAX_WITHDRAWALS_PER_PAYLOAD / chain_config.slots_per_epoch)
 
-    @lru_cache(maxsize=1)
     def _get_churn_limit(self, blockstamp: ReferenceBlockStamp) -> int:
-        total_active_validators = reduce(
-            lambda total, validator: total + int(is_active_validator(validator, blockstamp.ref_epoch)),
-            self.w3.cc.get_validators(blockstamp),
-            0,
-        )
+        total_active_validators = self.w3.validator_set_stats.get_validator_set_stats(blockstamp).active_validators_count
         return max(MIN_PER_EPOCH_CHURN_LIMIT, total_active_validators // CHURN_LIMIT_QUOTIENT)
 
     def _get_processing_state(self, blockstamp: BlockStamp) -> EjectorProcessingState:
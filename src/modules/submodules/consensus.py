@@ -1,6 +1,5 @@
 import logging
 from abc import ABC, abstractmethod
-from functools import lru_cache
 from time import sleep
 from typing import Optional
 
@@ -21,7 +20,9 @@ from src.modules.submodules.exceptions import IsNotMemberException, Incompatible
 from src.modules.submodules.typings import ChainConfig, MemberInfo, ZERO_HASH, CurrentFrame, FrameConfig
 from src.utils.abi import named_tuple_to_dataclass
 from src.utils.blockstamp import build_blockstamp
+from src.utils.cache import CACHE, cached
 from src.utils.slot import get_reference_blockstamp
+from src.web3py.multicall import aggregate_calls
 from src.web3py.typings import Web3
 
 logger = logging.getLogger(__name__)
@@ -62,7 +63,7 @@ class ConsensusModule(ABC):
                              f'Beacon chain config: {genesis_time=}, {cc_config.SECONDS_PER_SLOT=}, {cc_config.SLOTS_PER_EPOCH=}')
 
     # ----- Web3 data requests -----
-    @lru_cache(maxsize=1)
+    @cached()
     def _get_consensus_contract(self, blockstamp: BlockStamp) -> Contract | AsyncContract:
         return self.w3.eth.contract(
             address=self._get_consensus_contract_address(blockstamp),
@@ -78,7 +79,7 @@ class ConsensusModule(ABC):
         members, last_reported_ref_slots = consensus_contract.functions.getMembers().call(block_identifier=blockstamp.block_hash)
         return members, last_reported_ref_slots
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_chain_config(self, blockstamp: BlockStamp) -> ChainConfig:
         consensus_contract = self._get_consensus_contract(blockstamp)
         cc = named_tuple_to_dataclass(
@@ -88,7 +89,7 @@ class ConsensusModule(ABC):
         logger.info({'msg': 'Fetch chain config.', 'value': cc})
         return cc
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_current_frame(self, blockstamp: BlockStamp) -> CurrentFrame:
         consensus_contract = self._get_consensus_contract(blockstamp)
         cf = named_tuple_to_dataclass(
@@ -98,7 +99,7 @@ class ConsensusModule(ABC):
         logger.info({'msg': 'Fetch current frame.', 'value': cf})
         return cf
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_frame_config(self, blockstamp: BlockStamp) -> FrameConfig:
         consensus_contract = self._get_consensus_contract(blockstamp)
         fc = named_tuple_to_dataclass(
@@ -108,7 +109,7 @@ class ConsensusModule(ABC):
         logger.info({'msg': 'Fetch frame config.', 'value': fc})
         return fc
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_member_info(self, blockstamp: BlockStamp) -> MemberInfo:
         consensus_contract = self._get_consensus_contract(blockstamp)
 
@@ -120,6 +121,14 @@ class ConsensusModule(ABC):
         current_frame_consensus_report = current_frame_member_report = ZERO_HASH
 
         if variables.ACCOUNT:
+            consensus_state, submit_role = aggregate_calls(
+                self.w3,
+                [
+                    consensus_contract.functions.getConsensusStateForMember(variables.ACCOUNT.address),
+                    self.report_contract.functions.SUBMIT_DATA_ROLE(),
+                ],
+                blockstamp.block_hash,
+            )
             (
                 # Current frame's reference slot.
                 _,  # current_frame_ref_slot
@@ -135,13 +144,8 @@ class ConsensusModule(ABC):
                 last_member_report_ref_slot,
                 # The hash reported by the member for the current frame, if any.
                 current_frame_member_report,
-            ) = consensus_contract.functions.getConsensusStateForMember(
-                variables.ACCOUNT.address,
-            ).call(block_identifier=blockstamp.block_hash)
+            ) = consensus_state
 
-            submit_role = self.report_contract.functions.SUBMIT_DATA_ROLE().call(
-                block_identifier=blockstamp.block_hash,
-            )
             is_submit_member = self.report_contract.functions.hasRole(
                 submit_role,
                 variables.ACCOUNT.address,
@@ -187,6 +191,8 @@ class ConsensusModule(ABC):
             return None
 
         member_info = self.get_member_info(latest_blockstamp)
+        # New frame is started, drop cached data of the blockstamps that are not used anymore
+        CACHE.set_generation(member_info.current_frame_ref_slot)
 
         # Check if current slot is higher than member slot
         if last_finalized_blockstamp.slot_number < member_info.current_frame_ref_slot:
@@ -360,7 +366,7 @@ class ConsensusModule(ABC):
         ORACLE_SLOT_NUMBER.labels('head').set(bs.slot_number)
         return bs
 
-    @lru_cache(maxsize=1)
+    @cached()
     def _get_slot_delay_before_data_submit(self, blockstamp: BlockStamp) -> int:
         """Returns in slots time to sleep before data report."""
         member = self.get_member_info(blockstamp)
@@ -388,7 +394,7 @@ class ConsensusModule(ABC):
         return total_delay
 
     @abstractmethod
-    @lru_cache(maxsize=1)
+    @cached()
     def build_report(self, blockstamp: ReferenceBlockStamp) -> tuple:
         """Returns ReportData struct with calculated data."""
 
@@ -0,0 +1,180 @@
+import asyncio
+import json
+import logging
+import threading
+from abc import ABC
+from http import HTTPStatus
+from typing import Any, Coroutine, Optional, Sequence, Tuple, TypeVar
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from prometheus_client import Histogram
+from urllib3 import Retry
+from urllib3.exceptions import MaxRetryError
+from urllib.parse import urlparse
+
+from src.providers.http_provider import HTTPProvider, NotOkResponse, RETRY_STRATEGY, split_data_and_meta
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class AsyncHTTPProvider(ABC):
+    """
+    Asyncio version of HTTPProvider.
+
+    All requests share one connection pool limited by POOL_SIZE connections and POOL_SIZE_PER_HOST connections per host,
+    so independent requests are sent concurrently without overloading the node.
+    Retry policy and Prometheus histogram labels are the same as in HTTPProvider.
+
+    Sync code could use the provider with `run_sync`. Coroutines are run in the provider's own event loop
+    in a background thread, so requests from several threads overlap.
+    The loop and the connections are closed by `shutdown`.
+    """
+    REQUEST_TIMEOUT = 300
+    POOL_SIZE = 32
+    POOL_SIZE_PER_HOST = 8
+    RETRY: Retry = RETRY_STRATEGY
+
+    PROMETHEUS_HISTOGRAM: Histogram
+
+    def __init__(self, host: str):
+        self.host = host
+        self._session: Optional[ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+    def run_sync(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Runs coroutine in the provider's event loop and waits for its result"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name=f'{type(self).__name__}Loop', daemon=True,
+                )
+                self._loop_thread.start()
+            loop = self._loop
+
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def get_sync(
+        self,
+        endpoint: str,
+        path_params: Optional[Sequence[str | int]] = None,
+        query_params: Optional[dict] = None,
+        host: Optional[str] = None,
+    ) -> Tuple[dict | list, dict]:
+        return self.run_sync(self._get(endpoint, path_params, query_params, host))
+
+    def shutdown(self) -> None:
+        """Closes the session and stops the event loop. They are created again on the next request."""
+        with self._loop_lock:
+            loop, loop_thread = self._loop, self._loop_thread
+            self._loop, self._loop_thread = None, None
+
+        if loop is None or loop_thread is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join()
+        loop.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get(
+        self,
+        endpoint: str,
+        path_params: Optional[Sequence[str | int]] = None,
+        query_params: Optional[dict] = None,
+        host: Optional[str] = None,
+    ) -> Tuple[dict | list, dict]:
+        """
+        Returns (data, meta)
+        Request is sent to the provider's host if another host is not given.
+        """
+        host = host or self.host
+        url = HTTPProvider._urljoin(  # pylint: disable=protected-access
+            host, endpoint.format(*path_params) if path_params else endpoint,
+        )
+
+        with self.PROMETHEUS_HISTOGRAM.time() as t:
+            try:
+                status, text = await self._request_with_retries(url, _encode_query_params(query_params))
+            except (ClientError, asyncio.TimeoutError) as error:
+                t.labels(endpoint=endpoint, code=type(error).__name__, domain=urlparse(host).netloc)
+                raise error from error
+
+            t.labels(endpoint=endpoint, code=status, domain=urlparse(host).netloc)
+
+        if status != HTTPStatus.OK:
+            msg = f'Response [{status}] with text: "{text}" returned.'
+            logger.debug({'msg': msg})
+            raise NotOkResponse(msg, status=status, text=text)
+
+        try:
+            json_response = json.loads(text)
+        except json.JSONDecodeError as error:
+            msg = f'Response [{status}] with text: "{text}" returned.'
+            logger.debug({'msg': msg})
+            raise error from error
+
+        return split_data_and_meta(json_response)
+
+    async def _request_with_retries(
+        self, url: str, params: list[tuple[str, str]]
+    ) -> Tuple[int, str]:
+        """
+        Retries requests the same way as urllib3 does it with RETRY policy.
+        If retries are exhausted by statuses, the last response is returned as is.
+        """
+        retry = self.RETRY
+        session = self._get_session()
+
+        while True:
+            try:
+                async with session.get(url, params=params) as response:
+                    text = await response.text()
+            except (ClientError, asyncio.TimeoutError) as error:
+                try:
+                    retry = retry.increment('GET', url, error=error)
+                except MaxRetryError:
+                    raise error from error
+                delay = retry.get_backoff_time()
+            else:
+                retry_after = response.headers.get('Retry-After')
+                if not retry.is_retry('GET', response.status, retry_after is not None):
+                    return response.status, text
+
+                try:
+                    retry = retry.increment('GET', url)
+                except MaxRetryError:
+                    return response.status, text
+                delay = retry.parse_retry_after(retry_after) if retry_after else retry.get_backoff_time()
+
+            logger.debug({'msg': f'Retry request in {delay} seconds.', 'value': url})
+            await asyncio.sleep(delay)
+
+    def _get_session(self) -> ClientSession:
+        # Session is bound to the event loop, so it is created on the first request inside the loop
+        if self._session is None:
+            self._session = ClientSession(
+                connector=TCPConnector(limit=self.POOL_SIZE, limit_per_host=self.POOL_SIZE_PER_HOST),
+                timeout=ClientTimeout(sock_connect=self.REQUEST_TIMEOUT, sock_read=self.REQUEST_TIMEOUT),
+            )
+        return self._session
+
+
+def _encode_query_params(query_params: Optional[dict]) -> list[tuple[str, str]]:
+    """Encodes query params like requests does: lists are sent as repeated keys, None values are skipped"""
+    params = []
+    for key, value in (query_params or {}).items():
+        if value is None:
+            continue
+        for item in value if isinstance(value, (list, tuple)) else (value,):
+            params.append((key, str(item)))
+    return params
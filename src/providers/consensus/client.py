@@ -1,20 +1,31 @@
-from functools import lru_cache
-from typing import Literal, Optional, Union
+import asyncio
+import threading
+from http import HTTPStatus
+from typing import Any, Callable, Iterator, Literal, Optional, Sequence, Union
 
+from aiohttp import ClientError
+
+from src import variables
 from src.metrics.logging import logging
-from src.metrics.prometheus.basic import CL_REQUESTS_DURATION
+from src.metrics.prometheus.basic import CL_REQUESTS_COALESCED, CL_REQUESTS_DURATION
+from src.providers.consensus.registry import ValidatorRegistry
+from src.providers.consensus.slots_index import SlotsIndex
+from src.providers.consensus.snapshots import ValidatorsSnapshotStore
+from src.providers.consensus.ssz import decode_state_validators
 from src.providers.consensus.typings import (
     BlockDetailsResponse,
     BlockHeaderFullResponse,
     BlockHeaderResponseData,
     BlockRootResponse,
     Validator,
+    ValidatorBalance,
     BeaconSpecResponse,
     GenesisResponse,
 )
+from src.providers.async_http_provider import AsyncHTTPProvider
 from src.providers.http_provider import HTTPProvider, NotOkResponse
 from src.typings import BlockRoot, BlockStamp, SlotNumber
-from src.utils.dataclass import list_of_dataclasses
+from src.utils.cache import REGISTRY_REGION_SIZE, cached
 
 logger = logging.getLogger(__name__)
 
@@ -31,14 +42,61 @@ class ConsensusClient(HTTPProvider):
     State identifier. Can be one of: "head" (canonical head in node's view), "genesis", "finalized", "justified", <slot>, <hex encoded stateRoot with 0x prefix>.
     """
     PROMETHEUS_HISTOGRAM = CL_REQUESTS_DURATION
+    PROMETHEUS_COALESCED_COUNTER = CL_REQUESTS_COALESCED
+    SSZ_MODE = variables.CONSENSUS_CLIENT_SSZ
+    ASYNC_MODE = variables.CONSENSUS_CLIENT_ASYNC
+
+    async_client: Optional['AsyncConsensusClient'] = None
+    _async_client_lock = threading.Lock()
+
+    validators_snapshots: Optional[ValidatorsSnapshotStore] = None
+    slots_index: Optional[SlotsIndex] = None
+    # Amount of validators ids sent in one request
+    VALIDATORS_IDS_CHUNK_SIZE = 1000
+    # Set to False after the first rejected POST request, so the next requests go with ids in query string
+    post_validators_ids = True
 
     API_GET_BLOCK_ROOT = 'eth/v1/beacon/blocks/{}/root'
     API_GET_BLOCK_HEADER = 'eth/v1/beacon/headers/{}'
     API_GET_BLOCK_DETAILS = 'eth/v2/beacon/blocks/{}'
     API_GET_VALIDATORS = 'eth/v1/beacon/states/{}/validators'
+    API_GET_VALIDATOR_BALANCES = 'eth/v1/beacon/states/{}/validator_balances'
+    API_GET_STATE = 'eth/v2/debug/beacon/states/{}'
     API_GET_SPEC = 'eth/v1/config/spec'
     API_GET_GENESIS = 'eth/v1/beacon/genesis'
 
+    def _get_from_hosts(
+        self, endpoint: str, path_params: Optional[Sequence[str | int]] = None, query_params: Optional[dict] = None
+    ) -> tuple[dict | list, dict]:
+        """
+        In async mode requests are sent through the AsyncConsensusClient connection pool,
+        so requests from several threads (e.g. missed slots probing) are sent concurrently.
+        Requests are hedged between hosts the same way in both modes.
+        Streamed and SSZ requests are always sent by the session.
+        """
+        if not self.ASYNC_MODE:
+            return super()._get_from_hosts(endpoint, path_params, query_params)
+
+        with self._async_client_lock:
+            if self.async_client is None:
+                self.async_client = AsyncConsensusClient(self.host)
+            async_client = self.async_client
+
+        return self.hosts.request(
+            endpoint, lambda host: async_client.get_sync(endpoint, path_params, query_params, host),
+        )
+
+    @staticmethod
+    def _is_host_failure(error: BaseException) -> bool:
+        """Connection errors of the async client are failures of the host too"""
+        return isinstance(error, (ClientError, asyncio.TimeoutError)) or HTTPProvider._is_host_failure(error)
+
+    def close(self) -> None:
+        """Closes connections and stops the async client event loop"""
+        super().close()
+        if self.async_client is not None:
+            self.async_client.shutdown()
+
     def get_config_spec(self):
         """
         Spec: https://ethereum.github.io/beacon-APIs/#/Config/getSpec
@@ -68,18 +126,26 @@ class ConsensusClient(HTTPProvider):
             raise ValueError("Expected mapping response from getBlockRoot")
         return BlockRootResponse.from_response(**data)
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_block_header(self, state_id: Union[SlotNumber, BlockRoot]) -> BlockHeaderFullResponse:
         """
         Spec: https://ethereum.github.io/beacon-APIs/#/Beacon/getBlockHeader
         """
+        return self.get_block_header_no_cache(state_id)
+
+    def get_block_header_no_cache(self, state_id: Union[SlotNumber, BlockRoot]) -> BlockHeaderFullResponse:
+        """
+        Spec: https://ethereum.github.io/beacon-APIs/#/Beacon/getBlockHeader
+
+        Used to probe missed slots, so the probed headers do not evict the cached ones.
+        """
         data, meta_data = self._get(self.API_GET_BLOCK_HEADER, (state_id,))
         if not isinstance(data, dict):
             raise ValueError("Expected mapping response from getBlockHeader")
         resp = BlockHeaderFullResponse.from_response(data=BlockHeaderResponseData.from_response(**data), **meta_data)
         return resp
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_block_details(self, state_id: Union[SlotNumber, BlockRoot]) -> BlockDetailsResponse:
         """Spec: https://ethereum.github.io/beacon-APIs/#/Beacon/getBlockV2"""
         data, _ = self._get(self.API_GET_BLOCK_DETAILS, (state_id,))
@@ -87,25 +153,171 @@ class ConsensusClient(HTTPProvider):
             raise ValueError("Expected mapping response from getBlockV2")
         return BlockDetailsResponse.from_response(**data)
 
-    @lru_cache(maxsize=1)
-    def get_validators(self, blockstamp: BlockStamp) -> list[Validator]:
+    @cached(maxsize=REGISTRY_REGION_SIZE)
+    def get_validators(self, blockstamp: BlockStamp) -> ValidatorRegistry:
         """Spec: https://ethereum.github.io/beacon-APIs/#/Beacon/getStateValidators"""
         return self.get_validators_no_cache(blockstamp)
 
-    @list_of_dataclasses(Validator.from_response)
-    def get_validators_no_cache(self, blockstamp: BlockStamp, pub_keys: Optional[str | tuple] = None) -> list[dict]:
-        """Spec: https://ethereum.github.io/beacon-APIs/#/Beacon/getStateValidators"""
+    def get_validators_no_cache(self, blockstamp: BlockStamp, pub_keys: Optional[str | tuple] = None) -> ValidatorRegistry:
+        """
+        Spec: https://ethereum.github.io/beacon-APIs/#/Beacon/getStateValidators
+
+        Validators are stored column by column right from the response stream.
+        In SSZ mode the whole registry is decoded from the SSZ encoded state, JSON is used as a fallback.
+        Whole registry is saved to the snapshots store if it is set, so each state is downloaded only once.
+        """
+        if pub_keys is not None or self.validators_snapshots is None:
+            return self._get_validators_registry(blockstamp, pub_keys)
+
+        registry = self.validators_snapshots.load(blockstamp.state_root)
+        if registry is None:
+            registry = self._get_validators_registry(blockstamp)
+            self.validators_snapshots.save(blockstamp.state_root, registry)
+
+        return registry
+
+    def _get_validators_registry(self, blockstamp: BlockStamp, pub_keys: Optional[str | tuple] = None) -> ValidatorRegistry:
+        if self.SSZ_MODE and pub_keys is None:
+            try:
+                return self.get_validators_ssz(blockstamp)
+            except (NotOkResponse, ValueError) as error:
+                logger.warning({'msg': 'Failed to get validators from SSZ state. Fallback to JSON.', 'error': str(error)})
+
+        return ValidatorRegistry.from_responses(self._get_validators_records(blockstamp, pub_keys))
+
+    def get_validators_ssz(self, blockstamp: BlockStamp) -> ValidatorRegistry:
+        """
+        Spec: https://ethereum.github.io/beacon-APIs/#/Debug/getStateV2
+
+        Validators and balances are decoded from the SSZ encoded state without copying.
+        """
+        return decode_state_validators(self._get_ssz(self.API_GET_STATE, (blockstamp.state_root,)))
+
+    def iter_validators_no_cache(
+        self, blockstamp: BlockStamp, pub_keys: Optional[str | tuple] = None
+    ) -> Iterator[Validator]:
+        """
+        Spec: https://ethereum.github.io/beacon-APIs/#/Beacon/getStateValidators
+
+        Validators are decoded one by one from the response stream without building the whole JSON tree in memory.
+        """
+        return (Validator.from_response(**record) for record in self._get_validators_records(blockstamp, pub_keys))
+
+    def get_validators_by_indices(self, blockstamp: BlockStamp, indices: Sequence[int]) -> ValidatorRegistry:
+        """
+        Spec: https://ethereum.github.io/beacon-APIs/#/Beacon/postStateValidators
+
+        Returns only validators with given indices, validators that are not in the state yet are skipped.
+        Used to look at the known set of validators (e.g. Lido ones) in historical states
+        without downloading the whole registry.
+        """
+        return ValidatorRegistry.from_responses(
+            self._get_records_by_ids(self.API_GET_VALIDATORS, blockstamp, indices, lambda ids: {'ids': ids})
+        )
+
+    def get_validators_balances(self, blockstamp: BlockStamp, indices: Sequence[int]) -> list[ValidatorBalance]:
+        """
+        Spec: https://ethereum.github.io/beacon-APIs/#/Beacon/postStateValidatorBalances
+
+        Lighter version of `get_validators_by_indices` when only balances are needed.
+        Indices that are not in the state yet are skipped, see `_filter_existed_indices`.
+        """
+        indices = self._filter_existed_indices(blockstamp, indices)
+        records = self._get_records_by_ids(self.API_GET_VALIDATOR_BALANCES, blockstamp, indices, lambda ids: ids)
+        return [ValidatorBalance.from_response(**record) for record in records]
+
+    def _filter_existed_indices(self, blockstamp: BlockStamp, indices: Sequence[int]) -> list[int]:
+        """
+        Some CL clients answer 400/404 to the whole request if any of the indices is not in the state, instead of skipping it.
+        Validators are only appended to the registry, so the indices that exist in the state are the ones below the first
+        not existed index. It is bisected over the requested indices, in most cases the last index exists
+        and only one request is sent.
+        """
+        existed = sorted(indices)
+        if not existed or self._is_validator_existed(blockstamp, existed[-1]):
+            return list(indices)
+
+        # existed[:low] are in the state, existed[high] is not
+        low, high = 0, len(existed) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self._is_validator_existed(blockstamp, existed[middle]):
+                low = middle + 1
+            else:
+                high = middle
+
+        logger.info({'msg': 'Skip validators that are not in the state yet.', 'value': len(existed) - low})
+        return [index for index in indices if index < existed[low]]
+
+    def _is_validator_existed(self, blockstamp: BlockStamp, index: int) -> bool:
         try:
-            data, _ = self._get(self.API_GET_VALIDATORS, (blockstamp.state_root,), query_params={'id': pub_keys})
-            if not isinstance(data, list):
-                raise ValueError("Expected list response from getStateValidators")
-            return data
+            records = list(self._with_slot_fallback(
+                blockstamp,
+                lambda state_id: self._get_stream(self.API_GET_VALIDATOR_BALANCES, (state_id,), query_params={'id': [str(index)]}),
+            ))
+        except NotOkResponse as error:
+            if error.status not in (HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND):
+                raise error from error
+            return False
+
+        return bool(records)
+
+    def _get_validators_records(
+        self, blockstamp: BlockStamp, pub_keys: Optional[str | tuple] = None
+    ) -> Iterator[dict[str, Any]]:
+        return self._with_slot_fallback(
+            blockstamp,
+            lambda state_id: self._get_stream(self.API_GET_VALIDATORS, (state_id,), query_params={'id': pub_keys}),
+        )
+
+    @staticmethod
+    def _with_slot_fallback(
+        blockstamp: BlockStamp, request: Callable[[str | int], Iterator[dict[str, Any]]]
+    ) -> Iterator[dict[str, Any]]:
+        try:
+            return request(blockstamp.state_root)
         except NotOkResponse as error:
             # Avoid Prysm issue with state root - https://github.com/prysmaticlabs/prysm/issues/12053
             # Trying to get validators by slot number
-            if 'State not found: state not found in the last' in error.text:
-                data, _ = self._get(self.API_GET_VALIDATORS, (blockstamp.slot_number,), query_params={'id': pub_keys})
-                if not isinstance(data, list):
-                    raise ValueError("Expected list response from getStateValidators")  # pylint: disable=raise-missing-from
-                return data
-            raise error from error
+            if 'State not found: state not found in the last' not in error.text:
+                raise error from error
+            return request(blockstamp.slot_number)
+
+    def _get_records_by_ids(
+        self,
+        endpoint: str,
+        blockstamp: BlockStamp,
+        indices: Sequence[int],
+        build_body: Callable[[list[str]], Any],
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Requests records by chunks of ids.
+        POST is preferred, because ids list does not fit into query string. Falls back to GET if node does not support it.
+        Some nodes answer 400 or 404 instead of 405 to the not supported POST, so they are fallen back too.
+        """
+        for start in range(0, len(indices), self.VALIDATORS_IDS_CHUNK_SIZE):
+            ids = [str(index) for index in indices[start:start + self.VALIDATORS_IDS_CHUNK_SIZE]]
+
+            if self.post_validators_ids:
+                try:
+                    yield from self._with_slot_fallback(
+                        blockstamp, lambda state_id: self._post_stream(endpoint, (state_id,), build_body(ids))
+                    )
+                    continue
+                except NotOkResponse as error:
+                    if error.status not in (HTTPStatus.METHOD_NOT_ALLOWED, HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND):
+                        raise error from error
+                    logger.warning({'msg': 'POST with validators ids is not supported. Fallback to GET.'})
+                    self.post_validators_ids = False
+
+            yield from self._with_slot_fallback(
+                blockstamp, lambda state_id: self._get_stream(endpoint, (state_id,), query_params={'id': ids})
+            )
+
+
+class AsyncConsensusClient(AsyncHTTPProvider):
+    """
+    Asyncio connection pool for the ConsensusClient JSON requests in async mode.
+    Endpoints and responses parsing are the ConsensusClient ones, see `ConsensusClient._get_from_hosts`.
+    """
+    PROMETHEUS_HISTOGRAM = CL_REQUESTS_DURATION
@@ -0,0 +1,279 @@
+from array import array
+from itertools import count
+from typing import Any, Iterable, Iterator, Optional, Sequence, overload
+
+import numpy as np
+
+from src.providers.consensus.typings import Validator, ValidatorState, ValidatorStatus
+
+
+PUBKEY_LENGTH = 48
+WITHDRAWAL_CREDENTIALS_LENGTH = 32
+
+# Larger validators states are not indexed by pubkey, the index would take too much memory
+PUBKEY_INDEX_MAXSIZE = 2 ** 21
+
+# Status is stored as position of the value in this tuple
+VALIDATOR_STATUSES = tuple(ValidatorStatus)
+_STATUS_CODES = {status.value: code for code, status in enumerate(VALIDATOR_STATUSES)}
+
+_UINT64_COLUMNS = (
+    'validator_index',
+    'balance',
+    'effective_balance',
+    'activation_eligibility_epoch',
+    'activation_epoch',
+    'exit_epoch',
+    'withdrawable_epoch',
+)
+COLUMNS = _UINT64_COLUMNS + ('status', 'pubkey', 'withdrawal_credentials', 'slashed')
+
+
+def _hex_to_bytes(value: str, length: int) -> bytes:
+    result = bytes.fromhex(value[2:] if value.startswith('0x') else value)
+    if len(result) != length:
+        raise ValueError(f'Expected {length} bytes hex string, got "{value}".')
+    return result
+
+
+class ValidatorRegistry(Sequence[Validator]):
+    """
+    Validators registry stored column by column in typed arrays.
+
+    Every numeric field is an uint64 array, so scans over the whole registry could be done with numpy
+    without parsing strings and creating python objects for each validator.
+    Pubkeys and withdrawal credentials are stored as (n, 48) and (n, 32) byte matrices.
+
+    Registry still behaves like a sequence of Validator dataclasses: each row is materialized on access
+    (with status as ValidatorStatus member).
+    Materialized Validator is a copy, changes in it are not written back to the registry.
+    """
+    # Named so to not shadow Sequence.index
+    validator_index: np.ndarray
+    balance: np.ndarray
+    status: np.ndarray
+    pubkey: np.ndarray
+    withdrawal_credentials: np.ndarray
+    effective_balance: np.ndarray
+    slashed: np.ndarray
+    activation_eligibility_epoch: np.ndarray
+    activation_epoch: np.ndarray
+    exit_epoch: np.ndarray
+    withdrawable_epoch: np.ndarray
+
+    def __init__(self, **columns: np.ndarray):
+        for name, column in columns.items():
+            setattr(self, name, column)
+
+    @classmethod
+    def from_responses(cls, records: Iterable[dict[str, Any]]) -> 'ValidatorRegistry':
+        """
+        Build registry from raw getStateValidators records.
+        Records are consumed one by one, so it could be used with streamed response.
+        """
+        uint64_columns = {name: array('Q') for name in _UINT64_COLUMNS}
+        status, slashed = array('B'), array('B')
+        pubkey, withdrawal_credentials = bytearray(), bytearray()
+
+        for record in records:
+            state = record['validator']
+            uint64_columns['validator_index'].append(int(record['index']))
+            uint64_columns['balance'].append(int(record['balance']))
+            status.append(_STATUS_CODES[record['status']])
+            pubkey += _hex_to_bytes(state['pubkey'], PUBKEY_LENGTH)
+            withdrawal_credentials += _hex_to_bytes(state['withdrawal_credentials'], WITHDRAWAL_CREDENTIALS_LENGTH)
+            slashed.append(state['slashed'])
+
+            for name in _UINT64_COLUMNS[2:]:
+                uint64_columns[name].append(int(state[name]))
+
+        # np.frombuffer does not copy data, arrays will be owners of the buffers
+        return cls(
+            status=np.frombuffer(status, dtype=np.uint8),
+            slashed=np.frombuffer(slashed, dtype=np.bool_),
+            pubkey=np.frombuffer(pubkey, dtype=np.uint8).reshape(-1, PUBKEY_LENGTH),
+            withdrawal_credentials=np.frombuffer(withdrawal_credentials, dtype=np.uint8).reshape(
+                -1, WITHDRAWAL_CREDENTIALS_LENGTH,
+            ),
+            **{name: np.frombuffer(column, dtype=np.uint64) for name, column in uint64_columns.items()},
+        )
+
+    @classmethod
+    def from_validators(cls, validators: Iterable[Validator]) -> 'ValidatorRegistry':
+        """
+        Build registry from Validator dataclasses (e.g. list of LidoValidator), column by column.
+        Registry is returned as is, so any sequence of validators could be converted once and scanned with numpy.
+        """
+        if isinstance(validators, ValidatorRegistry):
+            return validators
+
+        items = list(validators)
+        states = [v.validator for v in items]
+
+        def uint64_column(values: Iterable[str]) -> np.ndarray:
+            return np.fromiter(map(int, values), dtype=np.uint64, count=len(items))
+
+        return cls(
+            validator_index=uint64_column(v.index for v in items),
+            balance=uint64_column(v.balance for v in items),
+            status=np.fromiter(
+                (_STATUS_CODES[ValidatorStatus(v.status).value] for v in items), dtype=np.uint8, count=len(items),
+            ),
+            slashed=np.fromiter((s.slashed for s in states), dtype=np.bool_, count=len(states)),
+            pubkey=np.frombuffer(
+                bytearray(b''.join(_hex_to_bytes(s.pubkey, PUBKEY_LENGTH) for s in states)), dtype=np.uint8,
+            ).reshape(-1, PUBKEY_LENGTH),
+            withdrawal_credentials=np.frombuffer(
+                bytearray(b''.join(_hex_to_bytes(s.withdrawal_credentials, WITHDRAWAL_CREDENTIALS_LENGTH) for s in states)),
+                dtype=np.uint8,
+            ).reshape(-1, WITHDRAWAL_CREDENTIALS_LENGTH),
+            **{name: uint64_column(getattr(s, name) for s in states) for name in _UINT64_COLUMNS[2:]},
+        )
+
+    def __len__(self) -> int:
+        return len(self.validator_index)
+
+    @overload
+    def __getitem__(self, item: int) -> Validator:
+        ...
+
+    @overload
+    def __getitem__(self, item: slice) -> 'ValidatorRegistry':
+        ...
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.take(item)
+
+        if not -len(self) <= item < len(self):
+            raise IndexError('Validator registry index out of range.')
+
+        return self._row(item)
+
+    def __iter__(self) -> Iterator[Validator]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def take(self, selector: slice | np.ndarray) -> 'ValidatorRegistry':
+        """
+        Returns registry with selected rows.
+        Selector could be a slice (no data copied), boolean mask or array of row positions.
+        """
+        return ValidatorRegistry(**{name: getattr(self, name)[selector] for name in COLUMNS})
+
+    def pubkey_hex(self, row: int) -> str:
+        return '0x' + self.pubkey[row].tobytes().hex()
+
+    def _row(self, row: int) -> Validator:
+        return Validator(
+            index=str(self.validator_index[row]),
+            balance=str(self.balance[row]),
+            status=VALIDATOR_STATUSES[self.status[row]],
+            validator=ValidatorState(
+                pubkey=self.pubkey_hex(row),
+                withdrawal_credentials='0x' + self.withdrawal_credentials[row].tobytes().hex(),
+                effective_balance=str(self.effective_balance[row]),
+                slashed=bool(self.slashed[row]),
+                activation_eligibility_epoch=str(self.activation_eligibility_epoch[row]),
+                activation_epoch=str(self.activation_epoch[row]),
+                exit_epoch=str(self.exit_epoch[row]),
+                withdrawable_epoch=str(self.withdrawable_epoch[row]),
+            ),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns"""
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+
+class ValidatorsPubkeyIndex:
+    """
+    Map of validators pubkeys to their positions in the validators registry.
+
+    Registry is append only and validator never changes its position, so the map built for one state
+    is valid for any other state of the same chain. Only validators appended since the previous lookup are added.
+
+    Index is never trusted blindly: found positions are checked against the given state and missed pubkeys are
+    looked up in the state itself. If the state has any of them, index is rebuilt for this state.
+    States larger than maxsize are scanned directly without keeping the index in memory.
+    """
+    def __init__(self, maxsize: int = PUBKEY_INDEX_MAXSIZE) -> None:
+        self._maxsize = maxsize
+        self._positions: dict[str, int] = {}
+        self._size = 0
+
+    def find(self, validators: Sequence[Validator], pubkeys: Iterable[str]) -> list[Optional[int]]:
+        """Returns position of each pubkey in the validators or None if there is no such validator"""
+        pubkeys = list(pubkeys)
+
+        if len(validators) > self._maxsize:
+            self._positions, self._size = {}, 0
+            found = _scan_pubkeys(validators, pubkeys)
+            return [found.get(pubkey) for pubkey in pubkeys]
+
+        positions = self._find(validators, pubkeys)
+        if self._is_state_indexed(validators, pubkeys, positions):
+            return positions
+
+        # Validators are not a state of the indexed registry
+        self._positions, self._size = {}, 0
+        return self._find(validators, pubkeys)
+
+    def _find(self, validators: Sequence[Validator], pubkeys: list[str]) -> list[Optional[int]]:
+        self._update(validators)
+        positions = (self._positions.get(pubkey) for pubkey in pubkeys)
+        # Validator could be appended to the registry after the given state
+        return [position if position is not None and position < len(validators) else None for position in positions]
+
+    @staticmethod
+    def _is_state_indexed(validators: Sequence[Validator], pubkeys: list[str], positions: list[Optional[int]]) -> bool:
+        found_validators_match = all(
+            _get_pubkey(validators, position) == pubkey
+            for position, pubkey in zip(positions, pubkeys) if position is not None
+        )
+        if not found_validators_match:
+            return False
+
+        missed = [pubkey for position, pubkey in zip(positions, pubkeys) if position is None]
+        return not missed or not _scan_pubkeys(validators, missed)
+
+    def _update(self, validators: Sequence[Validator]) -> None:
+        if len(validators) <= self._size:
+            return
+
+        new_validators = validators[self._size:]
+        if isinstance(new_validators, ValidatorRegistry):
+            raw = new_validators.pubkey.tobytes()
+            pubkeys: Iterable[str] = (
+                '0x' + raw[i:i + PUBKEY_LENGTH].hex() for i in range(0, len(raw), PUBKEY_LENGTH)
+            )
+        else:
+            pubkeys = (validator.validator.pubkey for validator in new_validators)
+
+        self._positions.update(zip(pubkeys, count(self._size)))
+        self._size = len(validators)
+
+
+def _get_pubkey(validators: Sequence[Validator], position: int) -> str:
+    if isinstance(validators, ValidatorRegistry):
+        return validators.pubkey_hex(position)
+    return validators[position].validator.pubkey
+
+
+def _scan_pubkeys(validators: Sequence[Validator], pubkeys: list[str]) -> dict[str, int]:
+    """Positions of the given pubkeys in the validators found with one pass over the state"""
+    if isinstance(validators, ValidatorRegistry):
+        # Each pubkey row is compared as a single 48 bytes value. Pubkeys of other length could not be in the registry
+        pubkey_dtype = np.dtype(f'V{PUBKEY_LENGTH}')
+        wanted_bytes = (bytes.fromhex(pubkey.removeprefix('0x')) for pubkey in pubkeys)
+        wanted = np.array([value for value in wanted_bytes if len(value) == PUBKEY_LENGTH], dtype=pubkey_dtype)
+        rows = np.ascontiguousarray(validators.pubkey).view(pubkey_dtype).ravel()
+        return {validators.pubkey_hex(row): int(row) for row in np.flatnonzero(np.isin(rows, wanted))}
+
+    wanted_pubkeys = set(pubkeys)
+    return {
+        validator.validator.pubkey: position
+        for position, validator in enumerate(validators)
+        if validator.validator.pubkey in wanted_pubkeys
+    }
@@ -0,0 +1,137 @@
+import logging
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from eth_typing import HexStr
+from web3.types import Timestamp
+
+from src.typings import BlockHash, BlockNumber, BlockRoot, BlockStamp, SlotNumber, StateRoot
+
+logger = logging.getLogger(__name__)
+
+
+# magic, format version, genesis validators root
+HEADER = struct.Struct('<4sI32s')
+MAGIC = b'LOSI'
+VERSION = 1
+# slot, block slot, block number, block timestamp, block root, state root, block hash
+RECORD = struct.Struct('<QQQQ32s32s32s')
+
+
+@dataclass(frozen=True)
+class SlotBlock:
+    """Block of the slot. If the slot is missed, it is the block of the closest non-missed slot before it."""
+    slot: SlotNumber
+    block_root: BlockRoot
+    blockstamp: BlockStamp
+
+    @property
+    def missed(self) -> bool:
+        return self.blockstamp.slot_number != self.slot
+
+
+class SlotsIndex:
+    """
+    Persistent index of finalized slots to their blocks.
+
+    Finalized slot is never changed, so once resolved it could be reused forever.
+    Index is an append only file of fixed size records. It is loaded at startup,
+    and every newly resolved slot is appended to it.
+    Index is bound to the chain by the genesis validators root, index of another chain is dropped.
+    Header is written and checked once at startup, slots could be added from several threads.
+    """
+    def __init__(self, path: Path, genesis_validators_root: str):
+        self.path = path
+        self._header = HEADER.pack(MAGIC, VERSION, _hex_to_bytes(genesis_validators_root))
+        self._slots: dict[int, SlotBlock] = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._load():
+            self._create()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def get(self, slot: SlotNumber) -> Optional[SlotBlock]:
+        return self._slots.get(slot)
+
+    def add(self, slot_block: SlotBlock) -> None:
+        blockstamp = slot_block.blockstamp
+        record = RECORD.pack(
+            slot_block.slot,
+            blockstamp.slot_number,
+            blockstamp.block_number,
+            blockstamp.block_timestamp,
+            _hex_to_bytes(slot_block.block_root),
+            _hex_to_bytes(blockstamp.state_root),
+            _hex_to_bytes(blockstamp.block_hash),
+        )
+
+        with self._lock:
+            if slot_block.slot in self._slots:
+                return
+
+            self._slots[slot_block.slot] = slot_block
+            try:
+                with open(self.path, 'ab') as file:
+                    file.write(record)
+            except OSError as error:
+                logger.warning({'msg': 'Failed to save slot to the slots index.', 'value': slot_block.slot, 'error': str(error)})
+
+    def _create(self) -> None:
+        try:
+            # Exclusive creation, so the header is written once if the index is shared with another process
+            with open(self.path, 'xb') as file:
+                file.write(self._header)
+        except FileExistsError:
+            pass
+        except OSError as error:
+            logger.warning({'msg': 'Failed to create slots index.', 'error': str(error)})
+
+    def _load(self) -> bool:
+        """Loads slots from the index file. Returns False if there is no valid index to append to."""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return False
+        except OSError as error:
+            logger.warning({'msg': 'Failed to read slots index.', 'error': str(error)})
+            return True
+
+        if data[:HEADER.size] != self._header:
+            logger.warning({'msg': 'Slots index has unknown format or belongs to another chain. Remove it.'})
+            self.path.unlink(missing_ok=True)
+            return False
+
+        records_count = (len(data) - HEADER.size) // RECORD.size
+        records_end = HEADER.size + records_count * RECORD.size
+        for slot, block_slot, block_number, timestamp, block_root, state_root, block_hash in RECORD.iter_unpack(
+            memoryview(data)[HEADER.size:records_end]
+        ):
+            self._slots[slot] = SlotBlock(
+                slot=SlotNumber(slot),
+                block_root=BlockRoot(HexStr('0x' + block_root.hex())),
+                blockstamp=BlockStamp(
+                    state_root=StateRoot(HexStr('0x' + state_root.hex())),
+                    slot_number=SlotNumber(block_slot),
+                    block_hash=BlockHash(HexStr('0x' + block_hash.hex())),
+                    block_number=BlockNumber(block_number),
+                    block_timestamp=Timestamp(timestamp),
+                ),
+            )
+
+        if records_end != len(data):
+            # Last record was not written completely, drop it so next records are aligned
+            logger.warning({'msg': 'Slots index has partially written record. Truncate it.'})
+            os.truncate(self.path, records_end)
+
+        logger.info({'msg': 'Load slots index.', 'value': len(self._slots)})
+        return True
+
+
+def _hex_to_bytes(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value.startswith('0x') else value)
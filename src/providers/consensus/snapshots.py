@@ -0,0 +1,144 @@
+import logging
+import mmap
+import os
+import re
+import struct
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.providers.consensus.registry import PUBKEY_LENGTH, WITHDRAWAL_CREDENTIALS_LENGTH, ValidatorRegistry
+from src.typings import StateRoot
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_SUFFIX = '.validators'
+# magic, format version, validators count
+HEADER = struct.Struct('<4sI Q')
+MAGIC = b'LOVS'
+VERSION = 1
+
+# Columns are stored one after another in this order.
+# Wide columns go first, so every uint64 column is 8 bytes aligned in the mapped file.
+SNAPSHOT_COLUMNS: list[tuple[str, str, int]] = [
+    ('validator_index', '<u8', 1),
+    ('balance', '<u8', 1),
+    ('effective_balance', '<u8', 1),
+    ('activation_eligibility_epoch', '<u8', 1),
+    ('activation_epoch', '<u8', 1),
+    ('exit_epoch', '<u8', 1),
+    ('withdrawable_epoch', '<u8', 1),
+    ('pubkey', 'u1', PUBKEY_LENGTH),
+    ('withdrawal_credentials', 'u1', WITHDRAWAL_CREDENTIALS_LENGTH),
+    ('status', 'u1', 1),
+    ('slashed', '?', 1),
+]
+ROW_SIZE = sum(np.dtype(dtype).itemsize * width for _, dtype, width in SNAPSHOT_COLUMNS)
+
+_STATE_ROOT_RE = re.compile(r'^0x[0-9a-f]{64}$')
+
+
+class ValidatorsSnapshotStore:
+    """
+    On-disk store of validators registries keyed by state root.
+
+    State with given root never changes, so snapshot could be reused forever.
+    Snapshots are memory mapped on load, so only touched columns are read from disk.
+    When total size exceeds max_size, least recently used snapshots are removed.
+    """
+    def __init__(self, path: Path, max_size: int):
+        self.path = path
+        self.max_size = max_size
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def load(self, state_root: StateRoot) -> Optional[ValidatorRegistry]:
+        file_path = self._get_file_path(state_root)
+        if file_path is None or not file_path.exists():
+            return None
+
+        try:
+            registry = self._read(file_path)
+        except (OSError, ValueError) as error:
+            logger.warning({'msg': 'Failed to load validators snapshot. Remove it.', 'value': state_root, 'error': str(error)})
+            file_path.unlink(missing_ok=True)
+            return None
+
+        # Modification time is used as last access time for LRU eviction
+        os.utime(file_path)
+        logger.info({'msg': 'Load validators snapshot.', 'value': state_root})
+        return registry
+
+    def save(self, state_root: StateRoot, registry: ValidatorRegistry) -> None:
+        file_path = self._get_file_path(state_root)
+        if file_path is None:
+            return
+
+        if HEADER.size + ROW_SIZE * len(registry) > self.max_size:
+            logger.warning({'msg': 'Validators snapshot is bigger than max snapshots size. Skip it.', 'value': state_root})
+            return
+
+        # Snapshots directory is shared by the oracle processes, so each writer has its own temporary file
+        tmp_path = file_path.with_name(f'{file_path.name}.{uuid.uuid4().hex}.tmp')
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, VERSION, len(registry)))
+                for name, dtype, _ in SNAPSHOT_COLUMNS:
+                    file.write(np.ascontiguousarray(getattr(registry, name), dtype=dtype).data)
+            # Snapshot appears at once, so reader could not get partially written file
+            os.replace(tmp_path, file_path)
+        except OSError as error:
+            logger.warning({'msg': 'Failed to save validators snapshot.', 'value': state_root, 'error': str(error)})
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._evict(keep=file_path)
+
+    def _get_file_path(self, state_root: StateRoot) -> Optional[Path]:
+        if not _STATE_ROOT_RE.match(state_root):
+            return None
+        return self.path / f'{state_root}{SNAPSHOT_SUFFIX}'
+
+    @staticmethod
+    def _read(file_path: Path) -> ValidatorRegistry:
+        with open(file_path, 'rb') as file:
+            # Mapping stays alive while arrays reference it, file descriptor could be closed
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(buffer) < HEADER.size:
+            raise ValueError('Snapshot file is too short.')
+
+        magic, version, count = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Unknown snapshot format.')
+
+        if len(buffer) != HEADER.size + ROW_SIZE * count:
+            raise ValueError('Snapshot file size does not match validators count.')
+
+        columns = {}
+        offset = HEADER.size
+        for name, dtype, width in SNAPSHOT_COLUMNS:
+            column = np.frombuffer(buffer, dtype=dtype, count=count * width, offset=offset)
+            columns[name] = column.reshape(-1, width) if width > 1 else column
+            offset += column.nbytes
+
+        return ValidatorRegistry(**columns)
+
+    def _evict(self, keep: Path) -> None:
+        snapshots = sorted(
+            ((file.stat(), file) for file in self.path.glob(f'*{SNAPSHOT_SUFFIX}')),
+            key=lambda snapshot: snapshot[0].st_mtime,
+        )
+        total_size = sum(stat.st_size for stat, _ in snapshots)
+
+        for stat, file in snapshots:
+            if total_size <= self.max_size:
+                break
+            if file == keep:
+                continue
+
+            file.unlink(missing_ok=True)
+            total_size -= stat.st_size
+            logger.info({'msg': 'Remove least recently used validators snapshot.', 'value': file.name})
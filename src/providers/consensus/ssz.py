@@ -0,0 +1,120 @@
+"""
+Decoding of the validators registry from SSZ encoded BeaconState.
+https://github.com/ethereum/consensus-specs/blob/dev/ssz/simple-serialize.md
+
+Only validators and balances lists are decoded. Positions of their offsets in the state container are the same
+for phase0, altair, bellatrix and capella forks, because all fields before them are unchanged.
+"""
+import struct
+
+import numpy as np
+
+from src.constants import FAR_FUTURE_EPOCH
+from src.providers.consensus.registry import (
+    PUBKEY_LENGTH,
+    VALIDATOR_STATUSES,
+    WITHDRAWAL_CREDENTIALS_LENGTH,
+    ValidatorRegistry,
+)
+from src.providers.consensus.typings import ValidatorStatus
+
+# Mainnet preset, it is used by mainnet and all public testnets
+SLOTS_PER_EPOCH = 32
+SLOTS_PER_HISTORICAL_ROOT = 8192
+EPOCHS_PER_HISTORICAL_VECTOR = 65536
+EPOCHS_PER_SLASHINGS_VECTOR = 8192
+
+ROOT_SIZE = 32
+OFFSET_SIZE = 4
+
+STATE_SLOT_POSITION = 8 + ROOT_SIZE
+# genesis_time, genesis_validators_root, slot, fork, latest_block_header, block_roots, state_roots,
+# historical_roots (offset), eth1_data, eth1_data_votes (offset), eth1_deposit_index
+VALIDATORS_OFFSET_POSITION = (
+    8 + ROOT_SIZE + 8 + 16 + 112 + 2 * SLOTS_PER_HISTORICAL_ROOT * ROOT_SIZE + OFFSET_SIZE + 72 + OFFSET_SIZE + 8
+)
+BALANCES_OFFSET_POSITION = VALIDATORS_OFFSET_POSITION + OFFSET_SIZE
+# randao_mixes and slashings are fixed size, then offset of previous epoch participation (attestations in phase0)
+BALANCES_END_OFFSET_POSITION = (
+    BALANCES_OFFSET_POSITION + OFFSET_SIZE + EPOCHS_PER_HISTORICAL_VECTOR * ROOT_SIZE + EPOCHS_PER_SLASHINGS_VECTOR * 8
+)
+
+# Validator container is 121 bytes: 48 + 32 + 8 + 1 + 4 * 8
+VALIDATOR_DTYPE = np.dtype([
+    ('pubkey', np.uint8, (PUBKEY_LENGTH,)),
+    ('withdrawal_credentials', np.uint8, (WITHDRAWAL_CREDENTIALS_LENGTH,)),
+    ('effective_balance', '<u8'),
+    ('slashed', '?'),
+    ('activation_eligibility_epoch', '<u8'),
+    ('activation_epoch', '<u8'),
+    ('exit_epoch', '<u8'),
+    ('withdrawable_epoch', '<u8'),
+])
+
+_STATUS_CODES = {status: np.uint8(code) for code, status in enumerate(VALIDATOR_STATUSES)}
+
+
+def _read_uint(state: memoryview, position: int, size: int = OFFSET_SIZE) -> int:
+    if position + size > len(state):
+        raise ValueError('SSZ encoded state is too short.')
+    return struct.unpack_from('<I' if size == OFFSET_SIZE else '<Q', state, position)[0]
+
+
+def decode_state_validators(state: memoryview) -> ValidatorRegistry:
+    """
+    Returns registry with validators and balances of the SSZ encoded BeaconState.
+    Columns are views into the state buffer, nothing is copied except computed statuses.
+    """
+    validators_offset = _read_uint(state, VALIDATORS_OFFSET_POSITION)
+    balances_offset = _read_uint(state, BALANCES_OFFSET_POSITION)
+    balances_end = _read_uint(state, BALANCES_END_OFFSET_POSITION)
+
+    if not validators_offset <= balances_offset <= balances_end <= len(state):
+        raise ValueError('Invalid validators or balances offsets in SSZ encoded state.')
+
+    count, remainder = divmod(balances_offset - validators_offset, VALIDATOR_DTYPE.itemsize)
+    if remainder or balances_end - balances_offset != count * 8:
+        raise ValueError('Validators and balances lists sizes in SSZ encoded state do not match.')
+
+    validators = np.frombuffer(state, dtype=VALIDATOR_DTYPE, count=count, offset=validators_offset)
+    registry = ValidatorRegistry(
+        validator_index=np.arange(count, dtype=np.uint64),
+        balance=np.frombuffer(state, dtype='<u8', count=count, offset=balances_offset),
+        **{name: validators[name] for name in VALIDATOR_DTYPE.names or ()},
+    )
+    state_epoch = _read_uint(state, STATE_SLOT_POSITION, 8) // SLOTS_PER_EPOCH
+    registry.status = get_validators_statuses(registry, state_epoch)
+    return registry
+
+
+def get_validators_statuses(registry: ValidatorRegistry, epoch: int) -> np.ndarray:
+    """
+    SSZ state has no statuses, so they are calculated the same way as beacon nodes do.
+    https://github.com/ethereum/beacon-APIs/blob/master/validator-flow.md
+    """
+    pending = registry.activation_epoch > epoch
+    active = ~pending & (epoch < registry.exit_epoch)
+    exited = ~pending & ~active & (epoch < registry.withdrawable_epoch)
+    on_exit = registry.exit_epoch != FAR_FUTURE_EPOCH
+
+    conditions = [
+        pending & (registry.activation_eligibility_epoch == FAR_FUTURE_EPOCH),
+        pending,
+        active & ~on_exit,
+        active & ~registry.slashed,
+        active,
+        exited & ~registry.slashed,
+        exited,
+        registry.balance != 0,
+    ]
+    choices = [
+        _STATUS_CODES[ValidatorStatus.PENDING_INITIALIZED],
+        _STATUS_CODES[ValidatorStatus.PENDING_QUEUED],
+        _STATUS_CODES[ValidatorStatus.ACTIVE_ONGOING],
+        _STATUS_CODES[ValidatorStatus.ACTIVE_EXITING],
+        _STATUS_CODES[ValidatorStatus.ACTIVE_SLASHED],
+        _STATUS_CODES[ValidatorStatus.EXITED_UNSLASHED],
+        _STATUS_CODES[ValidatorStatus.EXITED_SLASHED],
+        _STATUS_CODES[ValidatorStatus.WITHDRAWAL_POSSIBLE],
+    ]
+    return np.select(conditions, choices, _STATUS_CODES[ValidatorStatus.WITHDRAWAL_DONE]).astype(np.uint8)
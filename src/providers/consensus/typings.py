@@ -102,6 +102,12 @@ class Validator(Nested, FromResponse):
     validator: ValidatorState
 
 
+@dataclass
+class ValidatorBalance(FromResponse):
+    index: str
+    balance: str
+
+
 @dataclass
 class BlockDetailsResponse(Nested, FromResponse):
     # https://ethereum.github.io/beacon-APIs/#/Beacon/getBlockV2
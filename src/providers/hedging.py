@@ -0,0 +1,159 @@
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, Iterator, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class HostStats:
+    """Latencies of the latest answers of the host by API endpoint and time of its last failure"""
+    def __init__(self, window: int):
+        self._latencies: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+        self.failed_at: Optional[float] = None
+
+    def add_latency(self, endpoint: str, latency: float) -> None:
+        with self._lock:
+            self._latencies[endpoint].append(latency)
+            self.failed_at = None
+
+    def add_failure(self) -> None:
+        self.failed_at = time.monotonic()
+
+    def is_healthy(self, cooldown: float) -> bool:
+        return self.failed_at is None or time.monotonic() - self.failed_at >= cooldown
+
+    def get_latency_percentile(self, endpoint: str, percentile: float, min_samples: int) -> Optional[float]:
+        """Returns None if there are not enough answers to estimate percentile"""
+        with self._lock:
+            latencies = sorted(self._latencies[endpoint])
+
+        if len(latencies) < min_samples:
+            return None
+
+        return latencies[max(math.ceil(len(latencies) * percentile / 100) - 1, 0)]
+
+
+class HedgedHosts:
+    """
+    Sends requests to several hosts of the same API.
+
+    Request is sent to the first healthy host. If there is no answer for longer than HEDGE_PERCENTILE
+    of the host latencies for this endpoint, the same request is sent to the next host and whichever answers first is used.
+    If the host fails the request is sent to the next host right away,
+    and the failed host is moved to the end of the list for FAILURE_COOLDOWN seconds.
+
+    Failures are recognized by `is_failure`, other errors are answers (e.g. 404 for the missed slot)
+    and they are not retried on other hosts.
+    Hosts are tried in the configured order, so the first one is the main host.
+    """
+    HEDGE_PERCENTILE = 95
+    # Requests are not hedged until there are enough answers to estimate latency
+    MIN_SAMPLES = 20
+    LATENCY_WINDOW = 100
+    FAILURE_COOLDOWN = 60
+    MAX_WORKERS = 32
+
+    def __init__(self, hosts: Sequence[str], is_failure: Callable[[BaseException], bool]):
+        self.hosts = list(hosts)
+        self.is_failure = is_failure
+        self.stats = {host: HostStats(self.LATENCY_WINDOW) for host in self.hosts}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def request(
+        self,
+        endpoint: str,
+        send: Callable[[str], T],
+        discard: Optional[Callable[[T], None]] = None,
+    ) -> T:
+        """
+        Calls `send` with host and returns the first answer.
+        `discard` is called with late answers of other hosts, e.g. to close streamed responses.
+        """
+        if len(self.hosts) == 1:
+            return send(self.hosts[0])
+
+        hosts = self._get_hosts_by_priority()
+        pending: dict[Future, str] = {}
+        errors: list[Exception] = []
+
+        host = self._send_next(hosts, pending, endpoint, send)
+        while pending:
+            hedge_delay = self._get_hedge_delay(host, endpoint) if len(pending) + len(errors) < len(self.hosts) else None
+            done, _ = wait(pending, timeout=hedge_delay, return_when=FIRST_COMPLETED)
+
+            if not done:
+                logger.info({'msg': 'Host is slow. Send hedged request.', 'value': endpoint})
+                host = self._send_next(hosts, pending, endpoint, send)
+                continue
+
+            for future in done:
+                failed_host = pending.pop(future)
+                error = future.exception()
+                if error is None or not self.is_failure(error):
+                    self._discard_pending(pending, discard)
+                    return future.result()
+
+                logger.warning({'msg': 'Host failed. Send request to the next host.', 'value': failed_host, 'error': str(error)})
+                errors.append(error)  # type: ignore[arg-type]
+
+            if not pending:
+                host = self._send_next(hosts, pending, endpoint, send)
+
+        raise errors[0]
+
+    def _send_next(
+        self, hosts: Iterator[str], pending: dict[Future, str], endpoint: str, send: Callable[[str], T]
+    ) -> Optional[str]:
+        """Sends request to the next host in background, returns None if all hosts are already used"""
+        host = next(hosts, None)
+        if host is not None:
+            pending[self._get_executor().submit(partial(self._send, host, endpoint, send))] = host
+        return host
+
+    def _send(self, host: str, endpoint: str, send: Callable[[str], T]) -> T:
+        started = time.monotonic()
+        try:
+            result = send(host)
+        except Exception as error:
+            if self.is_failure(error):
+                self.stats[host].add_failure()
+            else:
+                self.stats[host].add_latency(endpoint, time.monotonic() - started)
+            raise error from error
+
+        self.stats[host].add_latency(endpoint, time.monotonic() - started)
+        return result
+
+    def _get_hosts_by_priority(self) -> Iterator[str]:
+        healthy = [host for host in self.hosts if self.stats[host].is_healthy(self.FAILURE_COOLDOWN)]
+        return iter(healthy + [host for host in self.hosts if host not in healthy])
+
+    def _get_hedge_delay(self, host: Optional[str], endpoint: str) -> Optional[float]:
+        if host is None:
+            return None
+        return self.stats[host].get_latency_percentile(endpoint, self.HEDGE_PERCENTILE, self.MIN_SAMPLES)
+
+    @staticmethod
+    def _discard_pending(pending: dict[Future, str], discard: Optional[Callable]) -> None:
+        def discard_answer(future: Future) -> None:
+            if discard is not None and future.exception() is None:
+                discard(future.result())
+
+        for future in pending:
+            if not future.cancel():
+                future.add_done_callback(discard_answer)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix='HedgedRequest')
+        return self._executor
@@ -1,14 +1,18 @@
 import logging
 from abc import ABC
 from http import HTTPStatus
-from typing import Optional, Tuple, Sequence
+from typing import Any, Iterator, Optional, Tuple, Sequence
 from urllib.parse import urljoin, urlparse
 
-from prometheus_client import Histogram
-from requests import Session, JSONDecodeError
+from prometheus_client import Counter, Histogram
+from requests import JSONDecodeError, RequestException, Response, Session
 from requests.adapters import HTTPAdapter
 from urllib3 import Retry
 
+from src.providers.hedging import HedgedHosts
+from src.providers.single_flight import SingleFlight, freeze_params
+from src.utils.json_stream import iter_json_array_field
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,43 +26,95 @@ class NotOkResponse(Exception):
         super().__init__(*args)
 
 
+SSZ_CONTENT_TYPE = 'application/octet-stream'
+
+# Retry policy of requests to the providers, it is shared by sync and async providers
+RETRY_STRATEGY = Retry(
+    total=5,
+    status_forcelist=[418, 429, 500, 502, 503, 504],
+    backoff_factor=5,
+)
+
+
+def split_data_and_meta(json_response: dict) -> Tuple[dict | list, dict]:
+    """Returns (data, meta)"""
+    if 'data' in json_response:
+        data = json_response['data']
+        del json_response['data']
+        meta = json_response
+    else:
+        data = json_response
+        meta = {}
+    return data, meta
+
+
 class HTTPProvider(ABC):
+    """
+    Host could be a comma separated list of hosts of the same API.
+    In this case requests are hedged between them, see HedgedHosts.
+
+    Concurrent JSON requests with the same endpoint and params share one in-flight request, see SingleFlight.
+    """
     REQUEST_TIMEOUT = 300
+    STREAM_CHUNK_SIZE = 2 ** 16
 
     PROMETHEUS_HISTOGRAM: Histogram
+    PROMETHEUS_COALESCED_COUNTER: Counter
 
     def __init__(self, host: str):
-        self.host = host
+        self.hosts = HedgedHosts([h.strip() for h in host.split(',')], self._is_host_failure)
+        self.single_flight = SingleFlight()
+        self.host = self.hosts.hosts[0]
 
-        retry_strategy = Retry(
-            total=5,
-            status_forcelist=[418, 429, 500, 502, 503, 504],
-            backoff_factor=5,
-        )
-
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(max_retries=RETRY_STRATEGY)
         self.session = Session()
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
 
+    def close(self) -> None:
+        self.session.close()
+
     @staticmethod
     def _urljoin(host, url):
         if not host.endswith('/'):
             host += '/'
         return urljoin(host, url)
 
+    @staticmethod
+    def _is_host_failure(error: BaseException) -> bool:
+        """Connection errors and server errors are failures of the host, other hosts could answer instead"""
+        if isinstance(error, NotOkResponse):
+            return error.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+        return isinstance(error, RequestException)
+
     def _get(
         self, endpoint: str, path_params: Optional[Sequence[str | int]] = None, query_params: Optional[dict] = None
     ) -> Tuple[dict | list, dict]:
         """
         Returns (data, meta)
         """
+        key = (endpoint, tuple(path_params or ()), freeze_params(query_params))
+        response, shared = self.single_flight.do(
+            key, lambda: self._get_from_hosts(endpoint, path_params, query_params),
+        )
+        if shared:
+            self.PROMETHEUS_COALESCED_COUNTER.labels(endpoint=endpoint).inc()
+        return response
+
+    def _get_from_hosts(
+        self, endpoint: str, path_params: Optional[Sequence[str | int]] = None, query_params: Optional[dict] = None
+    ) -> Tuple[dict | list, dict]:
+        return self.hosts.request(endpoint, lambda host: self._get_from_host(host, endpoint, path_params, query_params))
+
+    def _get_from_host(
+        self,
+        host: str,
+        endpoint: str,
+        path_params: Optional[Sequence[str | int]] = None,
+        query_params: Optional[dict] = None,
+    ) -> Tuple[dict | list, dict]:
         with self.PROMETHEUS_HISTOGRAM.time() as t:
-            response = self.session.get(
-                self._urljoin(self.host, endpoint.format(*path_params) if path_params else endpoint),
-                params=query_params,
-                timeout=self.REQUEST_TIMEOUT,
-            )
+            response = self._send(t, host, 'GET', endpoint, path_params, params=query_params)
 
             try:
                 if response.status_code != HTTPStatus.OK:
@@ -71,18 +127,119 @@ class HTTPProvider(ABC):
                 msg = f'Response [{response.status_code}] with text: "{str(response.text)}" returned.'
                 logger.debug({'msg': msg})
                 raise error from error
-            finally:
-                t.labels(
-                    endpoint=endpoint,
-                    code=response.status_code,
-                    domain=urlparse(self.host).netloc,
+
+        return split_data_and_meta(json_response)
+
+    def _get_stream(
+        self,
+        endpoint: str,
+        path_params: Optional[Sequence[str | int]] = None,
+        query_params: Optional[dict] = None,
+        field: str = 'data',
+        other_fields: Optional[dict] = None,
+    ) -> Iterator[Any]:
+        """
+        Returns iterator over items of the response `data` array (or another `field`, see `iter_json_array_field`).
+        Items are decoded one by one while response body is downloading, so whole JSON tree is never held in memory.
+        Response status is checked before returning iterator.
+        """
+        return self._request_stream('GET', endpoint, path_params, field, other_fields, params=query_params)
+
+    def _post_stream(
+        self, endpoint: str, path_params: Optional[Sequence[str | int]] = None, body: Optional[Any] = None
+    ) -> Iterator[Any]:
+        """
+        Same as `_get_stream`, but sends JSON body with POST request.
+        Used for requests with lists of ids that are too long for query string.
+        """
+        return self._request_stream('POST', endpoint, path_params, json=body)
+
+    def _request_stream(
+        self,
+        method: str,
+        endpoint: str,
+        path_params: Optional[Sequence[str | int]] = None,
+        field: str = 'data',
+        other_fields: Optional[dict] = None,
+        **kwargs,
+    ) -> Iterator[Any]:
+        # Hosts race until the response headers, body is downloaded only from the first host answered
+        response = self.hosts.request(
+            endpoint,
+            lambda host: self._open_stream_from_host(host, method, endpoint, path_params, **kwargs),
+            discard=Response.close,
+        )
+
+        def iter_items():
+            with response:
+                yield from iter_json_array_field(
+                    response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE), field, other_fields,
                 )
 
-        if 'data' in json_response:
-            data = json_response['data']
-            del json_response['data']
-            meta = json_response
-        else:
-            data = json_response
-            meta = {}
-        return data, meta
+        return iter_items()
+
+    def _open_stream_from_host(
+        self, host: str, method: str, endpoint: str, path_params: Optional[Sequence[str | int]] = None, **kwargs
+    ) -> Response:
+        with self.PROMETHEUS_HISTOGRAM.time() as t:
+            response = self._send(t, host, method, endpoint, path_params, stream=True, **kwargs)
+
+            if response.status_code != HTTPStatus.OK:
+                msg = f'Response [{response.status_code}] with text: "{str(response.text)}" returned.'
+                logger.debug({'msg': msg})
+                raise NotOkResponse(msg, status=response.status_code, text=response.text)
+
+        return response
+
+    def _get_ssz(self, endpoint: str, path_params: Optional[Sequence[str | int]] = None) -> memoryview:
+        """
+        Returns SSZ encoded response body.
+        Raises ValueError if server ignored Accept header, in this case body is not downloaded.
+        """
+        # Hosts race until the response headers, body is downloaded only from the first host answered
+        response = self.hosts.request(
+            endpoint,
+            lambda host: self._open_ssz_stream_from_host(host, endpoint, path_params),
+            discard=Response.close,
+        )
+
+        with response:
+            # Unlike response.content, this does not keep chunks and joined body in memory at the same time
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+                body += chunk
+
+        return memoryview(body)
+
+    def _open_ssz_stream_from_host(
+        self, host: str, endpoint: str, path_params: Optional[Sequence[str | int]] = None
+    ) -> Response:
+        response = self._open_stream_from_host(host, 'GET', endpoint, path_params, headers={'Accept': SSZ_CONTENT_TYPE})
+
+        content_type = response.headers.get('Content-Type', '')
+        if not content_type.startswith(SSZ_CONTENT_TYPE):
+            response.close()
+            raise ValueError(f'Expected SSZ response, got "{content_type}" content type.')
+
+        return response
+
+    def _send(
+        self, timer, host: str, method: str, endpoint: str, path_params: Optional[Sequence[str | int]] = None, **kwargs
+    ) -> Response:
+        """
+        Sends request to the host and sets histogram labels of the timer.
+        Connection errors are observed with error class name as a code.
+        """
+        try:
+            response = self.session.request(
+                method,
+                self._urljoin(host, endpoint.format(*path_params) if path_params else endpoint),
+                timeout=self.REQUEST_TIMEOUT,
+                **kwargs,
+            )
+        except RequestException as error:
+            timer.labels(endpoint=endpoint, code=type(error).__name__, domain=urlparse(host).netloc)
+            raise error from error
+
+        timer.labels(endpoint=endpoint, code=response.status_code, domain=urlparse(host).netloc)
+        return response
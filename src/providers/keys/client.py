@@ -1,12 +1,21 @@
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from typing import Optional, cast
 
-from src.metrics.prometheus.basic import KEYS_API_REQUESTS_DURATION, KEYS_API_LATEST_BLOCKNUMBER
+from src.metrics.logging import logging
+from src.metrics.prometheus.basic import (
+    KEYS_API_LATEST_BLOCKNUMBER,
+    KEYS_API_REQUESTS_COALESCED,
+    KEYS_API_REQUESTS_DURATION,
+)
 from src.providers.http_provider import HTTPProvider
-from src.providers.keys.typings import LidoKey, KeysApiStatus
+from src.providers.keys.store import LidoKeysStore
+from src.providers.keys.table import LidoKeysTable
+from src.providers.keys.typings import KeysApiModule, KeysApiStatus
 from src.typings import BlockStamp
-from src.utils.dataclass import list_of_dataclasses
+from src.utils.cache import REGISTRY_REGION_SIZE, cached
+
+logger = logging.getLogger(__name__)
 
 
 class KeysOutdatedException(Exception):
@@ -18,33 +27,144 @@ class KeysAPIClient(HTTPProvider):
     RETRY_COUNT = 5
     REQUEST_TIMEOUT = 10
     SLEEP_SECONDS = 12
+    MAX_SLEEP_SECONDS = 120
 
     PROMETHEUS_HISTOGRAM = KEYS_API_REQUESTS_DURATION
+    PROMETHEUS_COALESCED_COUNTER = KEYS_API_REQUESTS_COALESCED
 
-    ALL_KEYS = 'v1/keys'
+    MODULES = 'v1/modules'
+    MODULE_KEYS = 'v1/modules/{}/keys'
     STATUS = 'v1/status'
 
-    def _get_with_blockstamp(self, url: str, blockstamp: BlockStamp, params: Optional[dict] = None) -> dict | list:
+    keys_store: Optional[LidoKeysStore] = None
+
+    def _get_with_blockstamp(
+        self, url: str, blockstamp: BlockStamp, params: Optional[dict] = None
+    ) -> tuple[dict | list, dict]:
         """
-        Returns response if blockstamp < blockNumber from response
+        Returns (data, meta) if blockstamp < blockNumber from response.
+        Freshness is checked with the light status request first, so the data is downloaded only once.
+        Data could still come from an older snapshot (e.g. from another Keys API instance behind a balancer),
+        then the snapshot is waited for again.
         """
         for i in range(self.RETRY_COUNT):
+            self.wait_for_snapshot(blockstamp)
+
             data, meta = self._get(url, query_params=params)
             blocknumber_meta = meta['meta']['elBlockSnapshot']['blockNumber']
             KEYS_API_LATEST_BLOCKNUMBER.set(blocknumber_meta)
-            if blocknumber_meta >= blockstamp.block_number:
-                return data
+            lag = blockstamp.block_number - blocknumber_meta
+            if lag <= 0:
+                return data, meta
 
             if i != self.RETRY_COUNT - 1:
-                sleep(self.SLEEP_SECONDS)
+                sleep_seconds = self._get_sleep_seconds(lag, i)
+                logger.warning({
+                    'msg': f'Keys API returned data {lag} blocks behind the status. Wait {sleep_seconds} seconds.',
+                })
+                sleep(sleep_seconds)
+
+        raise KeysOutdatedException(
+            f'Keys API returned data from block {blocknumber_meta}, expected at least {blockstamp.block_number}.'
+        )
+
+    def wait_for_snapshot(self, blockstamp: BlockStamp) -> None:
+        """
+        Waits until Keys API snapshot reaches blockstamp's block.
+        Sleep between retries depends on the lag of Keys API, see `_get_sleep_seconds`.
+        """
+        waited = 0.0
+        for i in range(self.RETRY_COUNT):
+            blocknumber = self.get_status().elBlockSnapshot.blockNumber
+            KEYS_API_LATEST_BLOCKNUMBER.set(blocknumber)
+            lag = blockstamp.block_number - blocknumber
+            if lag <= 0:
+                return
 
-        raise KeysOutdatedException(f'Keys API Service stuck, no updates for {self.SLEEP_SECONDS * self.RETRY_COUNT} seconds.')
+            if i != self.RETRY_COUNT - 1:
+                sleep_seconds = self._get_sleep_seconds(lag, i)
+                logger.info({'msg': f'Keys API is {lag} blocks behind. Wait {sleep_seconds} seconds.'})
+                sleep(sleep_seconds)
+                waited += sleep_seconds
+
+        raise KeysOutdatedException(f'Keys API Service stuck, no updates for {waited} seconds.')
+
+    def _get_sleep_seconds(self, lag: int, attempt: int) -> float:
+        """
+        Keys API follows the chain block by block, so a small lag is waited out in a few slots.
+        Large lag means Keys API is syncing or stuck, so the sleep grows exponentially up to MAX_SLEEP_SECONDS.
+        """
+        return min(self.SLEEP_SECONDS * min(lag, 2 ** attempt), self.MAX_SLEEP_SECONDS)
+
+    @cached(maxsize=REGISTRY_REGION_SIZE)
+    def get_all_lido_keys(self, blockstamp: BlockStamp) -> LidoKeysTable:
+        """
+        Returns used keys of all staking modules.
 
-    @lru_cache(maxsize=1)
-    @list_of_dataclasses(LidoKey.from_response)
-    def get_all_lido_keys(self, blockstamp: BlockStamp) -> list[dict]:
-        """Docs: https://keys-api.lido.fi/api/static/index.html#/sr-module-keys/SRModulesKeysController_getGroupedByModuleKeys"""
-        return cast(list[dict], self._get_with_blockstamp(self.ALL_KEYS, blockstamp))
+        Keys of the modules are streamed in parallel right into the compact table.
+        If keys store is set, only keys of the modules with changed nonce are downloaded.
+        Keys API snapshot could move on during the download, it is fine while the module keys are not changed.
+        So keys are taken if the module nonce is the same as in the modules list, otherwise the list is requested again
+        and only keys of the changed modules are downloaded.
+        """
+        downloaded: dict[int, tuple[KeysApiModule, LidoKeysTable]] = {}
+        for _ in range(self.RETRY_COUNT):
+            modules, _ = self.get_modules(blockstamp)
+            tables = {module.id: self._get_known_keys(module, downloaded) for module in modules}
+            outdated_modules = [module for module in modules if tables[module.id] is None]
+
+            if outdated_modules:
+                logger.info({'msg': 'Download keys of the modules.', 'value': [module.id for module in outdated_modules]})
+                with ThreadPoolExecutor(max_workers=len(outdated_modules)) as executor:
+                    results = list(executor.map(self.get_module_keys, outdated_modules))
+
+                changed_modules = []
+                for module, (table, downloaded_module) in zip(outdated_modules, results):
+                    if downloaded_module.nonce != module.nonce:
+                        changed_modules.append(module.id)
+                        continue
+
+                    tables[module.id] = table
+                    downloaded[module.id] = (module, table)
+                    if self.keys_store:
+                        self.keys_store.save(module, table)
+
+                if changed_modules:
+                    logger.warning({'msg': 'Modules keys changed during keys download. Download them again.', 'value': changed_modules})
+                    continue
+
+            return LidoKeysTable.concat([cast(LidoKeysTable, tables[module.id]) for module in modules])
+
+        raise KeysOutdatedException('Modules keys change during each keys download.')
+
+    def _get_known_keys(
+        self, module: KeysApiModule, downloaded: dict[int, tuple[KeysApiModule, LidoKeysTable]],
+    ) -> Optional[LidoKeysTable]:
+        """Returns keys of the module downloaded by previous attempt or saved in the keys store with the same nonce"""
+        if module.id in downloaded and downloaded[module.id][0] == module:
+            return downloaded[module.id][1]
+        return self.keys_store.get(module) if self.keys_store else None
+
+    def get_modules(self, blockstamp: BlockStamp) -> tuple[list[KeysApiModule], dict]:
+        """
+        Returns staking modules and Keys API snapshot they are taken from.
+        Docs: https://keys-api.lido.fi/api/static/index.html#/sr-module/SRModulesController_getModules
+        """
+        data, meta = self._get_with_blockstamp(self.MODULES, blockstamp)
+        modules = [KeysApiModule.from_response(**module) for module in cast(list[dict], data)]
+        return modules, meta['meta']['elBlockSnapshot']
+
+    def get_module_keys(self, module: KeysApiModule) -> tuple[LidoKeysTable, KeysApiModule]:
+        """
+        Returns used keys of the staking module and the module state (with nonce) they are taken at.
+        Docs: https://keys-api.lido.fi/api/static/index.html#/sr-module-keys/SRModulesKeysController_getModuleKeys
+        """
+        other_fields: dict = {}
+        records = self._get_stream(
+            self.MODULE_KEYS, (module.id,), {'used': 'true'}, field='data.keys', other_fields=other_fields,
+        )
+        table = LidoKeysTable.from_responses(records, module.id, module.stakingModuleAddress)
+        return table, KeysApiModule.from_response(**other_fields['data']['module'])
 
     def get_status(self) -> KeysApiStatus:
         """Docs: https://keys-api.lido.fi/api/static/index.html#/status/StatusController_get"""
@@ -0,0 +1,106 @@
+import logging
+import os
+import struct
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from eth_typing import ChecksumAddress
+from web3 import Web3
+
+from src.providers.keys.table import PUBKEY_LENGTH, LidoKeysTable
+from src.providers.keys.typings import KeysApiModule
+
+logger = logging.getLogger(__name__)
+
+
+KEYS_SUFFIX = '.keys'
+# magic, format version, module nonce, module address, keys count
+HEADER = struct.Struct('<4sIQ20sQ')
+MAGIC = b'LOKS'
+VERSION = 1
+
+
+class LidoKeysStore:
+    """
+    Keys of the staking modules together with the module nonce they were downloaded at.
+
+    Module nonce is changed on every change of the module keys, so keys of the module with the same nonce
+    could be reused instead of downloading them again.
+    Keys are kept in memory, and on disk if path is set, so they are reused after restart too.
+    """
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._modules: dict[int, tuple[KeysApiModule, LidoKeysTable]] = {}
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    def get(self, module: KeysApiModule) -> Optional[LidoKeysTable]:
+        """Returns keys of the module if they were saved with the same module nonce"""
+        if module.id not in self._modules and self.path is not None:
+            self._load(self.path / f'{module.id}{KEYS_SUFFIX}', module.id)
+
+        saved = self._modules.get(module.id)
+        if saved is None:
+            return None
+
+        saved_module, table = saved
+        if saved_module.nonce != module.nonce or saved_module.stakingModuleAddress.lower() != module.stakingModuleAddress.lower():
+            return None
+
+        return table
+
+    def save(self, module: KeysApiModule, table: LidoKeysTable) -> None:
+        self._modules[module.id] = (module, table)
+        if self.path is None:
+            return
+
+        file_path = self.path / f'{module.id}{KEYS_SUFFIX}'
+        # Unique name, so concurrent writers of the same module (e.g. accounting and ejector) do not mix their files
+        tmp_path = file_path.with_name(f'{file_path.name}.{uuid.uuid4().hex}.tmp')
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(HEADER.pack(
+                    MAGIC, VERSION, module.nonce, bytes.fromhex(module.stakingModuleAddress[2:]), len(table),
+                ))
+                file.write(np.ascontiguousarray(table.pubkey, dtype=np.uint8).data)
+                file.write(np.ascontiguousarray(table.operator_index, dtype='<u8').data)
+            os.replace(tmp_path, file_path)
+        except OSError as error:
+            logger.warning({'msg': 'Failed to save module keys.', 'value': module.id, 'error': str(error)})
+            tmp_path.unlink(missing_ok=True)
+
+    def _load(self, file_path: Path, module_id: int) -> None:
+        if not file_path.exists():
+            return
+
+        try:
+            data = file_path.read_bytes()
+            if len(data) < HEADER.size:
+                raise ValueError('Keys file is too short.')
+
+            magic, version, nonce, address, count = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError('Unknown keys file format.')
+
+            if len(data) != HEADER.size + count * (PUBKEY_LENGTH + 8):
+                raise ValueError('Keys file size does not match keys count.')
+        except (OSError, ValueError) as error:
+            logger.warning({'msg': 'Failed to load module keys. Remove them.', 'value': module_id, 'error': str(error)})
+            file_path.unlink(missing_ok=True)
+            return
+
+        module_address = ChecksumAddress(Web3.to_checksum_address(address))
+        pubkeys_end = HEADER.size + count * PUBKEY_LENGTH
+        table = LidoKeysTable(
+            pubkey=np.frombuffer(data, dtype=np.uint8, count=count * PUBKEY_LENGTH, offset=HEADER.size).reshape(
+                -1, PUBKEY_LENGTH,
+            ),
+            operator_index=np.frombuffer(data, dtype='<u8', count=count, offset=pubkeys_end).astype(np.uint64),
+            module_id=np.full(count, module_id, dtype=np.uint32),
+            modules_addresses={module_id: module_address},
+        )
+        module = KeysApiModule(id=module_id, stakingModuleAddress=module_address, nonce=nonce)
+        self._modules[module_id] = (module, table)
+        logger.info({'msg': 'Load module keys.', 'value': {'module': module_id, 'nonce': nonce, 'keys': count}})
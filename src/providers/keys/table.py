@@ -0,0 +1,128 @@
+from array import array
+from typing import Any, Iterable, Iterator, Sequence, overload
+
+import numpy as np
+from eth_typing import ChecksumAddress, HexStr
+
+from src.providers.keys.typings import LidoKey
+
+PUBKEY_LENGTH = 48
+
+
+class LidoKeysTable(Sequence[LidoKey]):
+    """
+    Used Lido keys stored column by column: (n, 48) pubkeys byte matrix, operator index and staking module id.
+    Module addresses are stored once per module.
+
+    Table still behaves like a sequence of LidoKey dataclasses, each row is materialized on access.
+    Deposit signatures are not downloaded, so they are empty in materialized keys.
+    """
+    def __init__(
+        self,
+        pubkey: np.ndarray,
+        operator_index: np.ndarray,
+        module_id: np.ndarray,
+        modules_addresses: dict[int, ChecksumAddress],
+    ):
+        self.pubkey = pubkey
+        self.operator_index = operator_index
+        self.module_id = module_id
+        self.modules_addresses = modules_addresses
+
+    @classmethod
+    def from_responses(
+        cls, records: Iterable[dict[str, Any]], module_id: int, module_address: ChecksumAddress,
+    ) -> 'LidoKeysTable':
+        """
+        Build table from raw Keys API records of one staking module. Unused keys are skipped.
+        Records are consumed one by one, so it could be used with streamed response.
+        """
+        pubkey = bytearray()
+        operator_index = array('Q')
+
+        for record in records:
+            if not record.get('used', True):
+                continue
+
+            key = bytes.fromhex(record['key'][2:] if record['key'].startswith('0x') else record['key'])
+            if len(key) != PUBKEY_LENGTH:
+                raise ValueError(f'Expected {PUBKEY_LENGTH} bytes pubkey, got "{record["key"]}".')
+
+            pubkey += key
+            operator_index.append(int(record['operatorIndex']))
+
+        return cls(
+            pubkey=np.frombuffer(pubkey, dtype=np.uint8).reshape(-1, PUBKEY_LENGTH),
+            operator_index=np.frombuffer(operator_index, dtype=np.uint64),
+            module_id=np.full(len(operator_index), module_id, dtype=np.uint32),
+            modules_addresses={module_id: module_address},
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence['LidoKeysTable']) -> 'LidoKeysTable':
+        modules_addresses = {}
+        for table in tables:
+            modules_addresses.update(table.modules_addresses)
+
+        if not tables:
+            return cls(
+                pubkey=np.empty((0, PUBKEY_LENGTH), dtype=np.uint8),
+                operator_index=np.empty(0, dtype=np.uint64),
+                module_id=np.empty(0, dtype=np.uint32),
+                modules_addresses=modules_addresses,
+            )
+
+        return cls(
+            pubkey=np.concatenate([table.pubkey for table in tables]),
+            operator_index=np.concatenate([table.operator_index for table in tables]),
+            module_id=np.concatenate([table.module_id for table in tables]),
+            modules_addresses=modules_addresses,
+        )
+
+    def __len__(self) -> int:
+        return len(self.operator_index)
+
+    @overload
+    def __getitem__(self, item: int) -> LidoKey:
+        ...
+
+    @overload
+    def __getitem__(self, item: slice) -> 'LidoKeysTable':
+        ...
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return LidoKeysTable(
+                self.pubkey[item], self.operator_index[item], self.module_id[item], self.modules_addresses,
+            )
+
+        if not -len(self) <= item < len(self):
+            raise IndexError('Lido keys table index out of range.')
+
+        return self._row(item)
+
+    def __iter__(self) -> Iterator[LidoKey]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def pubkey_hex(self, row: int) -> str:
+        return '0x' + self.pubkey[row].tobytes().hex()
+
+    def iter_pubkeys(self) -> Iterator[str]:
+        """Hex pubkeys without materializing rows"""
+        raw = self.pubkey.tobytes()
+        return ('0x' + raw[i:i + PUBKEY_LENGTH].hex() for i in range(0, len(raw), PUBKEY_LENGTH))
+
+    def _row(self, row: int) -> LidoKey:
+        return LidoKey(
+            key=HexStr(self.pubkey_hex(row)),
+            depositSignature=HexStr(''),
+            operatorIndex=int(self.operator_index[row]),
+            used=True,
+            moduleAddress=self.modules_addresses[int(self.module_id[row])],
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns"""
+        return self.pubkey.nbytes + self.operator_index.nbytes + self.module_id.nbytes
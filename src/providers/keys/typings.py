@@ -2,7 +2,7 @@ from dataclasses import dataclass
 
 from eth_typing import ChecksumAddress, HexStr
 
-from src.utils.dataclass import FromResponse
+from src.utils.dataclass import FromResponse, Nested
 
 
 @dataclass
@@ -15,6 +15,21 @@ class LidoKey(FromResponse):
 
 
 @dataclass
-class KeysApiStatus(FromResponse):
+class KeysApiModule(FromResponse):
+    id: int
+    stakingModuleAddress: ChecksumAddress
+    nonce: int
+
+
+@dataclass
+class ELBlockSnapshot(FromResponse):
+    blockNumber: int
+    blockHash: HexStr
+    timestamp: int
+
+
+@dataclass
+class KeysApiStatus(Nested, FromResponse):
     appVersion: str
     chainId: int
+    elBlockSnapshot: ELBlockSnapshot
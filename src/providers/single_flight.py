@@ -0,0 +1,52 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key.
+
+    The first caller runs the function, callers with the same key that come while it is running
+    wait for it and get the same result or exception.
+    Nothing is kept after the call is finished, so it is not a cache: the next call runs the function again.
+    Result is shared between callers as is, so it must not be mutated.
+    """
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> Tuple[T, bool]:
+        """Returns result and whether it is shared with the in-flight call"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = Future()
+                shared = False
+            else:
+                shared = True
+
+        if shared:
+            return call.result(), True
+
+        try:
+            result = func()
+        except BaseException as error:
+            call.set_exception(error)
+            raise
+        else:
+            call.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return result, False
+
+
+def freeze_params(params: dict | None) -> Tuple:
+    """Hashable representation of the query params"""
+    return tuple(
+        sorted((key, tuple(value) if isinstance(value, (list, tuple)) else value) for key, value in (params or {}).items())
+    )
@@ -9,6 +9,7 @@ from src.modules.accounting.typings import LidoReportRebase
 from src.modules.submodules.consensus import FrameConfig, ChainConfig
 from src.services.bunker_cases.typings import BunkerConfig
 from src.typings import BlockStamp, ReferenceBlockStamp, Gwei
+from src.web3py.multicall import aggregate_calls
 from src.web3py.typings import Web3
 
 
@@ -47,7 +48,13 @@ class BunkerService:
             return True
 
         high_midterm_slashing_penalty = MidtermSlashingPenalty.is_high_midterm_slashing_penalty(
-            blockstamp, frame_config, chain_config, all_validators, lido_validators, current_report_cl_rebase, last_report_ref_slot
+            blockstamp,
+            frame_config,
+            chain_config,
+            self.w3.validator_set_stats.get_validator_set_stats(blockstamp),
+            lido_validators,
+            current_report_cl_rebase,
+            last_report_ref_slot,
         )
         if high_midterm_slashing_penalty:
             logger.info({"msg": "Bunker ON. High midterm slashing penalty"})
@@ -82,17 +89,24 @@ class BunkerService:
         Get config values from OracleDaemonConfig contract
         """
         config = self.w3.lido_contracts.oracle_daemon_config
+        (
+            normalized_cl_reward_per_epoch,
+            normalized_cl_reward_mistake_rate_bp,
+            rebase_check_nearest_epoch_distance,
+            rebase_check_distant_epoch_distance,
+        ) = aggregate_calls(
+            self.w3,
+            [
+                config.functions.get('NORMALIZED_CL_REWARD_PER_EPOCH'),
+                config.functions.get('NORMALIZED_CL_REWARD_MISTAKE_RATE_BP'),
+                config.functions.get('REBASE_CHECK_NEAREST_EPOCH_DISTANCE'),
+                config.functions.get('REBASE_CHECK_DISTANT_EPOCH_DISTANCE'),
+            ],
+            blockstamp.block_hash,
+        )
         return BunkerConfig(
-            Web3.to_int(
-                config.functions.get('NORMALIZED_CL_REWARD_PER_EPOCH').call(block_identifier=blockstamp.block_hash)
-            ),
-            Web3.to_int(
-                config.functions.get('NORMALIZED_CL_REWARD_MISTAKE_RATE_BP').call(block_identifier=blockstamp.block_hash)
-            ) / TOTAL_BASIS_POINTS,
-            Web3.to_int(
-                config.functions.get('REBASE_CHECK_NEAREST_EPOCH_DISTANCE').call(block_identifier=blockstamp.block_hash)
-            ),
-            Web3.to_int(
-                config.functions.get('REBASE_CHECK_DISTANT_EPOCH_DISTANCE').call(block_identifier=blockstamp.block_hash)
-            )
+            Web3.to_int(normalized_cl_reward_per_epoch),
+            Web3.to_int(normalized_cl_reward_mistake_rate_bp) / TOTAL_BASIS_POINTS,
+            Web3.to_int(rebase_check_nearest_epoch_distance),
+            Web3.to_int(rebase_check_distant_epoch_distance),
         )
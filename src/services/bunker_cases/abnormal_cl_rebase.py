@@ -1,5 +1,6 @@
 import logging
 import math
+from concurrent.futures import ThreadPoolExecutor
 
 from statistics import mean
 from typing import Sequence
@@ -8,13 +9,14 @@ from web3.types import EventData
 
 from src.constants import MAX_EFFECTIVE_BALANCE
 from src.modules.submodules.typings import ChainConfig
-from src.providers.consensus.typings import Validator
+from src.providers.consensus.typings import Validator, ValidatorBalance
 from src.providers.keys.typings import LidoKey
 from src.services.bunker_cases.typings import BunkerConfig
 from src.typings import ReferenceBlockStamp, Gwei, BlockNumber, SlotNumber, BlockStamp, EpochNumber
+from src.utils.events import get_events
 from src.utils.slot import get_blockstamp, get_reference_blockstamp
 from src.utils.validator_state import calculate_active_effective_balance_sum
-from src.web3py.extensions.lido_validators import LidoValidator, LidoValidatorsProvider
+from src.web3py.extensions.lido_validators import LidoValidator
 from src.web3py.typings import Web3
 
 
@@ -23,9 +25,9 @@ logger = logging.getLogger(__name__)
 
 class AbnormalClRebase:
 
-    all_validators: list[Validator]
+    all_validators: Sequence[Validator]
     lido_validators: list[LidoValidator]
-    lido_keys: list[LidoKey]
+    lido_keys: Sequence[LidoKey]
 
     def __init__(self, w3: Web3, c_conf: ChainConfig, b_conf: BunkerConfig):
         self.w3 = w3
@@ -35,7 +37,7 @@ class AbnormalClRebase:
     def is_abnormal_cl_rebase(
         self,
         blockstamp: ReferenceBlockStamp,
-        all_validators: list[Validator],
+        all_validators: Sequence[Validator],
         lido_validators: list[LidoValidator],
         current_report_cl_rebase: Gwei
     ) -> bool:
@@ -73,7 +75,7 @@ class AbnormalClRebase:
         epochs_passed_since_last_report = blockstamp.ref_epoch - last_report_blockstamp.ref_epoch
 
         last_report_all_validators = self.w3.cc.get_validators_no_cache(last_report_blockstamp)
-        last_report_lido_validators = LidoValidatorsProvider.merge_validators_with_keys(
+        last_report_lido_validators = self.w3.lido_validators.merge_validators_with_keys(
             self.lido_keys, last_report_all_validators
         )
 
@@ -134,12 +136,12 @@ class AbnormalClRebase:
             distant_slot, nearest_slot, ref_blockstamp.slot_number
         )
 
-        nearest_blockstamp = get_blockstamp(
-            self.w3.cc, nearest_slot, last_finalized_slot_number=ref_blockstamp.slot_number
-        )
-        distant_blockstamp = get_blockstamp(
-            self.w3.cc, distant_slot, last_finalized_slot_number=ref_blockstamp.slot_number
-        )
+        # Blockstamps are independent, so their headers and blocks are requested concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            nearest_blockstamp, distant_blockstamp = executor.map(
+                lambda slot: get_blockstamp(self.w3.cc, slot, last_finalized_slot_number=ref_blockstamp.slot_number),
+                (nearest_slot, distant_slot),
+            )
 
         return nearest_blockstamp, distant_blockstamp
 
@@ -154,11 +156,13 @@ class AbnormalClRebase:
         withdrawn events from WithdrawalVault contract.
         Check for these events is enough to account for all withdrawals since the protocol assumes that
         the vault can only be withdrawn at the time of the Oracle report
+
+        Lido validators on prev_blockstamp are a subset of the reference ones (with the same indices),
+        so only their balances are requested instead of the whole validators registry
         """
-        prev_lido_validators = LidoValidatorsProvider.merge_validators_with_keys(
-            self.lido_keys,
-            self.w3.cc.get_validators_no_cache(prev_blockstamp),
-        )
+        lido_validators_indices = self._get_lido_validators_indices()
+        prev_lido_validators = self.w3.cc.get_validators_balances(prev_blockstamp, lido_validators_indices)
+        AbnormalClRebase.validate_requested_validators(prev_lido_validators, lido_validators_indices)
 
         # Get Lido validators' balances with WithdrawalVault balance
         ref_lido_balance_with_vault = self._get_lido_validators_balance_with_vault(
@@ -187,8 +191,11 @@ class AbnormalClRebase:
 
         return cl_rebase
 
+    def _get_lido_validators_indices(self) -> list[int]:
+        return [int(v.index) for v in self.lido_validators]
+
     def _get_lido_validators_balance_with_vault(
-        self, blockstamp: BlockStamp, lido_validators: list[LidoValidator]
+        self, blockstamp: BlockStamp, lido_validators: Sequence[Validator | ValidatorBalance]
     ) -> Gwei:
         """
         Get Lido validator balance with withdrawals vault balance
@@ -231,9 +238,11 @@ class AbnormalClRebase:
 
     def _get_eth_distributed_events(self, from_block: BlockNumber, to_block: BlockNumber) -> list[EventData]:
         """Get ETHDistributed events between blocks"""
-        return self.w3.lido_contracts.lido.events.ETHDistributed.get_logs(  # type: ignore[attr-defined]
-            fromBlock=from_block,
-            toBlock=to_block,
+        return get_events(
+            self.w3.lido_contracts.lido.events.ETHDistributed,  # type: ignore[arg-type]
+            from_block,
+            to_block,
+            self.w3.lido_contracts.events_index,
         )
 
     def _get_last_report_reference_blockstamp(self, ref_blockstamp: ReferenceBlockStamp) -> ReferenceBlockStamp:
@@ -248,8 +257,8 @@ class AbnormalClRebase:
 
     @staticmethod
     def calculate_validators_count_diff_in_gwei(
-        prev_validators: Sequence[Validator],
-        ref_validators: Sequence[Validator],
+        prev_validators: Sequence[Validator | ValidatorBalance],
+        ref_validators: Sequence[Validator | ValidatorBalance],
     ) -> Gwei:
         """
         Handle 32 ETH balances of freshly baked validators, who was activated between epochs
@@ -281,6 +290,16 @@ class AbnormalClRebase:
         )
         return Gwei(int(mean((ref_effective_balance_sum, last_report_effective_balance_sum))))
 
+    @staticmethod
+    def validate_requested_validators(
+        validators: Sequence[Validator | ValidatorBalance],
+        requested_indices: Sequence[int],
+    ) -> None:
+        """CL API should return only requested validators, each of them once"""
+        requested = set(requested_indices)
+        if len(validators) > len(requested) or any(int(v.index) not in requested for v in validators):
+            raise ValueError("Response contains validators that were not requested. Something went wrong with CL API")
+
     @staticmethod
     def validate_slot_distance(distant_slot: SlotNumber, nearest_slot: SlotNumber, ref_slot: SlotNumber):
         if distant_slot <= nearest_slot <= ref_slot:
@@ -290,7 +309,7 @@ class AbnormalClRebase:
         )
 
     @staticmethod
-    def calculate_validators_balance_sum(validators: Sequence[Validator]) -> Gwei:
+    def calculate_validators_balance_sum(validators: Sequence[Validator | ValidatorBalance]) -> Gwei:
         return Gwei(sum(int(v.balance) for v in validators))
 
     @staticmethod
@@ -1,4 +1,5 @@
 import logging
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 
 from src.constants import (
@@ -10,8 +11,8 @@ from src.constants import (
 from src.modules.submodules.typings import FrameConfig, ChainConfig
 from src.providers.consensus.typings import Validator
 from src.typings import EpochNumber, Gwei, ReferenceBlockStamp, FrameNumber, SlotNumber
-from src.utils.validator_state import calculate_active_effective_balance_sum
 from src.web3py.extensions.lido_validators import LidoValidator
+from src.web3py.extensions.validator_set_stats import ValidatorSetStats
 
 
 logger = logging.getLogger(__name__)
@@ -24,15 +25,13 @@ class MidtermSlashingPenalty:
         blockstamp: ReferenceBlockStamp,
         frame_config: FrameConfig,
         chain_config: ChainConfig,
-        all_validators: list[Validator],
+        validator_set_stats: ValidatorSetStats,
         lido_validators: list[LidoValidator],
         current_report_cl_rebase: Gwei,
         last_report_ref_slot: SlotNumber
     ) -> bool:
         logger.info({"msg": "Detecting high midterm slashing penalty"})
-        all_slashed_validators = MidtermSlashingPenalty.get_slashed_validators_with_impact_on_midterm_penalties(
-            all_validators, blockstamp.ref_epoch
-        )
+        all_slashed_validators = validator_set_stats.slashed_with_midterm_impact
         logger.info({"msg": f"All slashings with impact on midterm penalties: {len(all_slashed_validators)}"})
 
         # Put all Lido slashed validators to future frames by midterm penalty epoch
@@ -47,7 +46,7 @@ class MidtermSlashingPenalty:
 
         # We should calculate total balance for each midterm penalty epoch and
         # make projection based on the current state of the chain
-        total_balance = calculate_active_effective_balance_sum(all_validators, blockstamp.ref_epoch)
+        total_balance = validator_set_stats.active_effective_balance_sum
 
         # Calculate sum of Lido midterm penalties in each future frame
         frames_lido_midterm_penalties = MidtermSlashingPenalty.get_future_midterm_penalty_sum_in_frames(
@@ -79,17 +78,29 @@ class MidtermSlashingPenalty:
         https://github.com/ethereum/consensus-specs/blob/dev/specs/altair/beacon-chain.md#modified-slash_validator
         https://github.com/ethereum/consensus-specs/blob/dev/specs/phase0/beacon-chain.md#initiate_validator_exit
         """
+        first_epoch, last_epoch = MidtermSlashingPenalty.get_possible_slashed_epochs_range(validator, ref_epoch)
+        return [EpochNumber(epoch) for epoch in range(first_epoch, last_epoch + 1)]
+
+    @staticmethod
+    def get_possible_slashed_epochs_range(
+        validator: Validator,
+        ref_epoch: EpochNumber,
+    ) -> tuple[EpochNumber, EpochNumber]:
+        """
+        Returns first and last epochs of `get_possible_slashed_epochs`.
+        Range is empty if the first epoch is greater than the last one.
+        """
         v = validator.validator
 
         if int(v.withdrawable_epoch) - int(v.exit_epoch) > MIN_VALIDATOR_WITHDRAWABILITY_DELAY:
             determined_slashed_epoch = EpochNumber(int(v.withdrawable_epoch) - EPOCHS_PER_SLASHINGS_VECTOR)
-            return [determined_slashed_epoch]
+            return determined_slashed_epoch, determined_slashed_epoch
 
-        earliest_possible_slashed_epoch = max(0, ref_epoch - EPOCHS_PER_SLASHINGS_VECTOR)
+        earliest_possible_slashed_epoch = EpochNumber(max(0, ref_epoch - EPOCHS_PER_SLASHINGS_VECTOR))
         # We get here `min` because exit queue can be greater than `EPOCHS_PER_SLASHINGS_VECTOR`
         # So possible slashed epoch can not be greater than `ref_epoch`
-        latest_possible_epoch = min(ref_epoch, int(v.withdrawable_epoch) - EPOCHS_PER_SLASHINGS_VECTOR)
-        return [EpochNumber(epoch) for epoch in range(earliest_possible_slashed_epoch, latest_possible_epoch + 1)]
+        latest_possible_epoch = EpochNumber(min(ref_epoch, int(v.withdrawable_epoch) - EPOCHS_PER_SLASHINGS_VECTOR))
+        return earliest_possible_slashed_epoch, latest_possible_epoch
 
     @staticmethod
     def get_lido_validators_with_future_midterm_epoch(
@@ -122,11 +133,12 @@ class MidtermSlashingPenalty:
         per_frame_validators: dict[FrameNumber, list[LidoValidator]],
     ) -> dict[FrameNumber, Gwei]:
         """Calculate sum of midterm penalties in each frame"""
+        slashed_epochs_index = SlashedEpochsIndex(ref_epoch, all_slashed_validators)
+
         per_frame_midterm_penalty_sum: dict[FrameNumber, Gwei] = {}
         for frame_number, validators_in_future_frame in per_frame_validators.items():
             per_frame_midterm_penalty_sum[frame_number] = MidtermSlashingPenalty.predict_midterm_penalty_in_frame(
-                ref_epoch,
-                all_slashed_validators,
+                slashed_epochs_index,
                 total_balance,
                 validators_in_future_frame
             )
@@ -135,8 +147,7 @@ class MidtermSlashingPenalty:
 
     @staticmethod
     def predict_midterm_penalty_in_frame(
-        ref_epoch: EpochNumber,
-        all_slashed_validators: list[Validator],
+        slashed_epochs_index: 'SlashedEpochsIndex',
         total_balance: Gwei,
         midterm_penalized_validators_in_frame: list[LidoValidator]
     ) -> Gwei:
@@ -144,11 +155,9 @@ class MidtermSlashingPenalty:
         penalty_in_frame = 0
         for validator in midterm_penalized_validators_in_frame:
             midterm_penalty_epoch = MidtermSlashingPenalty.get_midterm_penalty_epoch(validator)
-            bound_slashed_validators = MidtermSlashingPenalty.get_bound_with_midterm_epoch_slashed_validators(
-                ref_epoch, all_slashed_validators, EpochNumber(midterm_penalty_epoch)
-            )
+            bound_slashed_validators_count = slashed_epochs_index.count_bound_with_midterm_epoch(midterm_penalty_epoch)
             penalty_in_frame += MidtermSlashingPenalty.get_validator_midterm_penalty(
-                validator, len(bound_slashed_validators), total_balance
+                validator, bound_slashed_validators_count, total_balance
             )
         return Gwei(penalty_in_frame)
 
@@ -183,31 +192,19 @@ class MidtermSlashingPenalty:
         Get bounded slashed validators for particular epoch
         All slashings that happened in the nearest EPOCHS_PER_SLASHINGS_VECTOR ago considered as bounded
         """
-        min_bound_epoch = max(0, midterm_penalty_epoch - EPOCHS_PER_SLASHINGS_VECTOR)
+        min_bound_epoch = MidtermSlashingPenalty.get_min_bound_epoch(midterm_penalty_epoch)
 
         def is_bound(v: Validator) -> bool:
-            possible_slashing_epochs = MidtermSlashingPenalty.get_possible_slashed_epochs(v, ref_epoch)
-            return any(min_bound_epoch <= epoch <= midterm_penalty_epoch for epoch in possible_slashing_epochs)
+            first_epoch, last_epoch = MidtermSlashingPenalty.get_possible_slashed_epochs_range(v, ref_epoch)
+            # Possible slashing epochs range intersects with bound epochs range
+            return max(first_epoch, min_bound_epoch) <= min(last_epoch, midterm_penalty_epoch)
 
         return list(filter(is_bound, slashed_validators))
 
     @staticmethod
-    def get_slashed_validators_with_impact_on_midterm_penalties(
-        validators: list[Validator],
-        ref_epoch: EpochNumber
-    ) -> list[Validator | LidoValidator]:
-        """
-        Get slashed validators which have impact on midterm penalties
-        We can detect such slashings by this condition:
-        `ref_epoch - EPOCHS_PER_SLASHINGS_VECTOR > possible_slashed_epoch > ref_epoch`
-        But if we look at:
-        https://github.com/ethereum/consensus-specs/blob/dev/specs/phase0/beacon-chain.md#slash_validator
-        it can be simplified to the condition above for our purposes
-        """
-        def is_have_impact(v: Validator) -> bool:
-            return v.validator.slashed and int(v.validator.withdrawable_epoch) > ref_epoch
-
-        return list(filter(is_have_impact, validators))
+    def get_min_bound_epoch(midterm_penalty_epoch: EpochNumber) -> EpochNumber:
+        """First epoch of slashings that are bound with midterm penalty in `midterm_penalty_epoch`"""
+        return EpochNumber(max(0, midterm_penalty_epoch - EPOCHS_PER_SLASHINGS_VECTOR))
 
     @staticmethod
     def get_frame_cl_rebase_from_report_cl_rebase(
@@ -236,3 +233,31 @@ class MidtermSlashingPenalty:
     def get_midterm_penalty_epoch(validator: Validator) -> EpochNumber:
         """https://github.com/ethereum/consensus-specs/blob/dev/specs/phase0/beacon-chain.md#slashings"""
         return EpochNumber(int(validator.validator.withdrawable_epoch) - EPOCHS_PER_SLASHINGS_VECTOR // 2)
+
+
+class SlashedEpochsIndex:
+    """
+    Possible slashing epochs ranges of slashed validators for counting bound slashings.
+
+    Range is bound with [min_bound_epoch, midterm_penalty_epoch] if it neither ends before the first epoch
+    nor starts after the last one. So with sorted range starts and ends bound slashings count for any midterm epoch
+    is found with two binary searches instead of scan over all slashed validators.
+    """
+    def __init__(self, ref_epoch: EpochNumber, slashed_validators: list[Validator]):
+        ranges = [
+            MidtermSlashingPenalty.get_possible_slashed_epochs_range(validator, ref_epoch)
+            for validator in slashed_validators
+        ]
+        # Empty range is not bound with any epoch
+        ranges = [(first, last) for first, last in ranges if first <= last]
+
+        self.first_epochs = sorted(first for first, _ in ranges)
+        self.last_epochs = sorted(last for _, last in ranges)
+
+    def count_bound_with_midterm_epoch(self, midterm_penalty_epoch: EpochNumber) -> int:
+        """Same as len(MidtermSlashingPenalty.get_bound_with_midterm_epoch_slashed_validators(...))"""
+        min_bound_epoch = MidtermSlashingPenalty.get_min_bound_epoch(midterm_penalty_epoch)
+
+        ended_before = bisect_left(self.last_epochs, min_bound_epoch)
+        started_after = len(self.first_epochs) - bisect_right(self.first_epochs, midterm_penalty_epoch)
+        return len(self.first_epochs) - ended_before - started_after
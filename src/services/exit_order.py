@@ -1,3 +1,5 @@
+from collections import defaultdict
+from heapq import heapify, heappop, heappush
 from typing import Iterator
 
 from eth_typing import ChecksumAddress
@@ -25,10 +27,22 @@ class ExitOrderIterator:
     3. Validator whose operator with the highest stake weight
     4. Validator whose operator with the highest number of predictable to exit validators
     5. Validator with the lowest index
+
+    First four predicates depend only on the operator, so validators are kept in per-operator heaps by index
+    and operators are kept in the queue by their predicates and the lowest index of their validators.
+    Only the operator of the popped validator changes its stats, except one case: total predictable validators
+    count decreases, so other operators could exceed network penetration threshold and get new stake weight.
+    Operators below the threshold are tracked in a separate heap to find such operators fast.
     """
     left_queue_count: int
     max_validators_to_exit: int
-    exitable_lido_validators: list[LidoValidator]
+    # Min-heaps of (validator index, validator) for each operator
+    operators_exitable_validators: dict[NodeOperatorGlobalIndex, list[tuple[int, LidoValidator]]]
+    # Heap of (operator predicates, lowest validator index, version, operator). Outdated versions are skipped
+    operators_queue: list[tuple[tuple, int, int, NodeOperatorGlobalIndex]]
+    # Heap of (-predictable validators count, version, operator) of operators below penetration threshold
+    below_threshold_operators: list[tuple[int, int, NodeOperatorGlobalIndex]]
+    operators_version: dict[NodeOperatorGlobalIndex, int]
     lido_node_operator_stats: dict[NodeOperatorGlobalIndex, NodeOperatorPredictableState]
     total_predictable_validators_count: int
 
@@ -52,8 +66,6 @@ class ExitOrderIterator:
         self.max_validators_to_exit = eos.get_oracle_report_limits(self.blockstamp).max_validator_exit_requests_per_report
         self.operator_network_penetration_threshold = eos.get_operator_network_penetration_threshold(self.blockstamp)
 
-        # Prepare list of exitable validators, which will be sorted by exit order predicates
-        self.exitable_lido_validators = eos.get_exitable_lido_validators()
         # Prepare dict of node operators stats to sort exitable validators
         self.lido_node_operator_stats = eos.prepare_lido_node_operator_stats(self.blockstamp, self.chain_config)
         # And total predictable validators count to stake weight sort predicate
@@ -67,6 +79,9 @@ class ExitOrderIterator:
             operator.staking_module.staking_module_address: operator.staking_module.id
             for operator in self.w3.lido_validators.get_lido_node_operators(self.blockstamp)
         }
+
+        # Prepare queue of exitable validators, which will be ordered by exit order predicates
+        self._prepare_queue(eos.get_exitable_lido_validators())
         return self
 
     @duration_meter()
@@ -74,15 +89,73 @@ class ExitOrderIterator:
         if self.left_queue_count >= self.max_validators_to_exit:
             raise StopIteration
 
-        if not self.exitable_lido_validators:
+        module_operator = self._pop_operator()
+        if module_operator is None:
             raise StopIteration
 
-        self.exitable_lido_validators.sort(key=self._predicates)
-        to_exit = self.exitable_lido_validators.pop(0)
+        _, to_exit = heappop(self.operators_exitable_validators[module_operator])
         self._decrease_node_operator_stats(to_exit)
+        self._push_operator(module_operator)
+        self._requeue_operators_exceeded_threshold()
+
         self.left_queue_count += 1
-        global_index = ExitOrderIterator.operator_index_by_validator(self.staking_module_id, to_exit)
-        return global_index, to_exit
+        return module_operator, to_exit
+
+    def _prepare_queue(self, exitable_lido_validators: list[LidoValidator]) -> None:
+        self.operators_exitable_validators = defaultdict(list)
+        for validator in exitable_lido_validators:
+            module_operator = ExitOrderIterator.operator_index_by_validator(self.staking_module_id, validator)
+            self.operators_exitable_validators[module_operator].append((self._validator_index(validator), validator))
+
+        self.operators_queue = []
+        self.below_threshold_operators = []
+        self.operators_version = {}
+        for module_operator, validators in self.operators_exitable_validators.items():
+            heapify(validators)
+            self._push_operator(module_operator)
+
+    def _push_operator(self, module_operator: NodeOperatorGlobalIndex) -> None:
+        """Put operator to the queues with actual stats. Previous entries become outdated"""
+        version = self.operators_version.get(module_operator, 0) + 1
+        self.operators_version[module_operator] = version
+
+        validators = self.operators_exitable_validators[module_operator]
+        if not validators:
+            return
+
+        operator_stats = self.lido_node_operator_stats[module_operator]
+        heappush(self.operators_queue, (self._operator_predicates(operator_stats), validators[0][0], version, module_operator))
+
+        if not self._is_operator_exceeded_threshold(operator_stats):
+            heappush(
+                self.below_threshold_operators,
+                (-operator_stats.predictable_validators_count, version, module_operator),
+            )
+
+    def _pop_operator(self) -> NodeOperatorGlobalIndex | None:
+        """Returns operator of the next validator to exit"""
+        while self.operators_queue:
+            _, _, version, module_operator = heappop(self.operators_queue)
+            if version == self.operators_version[module_operator]:
+                return module_operator
+        return None
+
+    def _requeue_operators_exceeded_threshold(self) -> None:
+        """
+        Operator with the biggest predictable validators count exceeds the threshold first,
+        because total predictable validators count is the same for all operators
+        """
+        while self.below_threshold_operators:
+            _, version, module_operator = self.below_threshold_operators[0]
+            if version != self.operators_version[module_operator]:
+                heappop(self.below_threshold_operators)
+                continue
+
+            if not self._is_operator_exceeded_threshold(self.lido_node_operator_stats[module_operator]):
+                return
+
+            heappop(self.below_threshold_operators)
+            self._push_operator(module_operator)
 
     def _decrease_node_operator_stats(self, validator: LidoValidator) -> None:
         """
@@ -100,6 +173,12 @@ class ExitOrderIterator:
     def _predicates(self, validator: LidoValidator) -> tuple:
         module_operator = ExitOrderIterator.operator_index_by_validator(self.staking_module_id, validator)
         operator_stats = self.lido_node_operator_stats[module_operator]
+        return (
+            *self._operator_predicates(operator_stats),
+            self._validator_index(validator),
+        )
+
+    def _operator_predicates(self, operator_stats: NodeOperatorPredictableState) -> tuple:
         return (
             # positive mean asc sorting
             # negative mean desc sorting
@@ -109,7 +188,11 @@ class ExitOrderIterator:
                 operator_stats, self.total_predictable_validators_count, self.operator_network_penetration_threshold
             ),
             -self._operator_predictable_validators(operator_stats),
-            self._validator_index(validator),
+        )
+
+    def _is_operator_exceeded_threshold(self, operator_stats: NodeOperatorPredictableState) -> bool:
+        return self._is_stake_volume_exceeded_threshold(
+            operator_stats, self.total_predictable_validators_count, self.operator_network_penetration_threshold
         )
 
     @staticmethod
@@ -128,11 +211,21 @@ class ExitOrderIterator:
         total_predictable_validators_count: int,
         operator_network_penetration_threshold: float
     ) -> int:
-        stake_volume = operator_state.predictable_validators_count / total_predictable_validators_count
-        if stake_volume > operator_network_penetration_threshold:
+        if ExitOrderIterator._is_stake_volume_exceeded_threshold(
+            operator_state, total_predictable_validators_count, operator_network_penetration_threshold
+        ):
             return operator_state.predictable_validators_total_age
         return 0
 
+    @staticmethod
+    def _is_stake_volume_exceeded_threshold(
+        operator_state: NodeOperatorPredictableState,
+        total_predictable_validators_count: int,
+        operator_network_penetration_threshold: float
+    ) -> bool:
+        stake_volume = operator_state.predictable_validators_count / total_predictable_validators_count
+        return stake_volume > operator_network_penetration_threshold
+
     @staticmethod
     def _operator_predictable_validators(operator_state: NodeOperatorPredictableState) -> int:
         return operator_state.predictable_validators_count
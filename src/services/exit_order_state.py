@@ -1,7 +1,5 @@
 from dataclasses import dataclass
 
-from more_itertools import ilen
-
 from src.constants import TOTAL_BASIS_POINTS
 from src.modules.submodules.typings import ChainConfig
 from src.services.validator_state import LidoValidatorStateService
@@ -92,13 +90,14 @@ class ExitOrderStateService(LidoValidatorStateService):
         lido_node_operator_stats: dict[NodeOperatorGlobalIndex, NodeOperatorPredictableState]
     ) -> int:
         """Get total predictable validators count for stake weight calculation"""
-        lido_validators = {
-            v.validator.pubkey: v for v in self.w3.lido_validators.get_lido_validators(blockstamp)
+        not_on_exit_validators_count = self.w3.validator_set_stats.get_validator_set_stats(
+            blockstamp
+        ).not_on_exit_validators_count
+        # Lido validators are a part of all validators, so not lido ones are counted by subtraction
+        lido_not_on_exit_pubkeys = {
+            v.validator.pubkey for v in self.w3.lido_validators.get_lido_validators(blockstamp) if not is_on_exit(v)
         }
-        not_lido_predictable_validators_count = ilen(
-            v for v in self.w3.cc.get_validators(blockstamp)
-            if v.validator.pubkey not in lido_validators and not is_on_exit(v)
-        )
+        not_lido_predictable_validators_count = not_on_exit_validators_count - len(lido_not_on_exit_pubkeys)
         lido_predictable_validators_count = sum(
             o.predictable_validators_count for o in lido_node_operator_stats.values()
         )
@@ -34,6 +34,7 @@ class RewardsPredictionService:
             prediction_duration_in_slots,
             chain_configs.seconds_per_slot,
             'reportTimestamp',
+            self.w3.lido_contracts.events_index,
         )
 
         eth_distributed_events = get_events_in_past(
@@ -42,6 +43,7 @@ class RewardsPredictionService:
             prediction_duration_in_slots,
             chain_configs.seconds_per_slot,
             'reportTimestamp',
+            self.w3.lido_contracts.events_index,
         )
 
         events = self._group_events_by_transaction_hash(token_rebase_events, eth_distributed_events)
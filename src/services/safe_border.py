@@ -10,6 +10,7 @@ from src.modules.accounting.typings import OracleReportLimits
 from src.utils.abi import named_tuple_to_dataclass
 from src.typings import EpochNumber, FrameNumber, ReferenceBlockStamp, SlotNumber
 from src.web3py.extensions.lido_validators import Validator
+from src.web3py.multicall import aggregate_calls
 from src.web3py.typings import Web3
 from src.utils.slot import get_blockstamp
 
@@ -155,14 +156,14 @@ class SafeBorder:
         start_frame = self.get_frame_by_epoch(start_epoch)
         end_frame = self.get_frame_by_epoch(end_epoch)
 
-        validators_set = set(validators)
+        validators_indices = [int(v.index) for v in validators]
 
         # Since the border will be rounded to the frame, we are iterating over the frames
         # to avoid unnecessary queries
         while start_frame < end_frame:
             mid_frame = FrameNumber((end_frame + start_frame) // 2)
 
-            if self._slashings_in_frame(mid_frame, validators_set):
+            if self._slashings_in_frame(mid_frame, validators_indices):
                 end_frame = mid_frame
             else:
                 start_frame = FrameNumber(mid_frame + 1)
@@ -171,10 +172,11 @@ class SafeBorder:
         epoch_number = self.get_epoch_by_slot(slot_number)
         return epoch_number
 
-    def _slashings_in_frame(self, frame: FrameNumber, validators: set[Validator]) -> bool:
+    def _slashings_in_frame(self, frame: FrameNumber, validators_indices: list[int]) -> bool:
         """
         Returns number of slashed validators for the frame for the given validators
         Slashed flag can't be undone, so we can only look at the last slot
+        Only the given validators are requested, there is no need to download the whole registry for each frame
         """
         last_slot_in_frame = self.get_frame_last_slot(frame)
         last_slot_in_frame_blockstamp = get_blockstamp(
@@ -183,8 +185,8 @@ class SafeBorder:
             self.blockstamp.ref_slot,
         )
 
-        lido_validators = self.w3.lido_validators.get_lido_validators(last_slot_in_frame_blockstamp)
-        slashed_validators = filter_slashed_validators(list(filter(lambda x: x in validators, lido_validators)))
+        validators = self.w3.cc.get_validators_by_indices(last_slot_in_frame_blockstamp, validators_indices)
+        slashed_validators = filter_slashed_validators(validators)
 
         return len(slashed_validators) > 0
 
@@ -236,21 +238,22 @@ class SafeBorder:
             block_identifier=self.blockstamp.block_hash)
 
     def _retrieve_constants(self):
-        limits_list = named_tuple_to_dataclass(
-            self.w3.lido_contracts.oracle_report_sanity_checker.functions.getOracleReportLimits().call(
-                block_identifier=self.blockstamp.block_hash
-            ),
-            OracleReportLimits
+        limits, max_negative_rebase_shift = aggregate_calls(
+            self.w3,
+            [
+                self.w3.lido_contracts.oracle_report_sanity_checker.functions.getOracleReportLimits(),
+                self.w3.lido_contracts.oracle_daemon_config.functions.get(
+                    'FINALIZATION_MAX_NEGATIVE_REBASE_EPOCH_SHIFT',
+                ),
+            ],
+            self.blockstamp.block_hash,
         )
+        limits_list = named_tuple_to_dataclass(limits, OracleReportLimits)
         self.finalization_default_shift = math.ceil(
             limits_list.request_timestamp_margin / (self.chain_config.slots_per_epoch * self.chain_config.seconds_per_slot)
         )
 
-        self.finalization_max_negative_rebase_shift = self.w3.to_int(
-            primitive=self.w3.lido_contracts.oracle_daemon_config.functions.get(
-                'FINALIZATION_MAX_NEGATIVE_REBASE_EPOCH_SHIFT',
-            ).call(block_identifier=self.blockstamp.block_hash)
-        )
+        self.finalization_max_negative_rebase_shift = self.w3.to_int(primitive=max_negative_rebase_shift)
 
     def get_epoch_first_slot(self, epoch: EpochNumber) -> SlotNumber:
         return SlotNumber(epoch * self.chain_config.slots_per_epoch)
@@ -1,6 +1,6 @@
 import logging
 from copy import deepcopy
-from functools import lru_cache, reduce
+from functools import reduce
 from typing import Sequence, Iterable
 
 from eth_typing import HexStr
@@ -11,6 +11,7 @@ from src.modules.accounting.typings import OracleReportLimits
 from src.modules.submodules.typings import ChainConfig
 from src.typings import BlockStamp, ReferenceBlockStamp, EpochNumber
 from src.utils.abi import named_tuple_to_dataclass
+from src.utils.cache import cached
 from src.utils.events import get_events_in_past
 from src.utils.types import bytes_to_hex_str
 from src.utils.validator_state import is_exited_validator, is_validator_eligible_to_exit, is_on_exit
@@ -30,7 +31,7 @@ class LidoValidatorStateService:
         self.w3 = w3
         self.extra_data_service = ExtraDataService()
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_extra_data(self, blockstamp: ReferenceBlockStamp, chain_config: ChainConfig) -> ExtraData:
         # todo stuck validator
         stuck_validators = self.get_lido_newly_stuck_validators(blockstamp, chain_config)
@@ -108,13 +109,14 @@ class LidoValidatorStateService:
             to_blockstamp=blockstamp,
             for_slots=exiting_keys_stuck_border_in_slots,
             seconds_per_slot=chain_config.seconds_per_slot,
+            events_index=self.w3.lido_contracts.events_index,
         )
 
         logger.info({'msg': f'Fetch exit events. Got {len(events)} events.'})
 
         return set(bytes_to_hex_str(event['args']['validatorPubkey']) for event in events)
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_validator_delinquent_timeout_in_slot(self, blockstamp: ReferenceBlockStamp) -> int:
         exiting_keys_stuck_border_in_slots_bytes = self.w3.lido_contracts.oracle_daemon_config.functions.get(
             'VALIDATOR_DELINQUENT_TIMEOUT_IN_SLOTS'
@@ -138,7 +140,7 @@ class LidoValidatorStateService:
 
         return result
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_lido_newly_exited_validators(self, blockstamp: ReferenceBlockStamp) -> dict[NodeOperatorGlobalIndex, int]:
         lido_validators = deepcopy(self.get_exited_lido_validators(blockstamp))
         node_operators = self.w3.lido_validators.get_lido_node_operators(blockstamp)
@@ -151,7 +153,7 @@ class LidoValidatorStateService:
         logger.info({'msg': 'Fetch new lido exited validators by node operator.', 'value': lido_validators})
         return lido_validators
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_exited_lido_validators(self, blockstamp: ReferenceBlockStamp) -> dict[NodeOperatorGlobalIndex, int]:
         lido_validators = self.w3.lido_validators.get_lido_validators_by_node_operators(blockstamp)
 
@@ -248,6 +250,7 @@ class LidoValidatorStateService:
             to_blockstamp=blockstamp,
             for_slots=exiting_keys_delayed_border_in_slots,
             seconds_per_slot=chain_config.seconds_per_slot,
+            events_index=self.w3.lido_contracts.events_index,
         )
 
         logger.info({'msg': f'Fetch exit events. Got {len(events)} events.'})
@@ -263,7 +266,7 @@ class LidoValidatorStateService:
 
         return module_operator
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_validator_delayed_timeout_in_slot(self, blockstamp: ReferenceBlockStamp) -> int:
         exiting_keys_delayed_border_in_slots_bytes = self.w3.lido_contracts.oracle_daemon_config.functions.get(
             'VALIDATOR_DELAYED_TIMEOUT_IN_SLOTS'
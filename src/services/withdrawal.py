@@ -2,6 +2,7 @@ from web3.types import Wei
 
 from src.variables import FINALIZATION_BATCH_MAX_REQUEST_COUNT
 from src.utils.abi import named_tuple_to_dataclass
+from src.web3py.multicall import aggregate_calls
 from src.web3py.typings import Web3
 from src.typings import ReferenceBlockStamp
 from src.services.safe_border import SafeBorder
@@ -48,15 +49,27 @@ class Withdrawal:
         return self._calculate_finalization_batches(share_rate, available_eth, withdrawable_until_timestamp)
 
     def _has_unfinalized_requests(self) -> bool:
-        last_finalized_id = self._fetch_last_finalized_request_id()
-        last_requested_id = self._fetch_last_request_id()
+        last_finalized_id, last_requested_id = aggregate_calls(
+            self.w3,
+            [
+                self.w3.lido_contracts.withdrawal_queue_nft.functions.getLastFinalizedRequestId(),
+                self.w3.lido_contracts.withdrawal_queue_nft.functions.getLastRequestId(),
+            ],
+            self.blockstamp.block_hash,
+        )
 
         return last_finalized_id < last_requested_id
 
     def _get_available_eth(self, withdrawal_vault_balance: Wei, el_rewards_vault_balance: Wei) -> Wei:
-        buffered_ether = self._fetch_buffered_ether()
-        # This amount of eth could not be spent for deposits.
-        unfinalized_steth = self._fetch_unfinalized_steth()
+        buffered_ether, unfinalized_steth = aggregate_calls(
+            self.w3,
+            [
+                self.w3.lido_contracts.lido.functions.getBufferedEther(),
+                # This amount of eth could not be spent for deposits.
+                self.w3.lido_contracts.withdrawal_queue_nft.functions.unfinalizedStETH(),
+            ],
+            self.blockstamp.block_hash,
+        )
 
         reserved_buffer = min(buffered_ether, unfinalized_steth)
 
@@ -81,26 +94,6 @@ class Withdrawal:
 
         return list(filter(lambda value: value > 0, state.batches))
 
-    def _fetch_last_finalized_request_id(self) -> int:
-        return self.w3.lido_contracts.withdrawal_queue_nft.functions.getLastFinalizedRequestId().call(
-            block_identifier=self.blockstamp.block_hash
-        )
-
-    def _fetch_last_request_id(self) -> int:
-        return self.w3.lido_contracts.withdrawal_queue_nft.functions.getLastRequestId().call(
-            block_identifier=self.blockstamp.block_hash
-        )
-
-    def _fetch_buffered_ether(self) -> Wei:
-        return Wei(self.w3.lido_contracts.lido.functions.getBufferedEther().call(
-            block_identifier=self.blockstamp.block_hash
-        ))
-
-    def _fetch_unfinalized_steth(self) -> Wei:
-        return Wei(self.w3.lido_contracts.withdrawal_queue_nft.functions.unfinalizedStETH().call(
-            block_identifier=self.blockstamp.block_hash
-        ))
-
     def _is_requests_finalization_paused(self) -> bool:
         return self.w3.lido_contracts.withdrawal_queue_nft.functions.isPaused().call(
             block_identifier=self.blockstamp.block_hash
@@ -1,3 +1,5 @@
+from dataclasses import asdict
+
 from web3.types import Timestamp
 
 from src.providers.consensus.typings import BlockDetailsResponse
@@ -5,12 +7,12 @@ from src.typings import SlotNumber, EpochNumber, ReferenceBlockStamp, BlockStamp
 
 
 def build_reference_blockstamp(
-    slot_details: BlockDetailsResponse,
+    blockstamp: BlockStamp,
     ref_slot: SlotNumber,
     ref_epoch: EpochNumber,
 ) -> ReferenceBlockStamp:
     return ReferenceBlockStamp(
-        **_build_blockstamp_data(slot_details),
+        **asdict(blockstamp),
         ref_slot=ref_slot,
         ref_epoch=ref_epoch
     )
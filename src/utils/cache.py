@@ -0,0 +1,140 @@
+import threading
+import weakref
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+from src import variables
+from src.metrics.prometheus.basic import CACHE_HITS, CACHE_MISSES, CACHE_SIZE
+
+T = TypeVar('T')
+
+DEFAULT_REGION_SIZE = 2
+# Regions with the whole validators registry (or all Lido keys) keep only one entry to bound memory
+REGISTRY_REGION_SIZE = 1
+
+_MISSING = object()
+
+
+class CacheRegion:
+    """
+    LRU cache with fixed amount of entries.
+    Each entry remembers the generation it was used last time, see CacheManager.
+    """
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, generation: int) -> Any:
+        """Returns _MISSING if there is no such entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                CACHE_MISSES.labels(region=self.name).inc()
+                return _MISSING
+
+            self._entries[key] = (generation, entry[1])
+            self._entries.move_to_end(key)
+
+        CACHE_HITS.labels(region=self.name).inc()
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        with self._lock:
+            self._entries[key] = (generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._update_size()
+
+    def evict_older_than(self, generation: int) -> None:
+        with self._lock:
+            for key in [key for key, (used_in, _) in self._entries.items() if used_in < generation]:
+                del self._entries[key]
+            self._update_size()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._update_size()
+
+    def _update_size(self) -> None:
+        CACHE_SIZE.labels(region=self.name).set(len(self._entries))
+
+
+class CacheManager:
+    """
+    Named cache regions for results of the methods that depend on blockstamp.
+
+    Generation is switched when a new frame starts (see `set_generation`).
+    Then all entries that were not used during the previous generation are evicted,
+    so data of the old blockstamps is dropped, while data still in use (e.g. of the last report blockstamp) is kept.
+    """
+    def __init__(self, regions_sizes: Optional[dict[str, int]] = None):
+        self.regions: dict[str, CacheRegion] = {}
+        self.regions_sizes = regions_sizes or {}
+        self.generation = 0
+        self._generation_key: Hashable = None
+        self._lock = threading.Lock()
+
+    def region(self, name: str, maxsize: int = DEFAULT_REGION_SIZE) -> CacheRegion:
+        """Returns region by name, size could be overridden by regions_sizes"""
+        with self._lock:
+            if name not in self.regions:
+                self.regions[name] = CacheRegion(name, self.regions_sizes.get(name, maxsize))
+            return self.regions[name]
+
+    def set_generation(self, key: Hashable) -> None:
+        """Starts new generation if the key (e.g. reference slot of the current frame) is changed"""
+        with self._lock:
+            if key == self._generation_key:
+                return
+            self._generation_key = key
+            self.generation += 1
+            regions = list(self.regions.values())
+
+        for region in regions:
+            region.evict_older_than(self.generation - 1)
+
+    def clear(self) -> None:
+        for region in list(self.regions.values()):
+            region.clear()
+
+
+CACHE = CacheManager(variables.CACHE_REGIONS_SIZES)
+
+
+def cached(
+    region: Optional[str] = None,
+    maxsize: int = DEFAULT_REGION_SIZE,
+    manager: CacheManager = CACHE,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Replacement of `lru_cache` for methods.
+
+    Results are stored in the named region (qualified name of the method by default).
+    Instance is referenced weakly, so cache does not keep it alive.
+    All arguments should be hashable, like for `lru_cache`.
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        cache_region = manager.region(region or func.__qualname__, maxsize)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs) -> T:
+            key = (weakref.ref(self), args, tuple(sorted(kwargs.items())))
+            result = cache_region.get(key, manager.generation)
+            if result is _MISSING:
+                result = func(self, *args, **kwargs)
+                cache_region.put(key, result, manager.generation)
+            return result
+
+        wrapper.cache_region = cache_region  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache_region.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -1,6 +1,22 @@
+from typing import Any, Optional
+
 from web3.contract.contract import ContractEvent
 
-from src.typings import ReferenceBlockStamp
+from src.typings import BlockNumber, ReferenceBlockStamp
+from src.web3py.events_index import EventsIndex
+
+
+def get_events(
+    contract_event: ContractEvent,
+    from_block: BlockNumber,
+    to_block: BlockNumber,
+    events_index: Optional[EventsIndex] = None,
+) -> list[Any]:
+    """Returns events between blocks (both included) from the index if it is set, otherwise requests them from the node"""
+    if events_index is None:
+        return list(contract_event.get_logs(fromBlock=from_block, toBlock=to_block))
+
+    return events_index.get_events(contract_event, from_block, to_block)
 
 
 def get_events_in_past(
@@ -9,6 +25,7 @@ def get_events_in_past(
     for_slots: int,
     seconds_per_slot: int,
     timestamp_field_name: str = 'timestamp',
+    events_index: Optional[EventsIndex] = None,
 ):
     """
         This is protection against missed slots when between 10 and 11 block number could be 5 missed slots.
@@ -46,6 +63,6 @@ def get_events_in_past(
     from_block = max(0, to_blockstamp.block_number - for_slots_without_missed_blocks)
     from_timestamp = to_blockstamp.block_timestamp - for_slots_without_missed_blocks * seconds_per_slot
 
-    events = contract_event.get_logs(fromBlock=from_block, toBlock=to_blockstamp.block_number)
+    events = get_events(contract_event, BlockNumber(from_block), to_blockstamp.block_number, events_index)
 
     return [event for event in events if event['args'][timestamp_field_name] > from_timestamp]
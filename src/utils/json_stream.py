@@ -0,0 +1,147 @@
+import codecs
+import json
+from typing import Any, Generator, Iterable, Iterator, Optional
+
+
+_WHITESPACES = ' \t\n\r'
+_VALUE_DELIMITERS = _WHITESPACES + ',:]}'
+_DECODER = json.JSONDecoder()
+
+
+class _ChunksReader:
+    """
+    Text buffer over the stream of bytes chunks.
+    Keeps in memory only not yet consumed part of the stream.
+    """
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Read next chunk to the buffer. Returns False if stream is exhausted."""
+        if self.exhausted:
+            return False
+
+        try:
+            text = self._utf8.decode(next(self._chunks))
+        except StopIteration:
+            self.exhausted = True
+            text = self._utf8.decode(b'', final=True)
+
+        # Drop consumed part of the buffer
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return not self.exhausted or bool(text)
+
+    def peek(self) -> str:
+        """Skip whitespaces and return next char. Returns empty string at the end of the stream."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACES:
+                self.pos += 1
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f'Expecting {char!r}', self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode next JSON value from the stream."""
+        self.peek()
+
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Value is not downloaded completely yet
+                if not self.fill():
+                    raise
+                continue
+
+            # Number could be cut off by the chunk border, e.g. "1." from "1.5"
+            is_cut = end == len(self.buffer) or self.buffer[end] not in _VALUE_DELIMITERS
+            if is_cut and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_json_array_field(
+    chunks: Iterable[bytes], field: str = 'data', other_fields: Optional[dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """
+    Yields items of the array placed under the `field` key of the top-level JSON object.
+    Body is decoded chunk by chunk, so there is no need to keep whole JSON tree in memory.
+    Field of the nested object could be set with dots, e.g. "data.keys".
+
+    Other top-level fields are skipped, and the body is read only up to the end of the array.
+    If `other_fields` is given, other fields are decoded into it, so the whole body is read.
+    Other fields of the nested objects are decoded into the nested dicts, e.g. {"data": {"module": ...}}.
+
+    Example:
+        Input: b'{"execution_optimistic": false, "data": [{"index": "1"}, {"index": "2"}]}'
+        Output: {"index": "1"}, {"index": "2"}
+    """
+    reader = _ChunksReader(chunks)
+    found = yield from _iter_object_array(reader, field.split('.'), other_fields is not None, other_fields)
+
+    if not found:
+        raise ValueError(f'Expected array field "{field}" in the response.')
+
+
+def _iter_object_array(
+    reader: _ChunksReader, path: list[str], read_rest: bool, other_fields: Optional[dict[str, Any]],
+) -> Generator[Any, None, bool]:
+    """Yields items of the array by path in the object. Returns whether the array is found."""
+    found = False
+    reader.expect('{')
+
+    while reader.peek() != '}':
+        key = reader.value()
+        reader.expect(':')
+
+        if key == path[0] and not found:
+            if len(path) > 1:
+                nested = None if other_fields is None else other_fields.setdefault(key, {})
+                found = yield from _iter_object_array(reader, path[1:], read_rest, nested)
+            else:
+                yield from _iter_array(reader)
+                found = True
+
+            if found and not read_rest:
+                return True
+        elif other_fields is not None:
+            other_fields[key] = reader.value()
+        else:
+            reader.value()
+
+        if reader.peek() != ',':
+            break
+        reader.pos += 1
+
+    reader.expect('}')
+    return found
+
+
+def _iter_array(reader: _ChunksReader) -> Iterator[Any]:
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+
+    while True:
+        yield reader.value()
+
+        if reader.peek() != ',':
+            reader.expect(']')
+            return
+        reader.pos += 1
@@ -1,15 +1,25 @@
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from http import HTTPStatus
+from typing import Callable, Optional
 
 from src.providers.consensus.client import ConsensusClient
 from src.providers.consensus.typings import BlockHeaderFullResponse, BlockDetailsResponse
+from src.providers.consensus.slots_index import SlotBlock
 from src.providers.http_provider import NotOkResponse
-from src.typings import SlotNumber, EpochNumber, ReferenceBlockStamp
-from src.utils.blockstamp import build_reference_blockstamp, build_blockstamp
+from src.typings import BlockStamp, SlotNumber, EpochNumber, ReferenceBlockStamp
+from src.utils.blockstamp import build_blockstamp, build_reference_blockstamp
 
 logger = logging.getLogger(__name__)
 
 
+# Amount of slots requested at once after the ref slot is found missed
+MISSED_SLOTS_PROBE_WINDOW = 8
+
+# Shared by all probes, threads are started on the first window and reused after
+_probe_executor = ThreadPoolExecutor(max_workers=MISSED_SLOTS_PROBE_WINDOW, thread_name_prefix='MissedSlotsProbe')
+
+
 class NoSlotsAvailable(Exception):
     pass
 
@@ -33,6 +43,15 @@ def get_first_non_missed_slot(
     Raise NoSlotsAvailable if all slots are missed in range [slot, last_finalized_slot_number]
     and we have nowhere to take parent root.
     """
+    existed_header = _get_first_non_missed_slot_header(cc, slot, last_finalized_slot_number)
+    return cc.get_block_details(existed_header.data.root)
+
+
+def _get_first_non_missed_slot_header(
+    cc: ConsensusClient,
+    slot: SlotNumber,
+    last_finalized_slot_number: SlotNumber,
+) -> BlockHeaderFullResponse:
     #  [ ] - slot
     #  [x] - slot with existed block
     #  [o] - slot with missed block
@@ -60,6 +79,9 @@ def get_first_non_missed_slot(
     #
     #  So, in this strategy we always get parent slot of existed slot and can get the nearest slot for `ref_slot`
     #
+    #  To not pay a round trip for each missed slot, slots after the missed `ref_slot` are requested
+    #  concurrently by windows of MISSED_SLOTS_PROBE_WINDOW slots, and the first existed one in the window is taken.
+    #
     #  Exception case can be when all slots are missed in range [ref_slot, last_finalized_slot_number] it will mean that
     #  block response of CL node contradicts itself, because few moments ago we got existed `last_finalized_slot_number`
 
@@ -68,22 +90,17 @@ def get_first_non_missed_slot(
 
     logger.info({'msg': f'Get Blockstamp for ref slot: {slot}.'})
 
-    ref_slot_is_missed = False
-    existed_header = None
-    for i in range(slot, last_finalized_slot_number + 1):
-        try:
-            existed_header = cc.get_block_header(SlotNumber(i))
-        except NotOkResponse as error:
-            if error.status != HTTPStatus.NOT_FOUND:
-                # Not expected status - raise exception
-                raise error from error
-
-            ref_slot_is_missed = True
+    # Ref slot is checked alone, because in most cases it is not missed.
+    # After a miss, the next slots are probed by windows of concurrent requests.
+    existed_header = _find_first_existed_header(cc.get_block_header, range(slot, slot + 1))
+    ref_slot_is_missed = existed_header is None
 
-            logger.warning({'msg': f'Missed slot: {i}. Check next slot.', 'error': str(error.__dict__)})
-        else:
-            _check_block_header(existed_header)
-            break
+    window_start = slot + 1
+    while existed_header is None and window_start <= last_finalized_slot_number:
+        window = range(window_start, min(window_start + MISSED_SLOTS_PROBE_WINDOW, last_finalized_slot_number + 1))
+        # Probed headers are not cached, the header finally taken is requested by the parent root below
+        existed_header = _find_first_existed_header(cc.get_block_header_no_cache, window)
+        window_start = window.stop
 
     if not existed_header:
         raise NoSlotsAvailable('No slots available for current report. Check your CL node.')
@@ -102,18 +119,16 @@ def get_first_non_missed_slot(
                 'Probably problem with the consensus node.'
             )
 
-    slot_details = cc.get_block_details(existed_header.data.root)
-    return slot_details
+    return existed_header
 
 
 def get_blockstamp(
     cc: ConsensusClient,
     slot: SlotNumber,
     last_finalized_slot_number: SlotNumber,
-):
+) -> BlockStamp:
     """Get first non-missed slot header and generates blockstamp for it"""
-    existed_slot = get_first_non_missed_slot(cc, slot, last_finalized_slot_number)
-    return build_blockstamp(existed_slot)
+    return get_slot_block(cc, slot, last_finalized_slot_number).blockstamp
 
 
 def get_reference_blockstamp(
@@ -123,8 +138,67 @@ def get_reference_blockstamp(
     ref_epoch: EpochNumber,
 ) -> ReferenceBlockStamp:
     """Get first non-missed slot header and generates reference blockstamp for it"""
-    existed_slot = get_first_non_missed_slot(cc, ref_slot, last_finalized_slot_number)
-    return build_reference_blockstamp(existed_slot, ref_slot, ref_epoch)
+    blockstamp = get_slot_block(cc, ref_slot, last_finalized_slot_number).blockstamp
+    return build_reference_blockstamp(blockstamp, ref_slot, ref_epoch)
+
+
+def get_slot_block(
+    cc: ConsensusClient,
+    slot: SlotNumber,
+    last_finalized_slot_number: SlotNumber,
+) -> SlotBlock:
+    """
+    Returns block of the slot or of the closest non-missed slot before it.
+    Slots below the last finalized one never change, so they are taken from the slots index if it is set.
+    """
+    if slot > last_finalized_slot_number:
+        raise ValueError('ref_slot should be less or equal to the last finalized slot_number.')
+
+    slot_block = cc.slots_index.get(slot) if cc.slots_index is not None else None
+    if slot_block is not None:
+        return slot_block
+
+    existed_header = _get_first_non_missed_slot_header(cc, slot, last_finalized_slot_number)
+    slot_block = SlotBlock(
+        slot=slot,
+        block_root=existed_header.data.root,
+        blockstamp=build_blockstamp(cc.get_block_details(existed_header.data.root)),
+    )
+
+    if cc.slots_index is not None:
+        cc.slots_index.add(slot_block)
+
+    return slot_block
+
+
+def _find_first_existed_header(
+    get_block_header: Callable[[SlotNumber], BlockHeaderFullResponse],
+    slots: range,
+) -> Optional[BlockHeaderFullResponse]:
+    """
+    Requests headers of all slots concurrently and returns the header of the first non-missed slot.
+    Results are checked in slots order, so errors for slots after the found one are ignored.
+    Single slot is requested directly in the calling thread.
+    """
+    futures: list[Future] = []
+    if len(slots) > 1:
+        futures = [_probe_executor.submit(get_block_header, SlotNumber(i)) for i in slots]
+        wait(futures)
+
+    for position, i in enumerate(slots):
+        try:
+            existed_header = futures[position].result() if futures else get_block_header(SlotNumber(i))
+        except NotOkResponse as error:
+            if error.status != HTTPStatus.NOT_FOUND:
+                # Not expected status - raise exception
+                raise error from error
+
+            logger.warning({'msg': f'Missed slot: {i}. Check next slot.', 'error': str(error.__dict__)})
+        else:
+            _check_block_header(existed_header)
+            return existed_header
+
+    return None
 
 
 def _check_block_header(block_header: BlockHeaderFullResponse):
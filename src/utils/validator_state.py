@@ -1,4 +1,6 @@
-from typing import Sequence
+from typing import Iterable
+
+import numpy as np
 
 from src.constants import (
     MAX_EFFECTIVE_BALANCE,
@@ -6,6 +8,7 @@ from src.constants import (
     SHARD_COMMITTEE_PERIOD,
     FAR_FUTURE_EPOCH,
 )
+from src.providers.consensus.registry import ValidatorRegistry
 from src.providers.consensus.typings import Validator
 from src.typings import EpochNumber, Gwei
 
@@ -76,15 +79,53 @@ def is_validator_eligible_to_exit(validator: Validator, epoch: EpochNumber) -> b
     return active_long_enough and not is_on_exit(validator)
 
 
-def calculate_active_effective_balance_sum(validators: Sequence[Validator], ref_epoch: EpochNumber) -> Gwei:
+def calculate_active_effective_balance_sum(validators: Iterable[Validator], ref_epoch: EpochNumber) -> Gwei:
     """
     Return the combined effective balance of the active validators.
     https://github.com/ethereum/consensus-specs/blob/dev/specs/phase0/beacon-chain.md#get_total_active_balance
     """
-    total_effective_balance = 0
+    registry = ValidatorRegistry.from_validators(validators)
+    return Gwei(int(registry.effective_balance[active_validators_mask(registry, ref_epoch)].sum()))
+
+
+# Batch versions of the predicates above. Each one returns boolean mask over the registry rows.
+
+def active_validators_mask(validators: ValidatorRegistry, epoch: EpochNumber) -> np.ndarray:
+    return (validators.activation_epoch <= epoch) & (epoch < validators.exit_epoch)
+
+
+def exited_validators_mask(validators: ValidatorRegistry, epoch: EpochNumber) -> np.ndarray:
+    return validators.exit_epoch <= epoch
+
+
+def on_exit_mask(validators: ValidatorRegistry) -> np.ndarray:
+    return validators.exit_epoch != FAR_FUTURE_EPOCH
+
+
+def eth1_withdrawal_credential_mask(validators: ValidatorRegistry) -> np.ndarray:
+    return validators.withdrawal_credentials[:, 0] == int(ETH1_ADDRESS_WITHDRAWAL_PREFIX, 16)
+
+
+def partially_withdrawable_validators_mask(validators: ValidatorRegistry) -> np.ndarray:
+    return (
+        eth1_withdrawal_credential_mask(validators)
+        & (validators.effective_balance == MAX_EFFECTIVE_BALANCE)
+        & (validators.balance > MAX_EFFECTIVE_BALANCE)
+    )
+
+
+def fully_withdrawable_validators_mask(validators: ValidatorRegistry, epoch: EpochNumber) -> np.ndarray:
+    return (
+        eth1_withdrawal_credential_mask(validators)
+        & (validators.withdrawable_epoch <= epoch)
+        & (validators.balance > 0)
+    )
+
 
-    for v in validators:
-        if is_active_validator(v, ref_epoch):
-            total_effective_balance += int(v.validator.effective_balance)
+def validators_eligible_to_exit_mask(validators: ValidatorRegistry, epoch: EpochNumber) -> np.ndarray:
+    if epoch < SHARD_COMMITTEE_PERIOD:
+        return np.zeros(len(validators), dtype=np.bool_)
 
-    return Gwei(total_effective_balance)
+    # Subtract from epoch to avoid uint64 overflow for not activated validators (FAR_FUTURE_EPOCH)
+    active_long_enough = validators.activation_epoch <= epoch - SHARD_COMMITTEE_PERIOD
+    return active_long_enough & ~on_exit_mask(validators)
@@ -4,8 +4,13 @@ from eth_account import Account
 
 # - Providers-
 EXECUTION_CLIENT_URI = os.getenv('EXECUTION_CLIENT_URI', '').split(',')
+# Comma separated list of nodes, slow requests to the first node are hedged by the next ones
 CONSENSUS_CLIENT_URI = os.getenv('CONSENSUS_CLIENT_URI', '')
 KEYS_API_URI = os.getenv('KEYS_API_URI', '')
+# Fetch validators from SSZ encoded beacon state. Falls back to JSON if node does not support it
+CONSENSUS_CLIENT_SSZ = os.getenv('CONSENSUS_CLIENT_SSZ', 'False').lower() == 'true'
+# Send JSON requests to consensus client through asyncio connection pool, so requests from several threads overlap
+CONSENSUS_CLIENT_ASYNC = os.getenv('CONSENSUS_CLIENT_ASYNC', 'False').lower() == 'true'
 
 # - Account -
 ACCOUNT = None
@@ -17,6 +22,19 @@ if MEMBER_PRIV_KEY:
 LIDO_LOCATOR_ADDRESS = os.getenv('LIDO_LOCATOR_ADDRESS')
 FINALIZATION_BATCH_MAX_REQUEST_COUNT = os.getenv('FINALIZATION_BATCH_MAX_REQUEST_COUNT', 1000)
 ALLOW_NEGATIVE_REBASE_REPORTING = os.getenv('ALLOW_NEGATIVE_REBASE_REPORTING', 'False').lower() == 'true'
+# Contract calls at the same block are aggregated through Multicall3. Calls are sent one by one if it is empty
+MULTICALL3_ADDRESS = os.getenv('MULTICALL3_ADDRESS', '0xcA11bde05977b3631167028862bE2a173976CA11')
+
+# - Cache -
+# Directory for on-disk caches, they are disabled if it is not set
+CACHE_PATH = os.getenv('CACHE_PATH', '')
+VALIDATORS_SNAPSHOTS_MAX_SIZE_MB = int(os.getenv('VALIDATORS_SNAPSHOTS_MAX_SIZE_MB', 2048))
+EL_RESPONSES_CACHE_MAX_SIZE_MB = int(os.getenv('EL_RESPONSES_CACHE_MAX_SIZE_MB', 512))
+# Sizes of in-memory cache regions, e.g. "ConsensusClient.get_validators=3,LidoContracts.get_el_vault_balance=8"
+CACHE_REGIONS_SIZES = {
+    name.strip(): int(size)
+    for name, size in (item.split('=') for item in os.getenv('CACHE_REGIONS_SIZES', '').split(',') if item.strip())
+}
 
 # - Metrics -
 PROMETHEUS_PORT = int(os.getenv('PROMETHEUS_PORT', 9000))
@@ -0,0 +1,186 @@
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence, cast
+
+from eth_typing import URI
+
+from web3 import HTTPProvider, Web3
+from web3._utils.encoding import Web3JsonEncoder
+from web3._utils.request import make_post_request
+from web3._utils.rpc_abi import RPC
+from web3.exceptions import ExtraDataLengthError
+from web3.middleware.geth_poa import geth_poa_cleanup
+from web3.middleware.validation import _check_extradata_length
+from web3.types import RPCEndpoint, RPCResponse
+from web3_multi_provider import MultiProvider  # type: ignore[import]
+from web3_multi_provider.multi_http_provider import NoActiveProviderError  # type: ignore[import]
+
+logger = logging.getLogger(__name__)
+
+Request = tuple[RPCEndpoint, Any]
+
+
+class RequestsBatch:
+    """
+    Requests of the batch workers queued until every worker is either waiting for response or finished.
+    Then all queued requests are sent together, and next round starts.
+    """
+    def __init__(self, send: Callable[[list[Request]], list[RPCResponse]], workers: int):
+        self._send = send
+        self._running = workers
+        self._pending: list[tuple[Request, Future]] = []
+        self._lock = threading.Lock()
+
+    def add(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        future: Future = Future()
+        with self._lock:
+            self._pending.append(((method, params), future))
+            ready = self._take_ready()
+
+        self._flush(ready)
+        return future.result()
+
+    def done(self) -> None:
+        with self._lock:
+            self._running -= 1
+            ready = self._take_ready()
+
+        self._flush(ready)
+
+    def _take_ready(self) -> list[tuple[Request, Future]]:
+        if len(self._pending) < self._running:
+            return []
+
+        ready, self._pending = self._pending, []
+        return ready
+
+    def _flush(self, ready: list[tuple[Request, Future]]) -> None:
+        if not ready:
+            return
+
+        try:
+            responses = self._send([request for request, _ in ready])
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            for _, future in ready:
+                future.set_exception(error)
+            return
+
+        for (_, future), response in zip(ready, responses):
+            future.set_result(response)
+
+
+class BatchMultiProvider(MultiProvider):
+    """
+    MultiProvider that sends requests made together by `batch_requests` as one JSON-RPC array.
+
+    Every batched call still goes through the whole middlewares stack, so metrics and formatters work per request.
+    If batch fails, the next provider is used the same way MultiProvider does.
+    """
+    _providers: list[Any]
+    _current_provider_index: int
+    _last_working_provider_index: int
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        batch: Optional[RequestsBatch] = getattr(self._local, 'batch', None)
+        if batch is None:
+            return super().make_request(method, params)
+
+        return batch.add(method, params)
+
+    def batch_requests(self, calls: Sequence[Callable[[], Any]]) -> list[Any]:
+        """
+        Runs the calls concurrently, all requests they make at the same time are sent in one batch.
+        E.g. two `get_balance` calls are sent as one batch, and call made after response is sent in the next one.
+        """
+        if len(calls) < 2:
+            return [call() for call in calls]
+
+        batch = RequestsBatch(self._send_batch, len(calls))
+
+        def run(call: Callable[[], Any]) -> Any:
+            self._local.batch = batch
+            try:
+                return call()
+            finally:
+                self._local.batch = None
+                batch.done()
+
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            return list(executor.map(run, calls))
+
+    def _send_batch(self, requests: list[Request]) -> list[RPCResponse]:
+        while True:
+            provider = self._providers[self._current_provider_index]
+
+            try:
+                responses = self._send_batch_to_provider(provider, requests)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logger.warning({
+                    'msg': 'Provider not responding.',
+                    'error': str(error),
+                    'provider': provider.endpoint_uri,
+                })
+
+                self._current_provider_index = (self._current_provider_index + 1) % len(self._providers)
+                self.endpoint_uri = self._providers[self._current_provider_index].endpoint_uri
+
+                if self._last_working_provider_index == self._current_provider_index:
+                    msg = 'No active provider available.'
+                    logger.error({'msg': msg})
+                    raise NoActiveProviderError(msg) from error
+
+                continue
+
+            self._last_working_provider_index = self._current_provider_index
+            return [self._cleanup_response(method, response) for (method, _), response in zip(requests, responses)]
+
+    @staticmethod
+    def _send_batch_to_provider(provider, requests: list[Request]) -> list[RPCResponse]:
+        if len(requests) == 1 or not isinstance(provider, HTTPProvider):
+            return [provider.make_request(method, params) for method, params in requests]
+
+        rpc_requests = [
+            {'jsonrpc': '2.0', 'method': method, 'params': params or [], 'id': next(provider.request_counter)}
+            for method, params in requests
+        ]
+        raw_response = make_post_request(
+            cast(URI, provider.endpoint_uri),
+            json.dumps(rpc_requests, cls=Web3JsonEncoder).encode(),
+            **provider.get_request_kwargs(),
+        )
+        response: Any = provider.decode_rpc_response(raw_response)
+
+        if not isinstance(response, list):
+            # Node answers with single error if it does not support batches
+            logger.warning({'msg': 'Batch request is not supported by provider.', 'provider': provider.endpoint_uri})
+            return [provider.make_request(method, params) for method, params in requests]
+
+        responses_by_id = {item.get('id'): item for item in response}
+        return [responses_by_id[rpc_request['id']] for rpc_request in rpc_requests]
+
+    @staticmethod
+    def _cleanup_response(method: RPCEndpoint, response: RPCResponse) -> RPCResponse:
+        """The same PoA cleanup MultiProvider does for blocks"""
+        result = response.get('result')
+        if method in (RPC.eth_getBlockByHash, RPC.eth_getBlockByNumber) and isinstance(result, dict):
+            if 'extraData' in result and 'proofOfAuthorityData' not in result:
+                try:
+                    _check_extradata_length(result['extraData'])
+                except ExtraDataLengthError:
+                    response['result'] = geth_poa_cleanup(result)  # type: ignore[typeddict-unknown-key]
+
+        return response
+
+
+def batch_requests(w3: Web3, calls: Sequence[Callable[[], Any]]) -> list[Any]:
+    """Makes the calls with batched requests if provider supports it, otherwise one by one"""
+    if isinstance(w3.provider, BatchMultiProvider):
+        return w3.provider.batch_requests(calls)
+
+    return [call() for call in calls]
@@ -2,7 +2,7 @@ import itertools
 from typing import Any, Callable, Optional, Tuple
 
 from eth_abi.exceptions import DecodingError
-from eth_typing import ChecksumAddress
+from eth_typing import ChecksumAddress, HexStr
 from web3 import Web3
 from web3._utils.abi import (
     get_abi_output_types,
@@ -64,6 +64,36 @@ def call_contract_function(  # pylint: disable=keyword-arg-before-vararg
         ccip_read_enabled=ccip_read_enabled,
     )
 
+    return decode_contract_function_output(
+        w3,
+        address,
+        normalizers,
+        function_identifier,
+        return_data,
+        contract_abi,
+        fn_abi,
+        decode_tuples,
+        *args,
+        **kwargs,
+    )
+
+
+def decode_contract_function_output(  # pylint: disable=keyword-arg-before-vararg
+    w3: "Web3",
+    address: ChecksumAddress,
+    normalizers: Tuple[Callable[..., Any], ...],
+    function_identifier: FunctionIdentifier,
+    return_data: bytes,
+    contract_abi: Optional[ABI] = None,
+    fn_abi: Optional[ABIFunction] = None,
+    decode_tuples: Optional[bool] = False,
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Decodes `eth_call` return data the same way as `call_contract_function` does.
+    Separated to decode results of the calls aggregated by multicall.
+    """
     if fn_abi is None:
         fn_abi = find_matching_fn_abi(
             contract_abi, w3.codec, function_identifier, args, kwargs
@@ -135,6 +165,24 @@ class ContractFunction(_ContractFunction):
             **self.kwargs,
         )
 
+    def encode_call_data(self) -> HexStr:
+        return self._encode_transaction_data()
+
+    def decode_output(self, return_data: bytes) -> Any:
+        """Decodes return data of this function call, results are the same as `call` returns"""
+        return decode_contract_function_output(
+            self.w3,
+            self.address,
+            self._return_data_normalizers,
+            self.function_identifier,
+            return_data,
+            self.contract_abi,
+            self.abi,
+            self.decode_tuples,
+            *self.args,
+            **self.kwargs,
+        )
+
 
 class ContractFunctions(_ContractFunctions):
     def __init__(
@@ -0,0 +1,167 @@
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from eth_typing import HexStr
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+from web3._utils.contracts import find_matching_event_abi
+from web3._utils.encoding import Web3JsonEncoder
+from web3._utils.events import get_event_data
+from web3._utils.method_formatters import log_entry_formatter
+from web3.contract.contract import ContractEvent
+from web3.types import EventData, LogReceipt
+
+from src.metrics.prometheus.basic import CACHE_SIZE
+from src.typings import BlockNumber
+
+logger = logging.getLogger(__name__)
+
+REGION = 'events_index'
+
+
+class EventsIndex:
+    """
+    Append-only index of the contract events logs in SQLite database.
+
+    Every (contract, event) pair has one continuous indexed range of blocks.
+    Requested blocks out of the range are fetched from the node and appended, so already indexed logs are never requested again.
+    If requested blocks are far from the indexed range, the index of the pair is started again from them.
+    Only finalized blocks are indexed, logs of the newer blocks are fetched every time and are not saved.
+    Logs are kept in memory if path is not set.
+    """
+    # Max blocks in one eth_getLogs request. Range is split further if node refuses to return the logs.
+    MAX_BLOCKS_RANGE = 50_000
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._finalized_block_number = -1
+        self._db = sqlite3.connect(path or ':memory:', check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS ranges ('
+            'address TEXT, topic TEXT, from_block INTEGER NOT NULL, to_block INTEGER NOT NULL, '
+            'PRIMARY KEY (address, topic))'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS logs ('
+            'address TEXT, topic TEXT, block_number INTEGER, log_index INTEGER, log TEXT NOT NULL, '
+            'PRIMARY KEY (address, topic, block_number, log_index))'
+        )
+        self._db.commit()
+        self._size = self._db.execute('SELECT COUNT(*) FROM logs').fetchone()[0]
+        self._update_size()
+
+    def get_events(self, contract_event: ContractEvent, from_block: BlockNumber, to_block: BlockNumber) -> list[EventData]:
+        """Returns decoded events of the contract from the blocks range, both ends included"""
+        w3 = contract_event.w3
+        event_abi = find_matching_event_abi(contract_event.contract_abi, event_name=contract_event.event_name)
+        address = contract_event.address.lower()
+        topic = Web3.to_hex(event_abi_to_log_topic(dict(event_abi)))
+
+        with self._lock:
+            last_indexed_block = min(to_block, self._get_finalized_block_number(w3, to_block))
+            if from_block <= last_indexed_block:
+                self._sync(w3, address, topic, from_block, last_indexed_block)
+            logs = self._load(address, topic, from_block, last_indexed_block)
+
+        if last_indexed_block < to_block:
+            logs += self._get_logs(w3, address, topic, max(from_block, last_indexed_block + 1), to_block)
+
+        return [get_event_data(w3.codec, event_abi, log) for log in logs]
+
+    def _get_finalized_block_number(self, w3: Web3, block_number: int) -> int:
+        if block_number > self._finalized_block_number:
+            self._finalized_block_number = w3.eth.get_block('finalized')['number']
+        return self._finalized_block_number
+
+    def _sync(self, w3: Web3, address: str, topic: str, from_block: int, to_block: int) -> None:
+        indexed = self._db.execute(
+            'SELECT from_block, to_block FROM ranges WHERE address = ? AND topic = ?', (address, topic),
+        ).fetchone()
+
+        if indexed is None or to_block < indexed[0] - 1 or from_block > indexed[1] + 1:
+            # Requested range does not touch indexed one, start the index again to keep it continuous
+            missed = [(from_block, to_block)]
+            indexed_range = (from_block, to_block)
+            reset = True
+        else:
+            missed = [(from_block, indexed[0] - 1), (indexed[1] + 1, to_block)]
+            indexed_range = (min(from_block, indexed[0]), max(to_block, indexed[1]))
+            if indexed_range == tuple(indexed):
+                return
+            reset = False
+
+        missed = [(start, end) for start, end in missed if start <= end]
+        logs = [
+            log
+            for start, end in missed
+            for log in self._get_logs(w3, address, topic, start, end)
+        ]
+
+        logger.info({
+            'msg': 'Append logs to the events index.',
+            'value': {'address': address, 'topic': topic, 'blocks': missed, 'logs': len(logs)},
+        })
+        with self._db:
+            if reset:
+                deleted = self._db.execute('DELETE FROM logs WHERE address = ? AND topic = ?', (address, topic))
+                self._size -= deleted.rowcount
+            # Appended blocks are out of the indexed range, so every log is a new row
+            self._db.executemany(
+                'INSERT INTO logs (address, topic, block_number, log_index, log) VALUES (?, ?, ?, ?, ?)',
+                [
+                    (address, topic, log['blockNumber'], log['logIndex'], json.dumps(log, cls=Web3JsonEncoder))
+                    for log in logs
+                ],
+            )
+            self._size += len(logs)
+            self._db.execute(
+                'INSERT OR REPLACE INTO ranges (address, topic, from_block, to_block) VALUES (?, ?, ?, ?)',
+                (address, topic, *indexed_range),
+            )
+        self._update_size()
+
+    def _load(self, address: str, topic: str, from_block: int, to_block: int) -> list[LogReceipt]:
+        rows = self._db.execute(
+            'SELECT log FROM logs WHERE address = ? AND topic = ? AND block_number BETWEEN ? AND ? '
+            'ORDER BY block_number, log_index',
+            (address, topic, from_block, to_block),
+        ).fetchall()
+        return [log_entry_formatter(json.loads(row[0])) for row in rows]
+
+    def _get_logs(self, w3: Web3, address: str, topic: str, from_block: int, to_block: int) -> list[LogReceipt]:
+        logs: list[LogReceipt] = []
+        for start in range(from_block, to_block + 1, self.MAX_BLOCKS_RANGE):
+            logs += self._get_logs_splitting_range(w3, address, topic, start, min(to_block, start + self.MAX_BLOCKS_RANGE - 1))
+        return logs
+
+    def _get_logs_splitting_range(self, w3: Web3, address: str, topic: str, from_block: int, to_block: int) -> list[LogReceipt]:
+        try:
+            return list(w3.eth.get_logs({
+                'address': Web3.to_checksum_address(address),
+                'topics': [HexStr(topic)],
+                'fromBlock': from_block,
+                'toBlock': to_block,
+            }))
+        except ValueError as error:
+            # Node limits count of the returned logs or the blocks range
+            if from_block == to_block:
+                raise
+
+            logger.info({'msg': 'Failed to get logs. Split blocks range.', 'value': (from_block, to_block), 'error': str(error)})
+            middle = (from_block + to_block) // 2
+            return (
+                self._get_logs_splitting_range(w3, address, topic, from_block, middle)
+                + self._get_logs_splitting_range(w3, address, topic, middle + 1, to_block)
+            )
+
+    def _update_size(self) -> None:
+        CACHE_SIZE.labels(region=REGION).set(self._size)
@@ -3,3 +3,4 @@ from src.web3py.extensions.tx_utils import TransactionUtils
 from src.web3py.extensions.consensus import ConsensusClientModule
 from src.web3py.extensions.contracts import LidoContracts
 from src.web3py.extensions.lido_validators import LidoValidatorsProvider
+from src.web3py.extensions.validator_set_stats import ValidatorSetStatsProvider
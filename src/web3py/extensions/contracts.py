@@ -1,6 +1,7 @@
 import json
 import logging
-from functools import lru_cache
+from functools import cache
+from typing import Optional
 
 from web3 import Web3
 from web3.contract import Contract
@@ -10,6 +11,8 @@ from web3.types import Wei
 from src import variables
 from src.metrics.prometheus.business import FRAME_LAST_REPORT_REF_SLOT
 from src.typings import BlockStamp, SlotNumber
+from src.utils.cache import cached
+from src.web3py.events_index import EventsIndex
 
 logger = logging.getLogger()
 
@@ -24,6 +27,8 @@ class LidoContracts(Module):
     oracle_report_sanity_checker: Contract
     oracle_daemon_config: Contract
     burner: Contract
+    # Index of the contracts events, events are requested from the node every time if not set
+    events_index: Optional[EventsIndex] = None
 
     def __init__(self, w3: Web3):
         super().__init__(w3)
@@ -96,11 +101,13 @@ class LidoContracts(Module):
         )
 
     @staticmethod
+    @cache
     def load_abi(abi_name: str, abi_path: str = './assets/'):
+        """ABI files are parsed once, returned ABI should not be modified"""
         with open(f'{abi_path}{abi_name}.json') as f:
             return json.load(f)
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_withdrawal_balance(self, blockstamp: BlockStamp) -> Wei:
         return self.get_withdrawal_balance_no_cache(blockstamp)
 
@@ -112,7 +119,7 @@ class LidoContracts(Module):
             block_identifier=blockstamp.block_hash,
         ))
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_el_vault_balance(self, blockstamp: BlockStamp) -> Wei:
         return Wei(self.w3.eth.get_balance(
             self.lido_locator.functions.elRewardsVault().call(
@@ -121,7 +128,7 @@ class LidoContracts(Module):
             block_identifier=blockstamp.block_hash,
         ))
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_accounting_last_processing_ref_slot(self, blockstamp: BlockStamp) -> SlotNumber:
         result = self.accounting_oracle.functions.getLastProcessingRefSlot().call(block_identifier=blockstamp.block_hash)
         FRAME_LAST_REPORT_REF_SLOT.set(result)
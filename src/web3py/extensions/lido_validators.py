@@ -1,14 +1,16 @@
 import logging
-from dataclasses import asdict, dataclass
-from functools import lru_cache
-from typing import TYPE_CHECKING, NewType, Tuple
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NewType, Sequence, Tuple
 
 from eth_typing import ChecksumAddress
 from web3.module import Module
 
+from src.providers.consensus.registry import ValidatorsPubkeyIndex
 from src.providers.consensus.typings import Validator
+from src.providers.keys.table import LidoKeysTable
 from src.providers.keys.typings import LidoKey
 from src.typings import BlockStamp
+from src.utils.cache import REGISTRY_REGION_SIZE, cached
 from src.utils.dataclass import Nested, list_of_dataclasses
 
 
@@ -95,6 +97,16 @@ class NodeOperator(Nested):
 class LidoValidator(Validator):
     lido_id: LidoKey
 
+    @classmethod
+    def from_validator(cls, validator: Validator, lido_key: LidoKey) -> 'LidoValidator':
+        """
+        Fields reference the same objects as the validator ones, so nothing is copied or parsed again.
+        """
+        lido_validator = object.__new__(cls)
+        lido_validator.__dict__.update(vars(validator))
+        lido_validator.lido_id = lido_key
+        return lido_validator
+
 
 ValidatorsByNodeOperator = dict[NodeOperatorGlobalIndex, list[LidoValidator]]
 
@@ -102,30 +114,31 @@ ValidatorsByNodeOperator = dict[NodeOperatorGlobalIndex, list[LidoValidator]]
 class LidoValidatorsProvider(Module):
     w3: 'Web3'
 
-    @lru_cache(maxsize=1)
+    def __init__(self, w3: 'Web3'):
+        super().__init__(w3)
+        # Is reused for merges with all states: reference, last report and historical ones
+        self.pubkey_index = ValidatorsPubkeyIndex()
+
+    @cached(maxsize=REGISTRY_REGION_SIZE)
     def get_lido_validators(self, blockstamp: BlockStamp) -> list[LidoValidator]:
         lido_keys = self.w3.kac.get_all_lido_keys(blockstamp)
         validators = self.w3.cc.get_validators(blockstamp)
 
         return self.merge_validators_with_keys(lido_keys, validators)
 
-    @staticmethod
-    def merge_validators_with_keys(keys: list[LidoKey], validators: list[Validator]) -> list[LidoValidator]:
+    def merge_validators_with_keys(self, keys: Sequence[LidoKey], validators: Sequence[Validator]) -> list[LidoValidator]:
         """Merging and filter non-lido validators."""
-        validators_keys_dict = {validator.validator.pubkey: validator for validator in validators}
-
-        lido_validators = []
-
-        for key in keys:
-            if key.key in validators_keys_dict:
-                lido_validators.append(LidoValidator(
-                    lido_id=key,
-                    **asdict(validators_keys_dict[key.key]),
-                ))
+        pubkeys = keys.iter_pubkeys() if isinstance(keys, LidoKeysTable) else (key.key for key in keys)
+        positions = self.pubkey_index.find(validators, pubkeys)
 
-        return lido_validators
+        # Only keys of the Lido validators are materialized
+        return [
+            LidoValidator.from_validator(validators[position], keys[row])
+            for row, position in enumerate(positions)
+            if position is not None
+        ]
 
-    @lru_cache(maxsize=1)
+    @cached(maxsize=REGISTRY_REGION_SIZE)
     def get_lido_validators_by_node_operators(self, blockstamp: BlockStamp) -> ValidatorsByNodeOperator:
         merged_validators = self.get_lido_validators(blockstamp)
         no_operators = self.get_lido_node_operators(blockstamp)
@@ -156,7 +169,7 @@ class LidoValidatorsProvider(Module):
 
         return no_validators
 
-    @lru_cache(maxsize=1)
+    @cached()
     def get_lido_node_operators(self, blockstamp: BlockStamp) -> list[NodeOperator]:
         result = []
 
@@ -170,7 +183,7 @@ class LidoValidatorsProvider(Module):
 
         return result
 
-    @lru_cache(maxsize=1)
+    @cached()
     @list_of_dataclasses(StakingModule)
     def get_staking_modules(self, blockstamp: BlockStamp) -> list[StakingModule]:
         modules = self.w3.lido_contracts.staking_router.functions.getStakingModules().call(
@@ -8,6 +8,7 @@ from web3.module import Module
 from web3.types import TxReceipt, Wei
 
 from src.metrics.prometheus.basic import TRANSACTIONS_COUNT, Status, ACCOUNT_BALANCE
+from src.web3py.batch_provider import batch_requests
 
 logger = logging.getLogger(__name__)
 
@@ -54,17 +55,23 @@ class TransactionUtils(Module):
             logger.info({"msg": "No account provided. Dry mode."})
             return None
 
-        pending_block = self.w3.eth.get_block("pending")
+        address = account.address
+        pending_block, max_priority_fee, nonce, gas = batch_requests(self.w3, [
+            lambda: self.w3.eth.get_block("pending"),
+            lambda: self.w3.eth.max_priority_fee,
+            lambda: self.w3.eth.get_transaction_count(address),
+            lambda: transaction.estimate_gas({'from': address}),
+        ])
 
         tx = transaction.build_transaction(
             {
-                "from": account.address,
-                "gas": int(transaction.estimate_gas({'from': account.address}) * self.GAS_MULTIPLIER),
+                "from": address,
+                "gas": int(gas * self.GAS_MULTIPLIER),
                 "maxFeePerGas": Wei(
-                    pending_block["baseFeePerGas"] * 2 + self.w3.eth.max_priority_fee
+                    pending_block["baseFeePerGas"] * 2 + max_priority_fee
                 ),
-                "maxPriorityFeePerGas": self.w3.eth.max_priority_fee,
-                "nonce": self.w3.eth.get_transaction_count(account.address),
+                "maxPriorityFeePerGas": max_priority_fee,
+                "nonce": nonce,
             }
         )
 
@@ -0,0 +1,88 @@
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+from web3.module import Module
+
+from src.providers.consensus.registry import ValidatorRegistry
+from src.providers.consensus.typings import Validator
+from src.typings import EpochNumber, Gwei, ReferenceBlockStamp
+from src.utils.cache import cached
+from src.utils.validator_state import (
+    active_validators_mask,
+    fully_withdrawable_validators_mask,
+    on_exit_mask,
+    partially_withdrawable_validators_mask,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+if TYPE_CHECKING:
+    from src.web3py.typings import Web3
+
+
+@dataclass
+class ValidatorSetStats:
+    """Aggregates over all validators on the reference epoch"""
+    active_validators_count: int
+    active_effective_balance_sum: Gwei
+    # The latest exit epoch and amount of validators that are exiting in this epoch
+    max_exit_epoch: EpochNumber
+    max_exit_epoch_validators_count: int
+    # Partially or fully withdrawable validators
+    withdrawable_validators_count: int
+    # Validators that are not exited and are not going to exit
+    not_on_exit_validators_count: int
+    # Slashed validators that are not withdrawn yet, their slashings affect midterm penalties
+    slashed_with_midterm_impact: list[Validator]
+
+    @classmethod
+    def from_validators(cls, validators: Sequence[Validator], ref_epoch: EpochNumber) -> 'ValidatorSetStats':
+        registry = ValidatorRegistry.from_validators(validators)
+        active = active_validators_mask(registry, ref_epoch)
+        on_exit = on_exit_mask(registry)
+
+        exit_epochs = registry.exit_epoch[on_exit]
+        max_exit_epoch = exit_epochs.max() if exit_epochs.size else 0
+
+        withdrawable = (
+            partially_withdrawable_validators_mask(registry) |
+            fully_withdrawable_validators_mask(registry, ref_epoch)
+        )
+        slashed_with_midterm_impact = registry.slashed & (registry.withdrawable_epoch > ref_epoch)
+
+        return cls(
+            active_validators_count=int(np.count_nonzero(active)),
+            active_effective_balance_sum=Gwei(int(registry.effective_balance[active].sum())),
+            max_exit_epoch=EpochNumber(int(max_exit_epoch)),
+            max_exit_epoch_validators_count=int(np.count_nonzero(exit_epochs == max_exit_epoch)),
+            withdrawable_validators_count=int(np.count_nonzero(withdrawable)),
+            not_on_exit_validators_count=len(registry) - len(exit_epochs),
+            # Only a few validators are slashed, so materialize just them
+            slashed_with_midterm_impact=list(registry.take(slashed_with_midterm_impact)),
+        )
+
+
+class ValidatorSetStatsProvider(Module):
+    """
+    Computes aggregates over all validators that are needed by several modules in one pass
+    and shares them between the modules.
+    """
+    w3: 'Web3'
+
+    @cached()
+    def get_validator_set_stats(self, blockstamp: ReferenceBlockStamp) -> ValidatorSetStats:
+        validators = self.w3.cc.get_validators(blockstamp)
+        stats = ValidatorSetStats.from_validators(validators, blockstamp.ref_epoch)
+        logger.info({
+            'msg': 'Calculate validator set stats.',
+            'value': {
+                'active_validators_count': stats.active_validators_count,
+                'max_exit_epoch': stats.max_exit_epoch,
+                'slashed_with_midterm_impact': len(stats.slashed_with_midterm_impact),
+            },
+        })
+        return stats
@@ -4,15 +4,44 @@ import os
 from typing import Any, Callable
 from urllib.parse import urlparse
 
+from eth_utils import encode_hex, function_abi_to_4byte_selector
 from requests import HTTPError, Response
 from web3.types import RPCEndpoint, RPCResponse
 
 from src.metrics.prometheus.basic import EL_REQUESTS_DURATION
+from src.web3py.extensions.contracts import LidoContracts
 from web3 import Web3
 
 logger = logging.getLogger(__name__)
 
 
+def build_selectors_index(abi_dir: str = './assets/') -> dict[str, str]:
+    """Returns function names of all known contracts by 4-byte selector ('0x' prefixed hex)"""
+    index: dict[str, str] = {}
+    for filename in sorted(os.listdir(abi_dir)):
+        name, extension = os.path.splitext(filename)
+        if extension != '.json':
+            continue
+
+        try:
+            abi = LidoContracts.load_abi(name, abi_dir)
+        except json.JSONDecodeError:
+            continue
+
+        for fn_abi in abi:
+            if fn_abi.get('type') != 'function':
+                continue
+            index.setdefault(encode_hex(function_abi_to_4byte_selector(fn_abi)), fn_abi['name'])
+
+    return index
+
+
+def get_call_selector(data: Any) -> str:
+    if isinstance(data, bytes):
+        return encode_hex(data[:4])
+    return str(data)[:10].lower()
+
+
 def metrics_collector(
     make_request: Callable[[RPCEndpoint, Any], RPCResponse],
     w3: Web3,
@@ -22,16 +51,7 @@ def metrics_collector(
 
     EL_REQUESTS_DURATION - HISTOGRAM with requests time, count, response codes and request domain.
     """
-
-    contracts = []
-
-    abi_dir = './assets/'
-    for filename in os.listdir(abi_dir):
-        with open(os.path.join(abi_dir, filename), 'r') as f:
-            try:
-                contracts.append(w3.eth.contract(abi=json.load(f)))
-            except json.JSONDecodeError:
-                pass
+    selectors_index = build_selectors_index()
 
     def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
         try:
@@ -45,13 +65,7 @@ def metrics_collector(
         if method == 'eth_call':
             args = params[0]
             call_to = args['to']
-            for contract in contracts:
-                try:
-                    call_method = contract.get_function_by_selector(args['data']).fn_name
-                except ValueError:
-                    pass
-                if call_method:
-                    break
+            call_method = selectors_index.get(get_call_selector(args.get('data', '')), '')
         if method == 'eth_getBalance':
             call_to = params[0]
 
@@ -0,0 +1,58 @@
+import logging
+from typing import Any, Sequence, cast
+
+from web3.contract import Contract
+from web3.contract.base_contract import BaseContractFunction
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+from web3.types import BlockIdentifier
+
+from src import variables
+from src.web3py.contract_tweak import ContractFunction
+from src.web3py.extensions.contracts import LidoContracts
+from src.web3py.typings import Web3
+
+logger = logging.getLogger(__name__)
+
+
+def aggregate_calls(
+    w3: Web3,
+    functions: Sequence[BaseContractFunction],
+    block_identifier: BlockIdentifier,
+) -> list[Any]:
+    """
+    Calls view functions at the same block with one `eth_call` to Multicall3 contract.
+    Results are decoded per function and are the same as `function.call(block_identifier=...)` returns.
+
+    Failed calls are repeated one by one, so the original contract error is raised.
+    If MULTICALL3_ADDRESS is not set, or the Multicall3 call itself fails (e.g. it is not deployed on the chain
+    or at the block), all functions are called one by one.
+    Functions should be created by contracts of the tweaked factory, see `tweak_w3_contracts`.
+    """
+    if not variables.MULTICALL3_ADDRESS or len(functions) < 2:
+        return [function.call(block_identifier=block_identifier) for function in functions]
+
+    tweaked_functions = [cast(ContractFunction, function) for function in functions]
+    multicall = cast(Contract, w3.eth.contract(
+        address=w3.to_checksum_address(variables.MULTICALL3_ADDRESS),
+        abi=LidoContracts.load_abi('Multicall3'),
+    ))
+    try:
+        results = multicall.functions.aggregate3([
+            (function.address, True, function.encode_call_data())
+            for function in tweaked_functions
+        ]).call(block_identifier=block_identifier)
+    except (BadFunctionCallOutput, ContractLogicError, ValueError) as error:
+        # Output of the not deployed contract is empty and could not be decoded
+        logger.warning({'msg': 'Multicall3 call failed. Call functions directly.', 'error': str(error)})
+        return [function.call(block_identifier=block_identifier) for function in functions]
+
+    decoded = []
+    for function, (success, return_data) in zip(tweaked_functions, results):
+        if not success:
+            logger.warning({'msg': f'Aggregated call to {function.fn_name} failed. Call it directly.'})
+            decoded.append(function.call(block_identifier=block_identifier))
+            continue
+
+        decoded.append(function.decode_output(return_data))
+
+    return decoded
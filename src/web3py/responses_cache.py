@@ -0,0 +1,203 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from web3 import Web3
+from web3._utils.encoding import Web3JsonEncoder
+from web3.types import RPCEndpoint, RPCResponse
+
+from src.metrics.prometheus.basic import CACHE_HITS, CACHE_MISSES, CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+REGION = 'el_responses'
+# Eviction is checked once per this count of saved responses
+EVICTION_PERIOD = 1000
+# Last use time of the returned responses is saved once per this count of them
+USED_FLUSH_PERIOD = 100
+
+BLOCK_HASH_LENGTH = 32
+
+
+class ELResponsesCache:
+    """
+    On-disk store of EL responses in SQLite database.
+
+    Stored responses never expire, because only responses that could not change are saved (see middleware).
+    When total size exceeds max_size, least recently used responses are removed.
+    Database is shared by the oracle processes, so any database error is logged and treated as a cache miss.
+    """
+    def __init__(self, path: Path, max_size: int):
+        self.path = path
+        self.max_size = max_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._saved = 0
+        self._used: dict[str, float] = {}
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, result TEXT NOT NULL, used REAL NOT NULL)'
+        )
+        self._size = self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        self._update_size()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            try:
+                row = self._db.execute('SELECT result FROM responses WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    # Use time is only needed for eviction, so it is written in batches out of the hot path
+                    self._used[key] = time.time()
+                    if len(self._used) >= USED_FLUSH_PERIOD:
+                        self._flush_used()
+            except sqlite3.Error as error:
+                logger.warning({'msg': 'Failed to get EL response from the cache.', 'error': str(error)})
+                return None
+
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def save(self, key: str, result: Any) -> None:
+        with self._lock:
+            row = (json.dumps(result), time.time(), key)
+            try:
+                # Response could be already saved by a concurrent request, it is not counted again then
+                if self._db.execute('INSERT OR IGNORE INTO responses (result, used, key) VALUES (?, ?, ?)', row).rowcount:
+                    self._size += 1
+                else:
+                    self._db.execute('UPDATE responses SET result = ?, used = ? WHERE key = ?', row)
+                self._saved += 1
+                if self._saved % EVICTION_PERIOD == 0:
+                    self._flush_used()
+                    self._evict()
+            except sqlite3.Error as error:
+                logger.warning({'msg': 'Failed to save EL response to the cache.', 'error': str(error)})
+            self._update_size()
+
+    def _flush_used(self) -> None:
+        used, self._used = self._used, {}
+        try:
+            self._db.execute('BEGIN')
+            self._db.executemany('UPDATE responses SET used = ? WHERE key = ?', [(t, key) for key, t in used.items()])
+            self._db.execute('COMMIT')
+        except sqlite3.Error:
+            if self._db.in_transaction:
+                self._db.rollback()
+            raise
+
+    def _evict(self) -> None:
+        size = self._db.execute('SELECT COALESCE(SUM(LENGTH(key) + LENGTH(result)), 0) FROM responses').fetchone()[0]
+        if size <= self.max_size:
+            return
+
+        removed = 0
+        rows = self._db.execute('SELECT key, LENGTH(key) + LENGTH(result) FROM responses ORDER BY used').fetchall()
+        for key, row_size in rows:
+            if size <= self.max_size:
+                break
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            size -= row_size
+            removed += 1
+
+        self._size -= removed
+
+        logger.info({'msg': 'Remove least recently used EL responses.', 'value': removed})
+
+    def _update_size(self) -> None:
+        CACHE_SIZE.labels(region=REGION).set(self._size)
+
+
+def construct_responses_cache_middleware(
+    cache: ELResponsesCache,
+) -> Callable[[Callable[[RPCEndpoint, Any], RPCResponse], Web3], Callable[[RPCEndpoint, Any], RPCResponse]]:
+    """
+    Caches responses of `eth_call`, `eth_getBalance` and `eth_getLogs` in the persistent cache.
+
+    Only requests for the data that could not change are cached:
+    pinned to a block hash, or to a block number not greater than the finalized one.
+    Requests to tags like `latest` or `pending` are always sent to the node.
+    Should be injected as the innermost middleware, so raw responses are cached.
+    """
+    def responses_cache_middleware(
+        make_request: Callable[[RPCEndpoint, Any], RPCResponse],
+        _: Web3,
+    ) -> Callable[[RPCEndpoint, Any], RPCResponse]:
+        finalized_block_number = -1
+
+        def is_finalized(block_number: int) -> bool:
+            nonlocal finalized_block_number
+            if block_number > finalized_block_number:
+                response = make_request(RPCEndpoint('eth_getBlockByNumber'), ['finalized', False])
+                if isinstance(response.get('result'), dict):
+                    finalized_block_number = int(response['result']['number'], 16)
+            return block_number <= finalized_block_number
+
+        def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            blocks = _get_blocks_identifiers(method, params)
+            if blocks is None or not all(_is_immutable_block(block, is_finalized) for block in blocks):
+                return make_request(method, params)
+
+            region = f'{REGION}:{method}'
+            key = json.dumps([method, params], cls=Web3JsonEncoder, sort_keys=True)
+            result = cache.get(key)
+            if result is not None:
+                CACHE_HITS.labels(region=region).inc()
+                return {'jsonrpc': '2.0', 'id': 0, 'result': result}  # type: ignore[typeddict-item]
+
+            CACHE_MISSES.labels(region=region).inc()
+            response = make_request(method, params)
+            if 'error' not in response and response.get('result') is not None:
+                cache.save(key, response['result'])
+            return response
+
+        return middleware
+
+    return responses_cache_middleware
+
+
+def _get_blocks_identifiers(method: RPCEndpoint, params: Any) -> Optional[list[Any]]:
+    """Returns block identifiers the request depends on, or None if request should not be cached"""
+    if method in ('eth_call', 'eth_getBalance'):
+        # eth_call with state override is not cached
+        if len(params) != 2:
+            return None
+        return [params[1]]
+
+    if method == 'eth_getLogs':
+        log_filter = params[0]
+        if 'blockHash' in log_filter:
+            return [{'blockHash': log_filter['blockHash']}]
+        if 'fromBlock' not in log_filter or 'toBlock' not in log_filter:
+            return None
+        return [log_filter['fromBlock'], log_filter['toBlock']]
+
+    return None
+
+
+def _is_immutable_block(block: Any, is_finalized: Callable[[int], bool]) -> bool:
+    if isinstance(block, dict):
+        # EIP-1898 block identifier
+        if 'blockHash' in block:
+            return True
+        block = block.get('blockNumber')
+
+    if isinstance(block, bytes):
+        return len(block) == BLOCK_HASH_LENGTH
+
+    if isinstance(block, int):
+        return is_finalized(block)
+
+    if isinstance(block, str) and block.startswith('0x'):
+        if len(block) == 2 + BLOCK_HASH_LENGTH * 2:
+            return True
+        return is_finalized(int(block, 16))
+
+    # Tags: latest, pending, safe, finalized, earliest
+    return False
@@ -7,12 +7,14 @@ from src.web3py.extensions import (
     ConsensusClientModule,
     KeysAPIClientModule,
     LidoValidatorsProvider,
+    ValidatorSetStatsProvider,
 )
 
 
 class Web3(_Web3):
     lido_contracts: LidoContracts
     lido_validators: LidoValidatorsProvider
+    validator_set_stats: ValidatorSetStatsProvider
     transaction: TransactionUtils
     cc: ConsensusClientModule
     kac: KeysAPIClientModule
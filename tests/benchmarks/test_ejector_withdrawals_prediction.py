@@ -0,0 +1,61 @@
+"""
+Compares full scan of lido validators with prefix sums lookup for withdrawable balance prediction in ejector loop.
+
+Run: pytest tests/benchmarks/test_ejector_withdrawals_prediction.py --run-benchmarks -s
+"""
+import os
+import random
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.modules.ejector.ejector import Ejector
+from src.providers.consensus.registry import ValidatorRegistry
+from src.typings import EpochNumber
+from src.utils.validator_state import is_fully_withdrawable_validator
+from tests.factory.blockstamp import ReferenceBlockStampFactory
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.benchmark
+
+LIDO_VALIDATORS_COUNT = int(os.getenv('BENCHMARK_VALIDATORS_COUNT', 100_000))
+# Ejector loop asks for the next epoch every churn limit validators
+EPOCHS_COUNT = 100
+
+
+def test_ejector_withdrawals_prediction():
+    rnd = random.Random(42)
+    responses = [validator_response(i) for i in range(LIDO_VALIDATORS_COUNT)]
+    for response in responses:
+        response['validator']['withdrawable_epoch'] = str(rnd.randrange(1000))
+    validators = list(ValidatorRegistry.from_responses(responses))
+    ejector = object.__new__(Ejector)
+    ejector.w3 = Mock()
+    ejector.w3.lido_validators.get_lido_validators = Mock(return_value=validators)
+    ejector.w3.to_wei = lambda value, _: value * 10**9
+    blockstamp = ReferenceBlockStampFactory.build()
+
+    started = time.perf_counter()
+    expected = [
+        sum(
+            ejector._get_predicted_withdrawable_balance(v)
+            for v in validators
+            if is_fully_withdrawable_validator(v, EpochNumber(epoch))
+        )
+        for epoch in range(EPOCHS_COUNT)
+    ]
+    scan_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = [
+        ejector._get_withdrawable_lido_validators_balance(blockstamp, EpochNumber(epoch))
+        for epoch in range(EPOCHS_COUNT)
+    ]
+    prefix_sums_time = time.perf_counter() - started
+
+    print(f'\nWithdrawable balance, {LIDO_VALIDATORS_COUNT} lido validators, {EPOCHS_COUNT} epochs')
+    print(f'{"full scan per epoch, s":<28}{scan_time:>10.3f}')
+    print(f'{"prefix sums, s":<28}{prefix_sums_time:>10.3f}')
+
+    assert result == expected
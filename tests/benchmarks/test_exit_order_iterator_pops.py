@@ -0,0 +1,42 @@
+"""
+Compares heap based ExitOrderIterator with full resort of the queue before each pop.
+
+Run: pytest tests/benchmarks/test_exit_order_iterator_pops.py --run-benchmarks -s
+"""
+import copy
+import os
+import random
+import time
+
+import pytest
+
+from tests.modules.ejector.test_exit_order_iterator import brute_force_exit_order, build_random_exit_order
+
+pytestmark = pytest.mark.benchmark
+
+EXITABLE_COUNT = int(os.getenv('BENCHMARK_EXITABLE_COUNT', 300_000))
+POPS_COUNT = int(os.getenv('BENCHMARK_POPS_COUNT', 10_000))
+# Full resort is too slow to pop all validators, its time is extrapolated
+BRUTE_FORCE_POPS_COUNT = 5
+
+
+def test_exit_order_iterator_pops():
+    iterator, validators = build_random_exit_order(random.Random(42), EXITABLE_COUNT)
+    iterator.max_validators_to_exit = POPS_COUNT
+    reference = copy.deepcopy(iterator)
+
+    started = time.perf_counter()
+    iterator._prepare_queue(validators)
+    result = [next(iterator)[1] for _ in range(POPS_COUNT)]
+    heap_time = time.perf_counter() - started
+
+    reference.max_validators_to_exit = BRUTE_FORCE_POPS_COUNT
+    started = time.perf_counter()
+    expected = brute_force_exit_order(reference, validators)
+    brute_force_time = (time.perf_counter() - started) / BRUTE_FORCE_POPS_COUNT * POPS_COUNT
+
+    print(f'\nExit order, {EXITABLE_COUNT} exitable validators, {POPS_COUNT} pops')
+    print(f'{"full resort (extrapolated), s":<32}{brute_force_time:>10.1f}')
+    print(f'{"heaps, s":<32}{heap_time:>10.3f}')
+
+    assert result[:BRUTE_FORCE_POPS_COUNT] == expected
@@ -0,0 +1,66 @@
+"""
+Compares merge of lido keys with validators through dict of all validators and copies of them
+with merge through reused pubkey index and views of the validators.
+Merge is repeated for the reference state and the last report state, as accounting does.
+
+Run: pytest tests/benchmarks/test_lido_validators_merge.py --run-benchmarks -s
+"""
+import os
+import time
+from dataclasses import asdict
+from unittest.mock import Mock
+
+import pytest
+
+from src.providers.consensus.registry import ValidatorRegistry
+from src.providers.keys.typings import LidoKey
+from src.web3py.extensions.lido_validators import LidoValidator, LidoValidatorsProvider
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.benchmark
+
+VALIDATORS_COUNT = int(os.getenv('BENCHMARK_VALIDATORS_COUNT', 500_000))
+LIDO_SHARE = 0.3
+# Validators appended between last report and reference states
+NEW_VALIDATORS_COUNT = 1000
+
+
+def copy_merge(keys, validators) -> list[LidoValidator]:
+    """Merge as it was done before the pubkey index"""
+    validators_keys_dict = {validator.validator.pubkey: validator for validator in validators}
+    return [
+        LidoValidator(lido_id=key, **asdict(validators_keys_dict[key.key]))
+        for key in keys
+        if key.key in validators_keys_dict
+    ]
+
+
+def lido_key(pubkey: str) -> LidoKey:
+    key = object.__new__(LidoKey)
+    key.key = pubkey
+    return key
+
+
+def test_lido_validators_merge():
+    registry = ValidatorRegistry.from_responses(validator_response(i) for i in range(VALIDATORS_COUNT))
+    last_report_registry = registry[:VALIDATORS_COUNT - NEW_VALIDATORS_COUNT]
+    keys = [lido_key(registry.pubkey_hex(i)) for i in range(0, VALIDATORS_COUNT, int(1 / LIDO_SHARE))]
+    provider = LidoValidatorsProvider(Mock())
+
+    rows = []
+    for name, merge in (('dict and copies', copy_merge), ('pubkey index and views', provider.merge_validators_with_keys)):
+        started = time.perf_counter()
+        merged = merge(keys, registry)
+        first_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        merge(keys, last_report_registry)
+        second_time = time.perf_counter() - started
+        rows.append((name, first_time, second_time, merged))
+
+    print(f'\nLido validators merge, {VALIDATORS_COUNT} validators, {len(keys)} lido keys')
+    print(f'{"":<26}{"reference, s":>14}{"last report, s":>16}')
+    for name, first_time, second_time, _ in rows:
+        print(f'{name:<26}{first_time:>14.3f}{second_time:>16.3f}')
+
+    assert rows[0][3] == rows[1][3]
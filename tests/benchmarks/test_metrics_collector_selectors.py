@@ -0,0 +1,66 @@
+"""
+Compares lookup of the called function name in the selectors index with the scan over all contracts ABIs.
+
+Run: pytest tests/benchmarks/test_metrics_collector_selectors.py --run-benchmarks -s
+"""
+import json
+import os
+import random
+import time
+
+import pytest
+from web3 import Web3
+
+from src.web3py.middleware import build_selectors_index, get_call_selector
+
+pytestmark = pytest.mark.benchmark
+
+CALLS_COUNT = int(os.getenv('BENCHMARK_CALLS_COUNT', 2_000))
+ABI_DIR = './assets/'
+
+
+def scan_contracts(contracts: list, data: str) -> str:
+    """Previous implementation"""
+    call_method = ''
+    for contract in contracts:
+        try:
+            call_method = contract.get_function_by_selector(data).fn_name
+        except ValueError:
+            pass
+        if call_method:
+            break
+    return call_method
+
+
+def test_metrics_collector_selectors():
+    w3 = Web3()
+
+    started = time.perf_counter()
+    contracts = []
+    for filename in os.listdir(ABI_DIR):
+        with open(os.path.join(ABI_DIR, filename)) as f:
+            contracts.append(w3.eth.contract(abi=json.load(f)))
+    scan_startup_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = build_selectors_index(ABI_DIR)
+    index_startup_time = time.perf_counter() - started
+
+    rng = random.Random(42)
+    # Calls without arguments, scan finds nothing for longer call data
+    calls = [rng.choice(list(index) + ['0xdeadbeef']) for _ in range(CALLS_COUNT)]
+
+    started = time.perf_counter()
+    expected = [scan_contracts(contracts, data) for data in calls]
+    scan_time = (time.perf_counter() - started) / CALLS_COUNT
+
+    started = time.perf_counter()
+    result = [index.get(get_call_selector(data), '') for data in calls]
+    index_time = (time.perf_counter() - started) / CALLS_COUNT
+
+    print(f'\nFunction name of eth_call, {len(contracts)} ABIs, {len(index)} selectors, {CALLS_COUNT} calls')
+    print(f'{"":<24}{"startup, ms":>14}{"per call, us":>14}')
+    print(f'{"ABIs scan":<24}{scan_startup_time * 1e3:>14.1f}{scan_time * 1e6:>14.1f}')
+    print(f'{"selectors index":<24}{index_startup_time * 1e3:>14.1f}{index_time * 1e6:>14.2f}')
+
+    assert result == expected
@@ -0,0 +1,76 @@
+"""
+Compares scan over all slashed validators with interval index for midterm penalty prediction
+in correlated slashing scenario: thousands of validators are slashed within a few epochs,
+most of them with exit epoch shifted by the exit queue, so slashing epoch is not determined.
+
+Run: pytest tests/benchmarks/test_midterm_penalty_bound_slashings.py --run-benchmarks -s
+"""
+import os
+import random
+import time
+
+import pytest
+
+from src.constants import EPOCHS_PER_SLASHINGS_VECTOR
+from src.modules.submodules.consensus import FrameConfig
+from src.services.bunker_cases.midterm_slashing_penalty import MidtermSlashingPenalty, SlashedEpochsIndex
+from src.typings import EpochNumber, Gwei
+from tests.modules.accounting.bunker.test_bunker_medterm_penalty import simple_validators
+
+pytestmark = pytest.mark.benchmark
+
+SLASHED_COUNT = int(os.getenv('BENCHMARK_SLASHED_COUNT', 5_000))
+LIDO_SHARE = 0.3
+REF_EPOCH = EpochNumber(200_000)
+# Scan is too slow to predict penalty for all lido validators, its time is extrapolated
+SCAN_VALIDATORS_COUNT = 3
+
+
+def scan_bound_count(ref_epoch: EpochNumber, slashed_validators, midterm_penalty_epoch: EpochNumber) -> int:
+    """Bound slashings count as it was calculated before the index: with list of every possible slashing epoch"""
+    min_bound_epoch = max(0, midterm_penalty_epoch - EPOCHS_PER_SLASHINGS_VECTOR)
+    return sum(
+        any(
+            min_bound_epoch <= epoch <= midterm_penalty_epoch
+            for epoch in MidtermSlashingPenalty.get_possible_slashed_epochs(v, ref_epoch)
+        )
+        for v in slashed_validators
+    )
+
+
+def test_midterm_penalty_bound_slashings():
+    rnd = random.Random(42)
+    slashed_validators = []
+    for index in range(SLASHED_COUNT):
+        slashed_epoch = REF_EPOCH - rnd.randrange(10)
+        # Slashed validators wait in the exit queue, withdrawable epoch is set by the slashing
+        exit_epoch = REF_EPOCH + rnd.randrange(3000, 8000)
+        slashed_validators.extend(simple_validators(
+            index, index, slashed=True,
+            exit_epoch=str(exit_epoch),
+            withdrawable_epoch=str(max(slashed_epoch + EPOCHS_PER_SLASHINGS_VECTOR, exit_epoch + 256)),
+        ))
+    lido_validators = rnd.sample(slashed_validators, int(SLASHED_COUNT * LIDO_SHARE))
+    frame_config = FrameConfig(initial_epoch=0, epochs_per_frame=225, fast_lane_length_slots=0)
+    total_balance = Gwei(500_000 * 32 * 10 ** 9)
+
+    started = time.perf_counter()
+    per_frame_validators = MidtermSlashingPenalty.get_lido_validators_with_future_midterm_epoch(
+        REF_EPOCH, frame_config, lido_validators,
+    )
+    MidtermSlashingPenalty.get_future_midterm_penalty_sum_in_frames(
+        REF_EPOCH, slashed_validators, total_balance, per_frame_validators,
+    )
+    index_time = time.perf_counter() - started
+
+    midterm_epochs = [MidtermSlashingPenalty.get_midterm_penalty_epoch(v) for v in lido_validators[:SCAN_VALIDATORS_COUNT]]
+    started = time.perf_counter()
+    counts = [scan_bound_count(REF_EPOCH, slashed_validators, epoch) for epoch in midterm_epochs]
+    scan_time = (time.perf_counter() - started) / SCAN_VALIDATORS_COUNT * len(lido_validators)
+
+    print(f'\nMidterm penalties, {SLASHED_COUNT} slashed validators, {len(lido_validators)} of them lido')
+    print(f'{"scan (extrapolated), s":<28}{scan_time:>10.1f}')
+    print(f'{"interval index, s":<28}{index_time:>10.3f}')
+
+    index = SlashedEpochsIndex(REF_EPOCH, slashed_validators)
+    assert counts == [index.count_bound_with_midterm_epoch(epoch) for epoch in midterm_epochs]
@@ -0,0 +1,69 @@
+"""
+Compares per-validator predicates with batch ones on the registry scans the oracle repeats most.
+
+Run: pytest tests/benchmarks/test_validator_state_scans.py --run-benchmarks -s
+"""
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.providers.consensus.registry import ValidatorRegistry
+from src.utils.validator_state import (
+    active_validators_mask,
+    calculate_active_effective_balance_sum,
+    fully_withdrawable_validators_mask,
+    is_active_validator,
+    is_fully_withdrawable_validator,
+    is_partially_withdrawable_validator,
+    partially_withdrawable_validators_mask,
+)
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.benchmark
+
+VALIDATORS_COUNT = int(os.getenv('BENCHMARK_VALIDATORS_COUNT', 1_000_000))
+EPOCH = 200_000
+
+
+def timed(func, *args) -> tuple[object, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+SCANS = {
+    'churn limit': (
+        lambda validators: sum(is_active_validator(v, EPOCH) for v in validators),
+        lambda registry: int(np.count_nonzero(active_validators_mask(registry, EPOCH))),
+    ),
+    'sweep delay': (
+        lambda validators: sum(
+            is_partially_withdrawable_validator(v) or is_fully_withdrawable_validator(v, EPOCH) for v in validators
+        ),
+        lambda registry: int(np.count_nonzero(
+            partially_withdrawable_validators_mask(registry) | fully_withdrawable_validators_mask(registry, EPOCH)
+        )),
+    ),
+    'active balance': (
+        lambda validators: calculate_active_effective_balance_sum(validators, EPOCH),
+        lambda registry: calculate_active_effective_balance_sum(registry, EPOCH),
+    ),
+}
+
+
+def test_validator_state_scans():
+    registry = ValidatorRegistry.from_responses(validator_response(i) for i in range(VALIDATORS_COUNT))
+    validators = list(registry)
+
+    print(f'\nValidator state scans, {VALIDATORS_COUNT} validators')
+    print(f'{"scan":<16}{"per validator, ms":>20}{"batch, ms":>12}')
+
+    for name, (single, batch) in SCANS.items():
+        expected, single_time = timed(single, validators)
+        result, batch_time = timed(batch, registry)
+        print(f'{name:<16}{single_time * 1000:>20.1f}{batch_time * 1000:>12.2f}')
+
+        assert result == expected
+        assert batch_time < single_time
@@ -0,0 +1,65 @@
+"""
+Compares list of Validator dataclasses with columnar ValidatorRegistry: memory footprint and full scan time.
+
+Run: pytest tests/benchmarks/test_validators_registry_footprint.py --run-benchmarks -s
+"""
+import gc
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from src.constants import FAR_FUTURE_EPOCH
+from src.providers.consensus.registry import ValidatorRegistry
+from src.providers.consensus.typings import Validator
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.benchmark
+
+VALIDATORS_COUNT = int(os.getenv('BENCHMARK_VALIDATORS_COUNT', 200_000))
+
+
+def allocated(func, *args):
+    """Returns result of the function and size of python allocations kept by it in MiB"""
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size / 2 ** 20
+
+
+def timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def scan_list(validators: list[Validator]) -> int:
+    return sum(int(v.validator.exit_epoch) != FAR_FUTURE_EPOCH for v in validators)
+
+
+def scan_registry(registry: ValidatorRegistry) -> int:
+    return int((registry.exit_epoch != FAR_FUTURE_EPOCH).sum())
+
+
+def test_validator_registry_vs_dataclasses():
+    # Records are generated on the fly like in the streamed response, so their strings are owned by dataclasses
+    def records():
+        return (validator_response(i) for i in range(VALIDATORS_COUNT))
+
+    validators, list_size = allocated(lambda: [Validator.from_response(**r) for r in records()])
+    registry, registry_size = allocated(ValidatorRegistry.from_responses, records())
+
+    list_scan = timed(scan_list, validators)
+    registry_scan = timed(scan_registry, registry)
+
+    print(f'\nValidators registry, {VALIDATORS_COUNT} validators')
+    print(f'{"storage":<12}{"memory, MiB":>14}{"scan, ms":>12}')
+    print(f'{"dataclasses":<12}{list_size:>14.1f}{list_scan * 1000:>12.1f}')
+    print(f'{"registry":<12}{registry_size:>14.1f}{registry_scan * 1000:>12.1f}')
+
+    assert scan_list(validators) == scan_registry(registry)
+    assert registry_size < list_size
+    assert registry_scan < list_scan
@@ -0,0 +1,43 @@
+"""
+Compares getStateValidators download with loading of the on-disk validators snapshot.
+
+Run: pytest tests/benchmarks/test_validators_snapshots_load.py --run-benchmarks -s
+"""
+import json
+import os
+
+import pytest
+
+from src.providers.consensus.client import ConsensusClient
+from src.providers.consensus.snapshots import ValidatorsSnapshotStore
+from tests.benchmarks.test_validators_stream import measure
+from tests.factory.blockstamp import BlockStampFactory
+from tests.local_server import StubResponse, local_server
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.benchmark
+
+VALIDATORS_COUNT = int(os.getenv('BENCHMARK_VALIDATORS_COUNT', 200_000))
+
+
+def test_get_validators_snapshot_vs_download(tmp_path):
+    blockstamp = BlockStampFactory.build()
+    body = json.dumps({'data': [validator_response(i) for i in range(VALIDATORS_COUNT)]}).encode()
+    routes = {f'eth/v1/beacon/states/{blockstamp.state_root}/validators': lambda _: StubResponse(body=body)}
+
+    with local_server(routes) as server:
+        client = ConsensusClient(server.url)
+        download_time, download_peak = measure(client.get_validators_no_cache, blockstamp)
+
+        client.validators_snapshots = ValidatorsSnapshotStore(tmp_path, 2 ** 40)
+        client.get_validators_no_cache(blockstamp)
+        snapshot_time, snapshot_peak = measure(client.get_validators_no_cache, blockstamp)
+
+    snapshot_size = sum(file.stat().st_size for file in tmp_path.iterdir())
+    print(f'\nValidators registry, {VALIDATORS_COUNT} validators, snapshot {snapshot_size / 2 ** 20:.1f} MiB')
+    print(f'{"source":<10}{"time, s":>10}{"peak, MiB":>12}')
+    print(f'{"download":<10}{download_time:>10.3f}{download_peak:>12.1f}')
+    print(f'{"snapshot":<10}{snapshot_time:>10.3f}{snapshot_peak:>12.1f}')
+
+    assert len(server.requests) == 3
+    assert snapshot_time < download_time
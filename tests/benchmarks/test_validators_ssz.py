@@ -0,0 +1,50 @@
+"""
+Compares getStateValidators JSON response with SSZ encoded state as a source of the validators registry.
+
+Run: pytest tests/benchmarks/test_validators_ssz.py --run-benchmarks -s
+"""
+import json
+import os
+
+import pytest
+
+from src.providers.consensus.client import ConsensusClient
+from src.providers.http_provider import SSZ_CONTENT_TYPE
+from tests.benchmarks.test_validators_stream import measure
+from tests.factory.blockstamp import BlockStampFactory
+from tests.local_server import StubResponse, local_server
+from tests.providers_clients.test_consensus_client import validator_response
+from tests.providers_clients.test_consensus_client_ssz import encode_state
+
+pytestmark = pytest.mark.benchmark
+
+VALIDATORS_COUNT = int(os.getenv('BENCHMARK_VALIDATORS_COUNT', 200_000))
+
+
+def test_get_validators_ssz_vs_json():
+    blockstamp = BlockStampFactory.build()
+    records = [validator_response(i) for i in range(VALIDATORS_COUNT)]
+    json_body = json.dumps({'execution_optimistic': False, 'data': records}).encode()
+    ssz_body = encode_state(records)
+
+    routes = {
+        f'eth/v1/beacon/states/{blockstamp.state_root}/validators': lambda _: StubResponse(body=json_body),
+        f'eth/v2/debug/beacon/states/{blockstamp.state_root}': lambda _: StubResponse(
+            body=ssz_body, headers={'Content-Type': SSZ_CONTENT_TYPE},
+        ),
+    }
+
+    with local_server(routes) as server:
+        client = ConsensusClient(server.url)
+
+        json_time, json_peak = measure(client.get_validators_no_cache, blockstamp)
+        ssz_time, ssz_peak = measure(client.get_validators_ssz, blockstamp)
+
+        assert list(client.get_validators_ssz(blockstamp)[:100]) == list(client.get_validators_no_cache(blockstamp)[:100])
+
+    print(f'\nValidators registry, {VALIDATORS_COUNT} validators')
+    print(f'{"mode":<8}{"body, MiB":>12}{"time, s":>10}{"peak, MiB":>12}')
+    print(f'{"json":<8}{len(json_body) / 2 ** 20:>12.1f}{json_time:>10.2f}{json_peak:>12.1f}')
+    print(f'{"ssz":<8}{len(ssz_body) / 2 ** 20:>12.1f}{ssz_time:>10.2f}{ssz_peak:>12.1f}')
+
+    assert ssz_time < json_time
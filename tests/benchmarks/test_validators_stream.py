@@ -0,0 +1,68 @@
+"""
+Compares full-body JSON decoding of getStateValidators response with streaming decoding.
+
+Run: pytest tests/benchmarks/test_validators_stream.py --run-benchmarks
+"""
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from src.providers.consensus.client import ConsensusClient
+from src.providers.consensus.typings import Validator
+from tests.factory.blockstamp import BlockStampFactory
+from tests.local_server import StubResponse, local_server
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.benchmark
+
+VALIDATORS_COUNT = int(os.getenv('BENCHMARK_VALIDATORS_COUNT', 200_000))
+
+
+def get_validators_full_body(client: ConsensusClient, blockstamp) -> list[Validator]:
+    """Previous implementation: whole response is decoded by response.json() and then converted"""
+    data, _ = client._get(client.API_GET_VALIDATORS, (blockstamp.state_root,))  # pylint: disable=protected-access
+    return [Validator.from_response(**v) for v in data]
+
+
+def measure(func, *args) -> tuple[float, float]:
+    """Returns wall time in seconds and peak of python allocations in MiB"""
+    gc.collect()
+    started = time.perf_counter()
+    func(*args)
+    duration = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return duration, peak / 2 ** 20
+
+
+def test_get_validators_streaming_vs_full_body():
+    blockstamp = BlockStampFactory.build()
+    body = json.dumps({
+        'execution_optimistic': False,
+        'finalized': True,
+        'data': [validator_response(i) for i in range(VALIDATORS_COUNT)],
+    }).encode()
+
+    routes = {f'eth/v1/beacon/states/{blockstamp.state_root}/validators': lambda _: StubResponse(body=body)}
+
+    with local_server(routes) as server:
+        client = ConsensusClient(server.url)
+
+        full_time, full_peak = measure(get_validators_full_body, client, blockstamp)
+        stream_time, stream_peak = measure(client.get_validators_no_cache, blockstamp)
+
+    print(f'\ngetStateValidators, {VALIDATORS_COUNT} validators, {len(body) / 2 ** 20:.1f} MiB body')
+    print(f'{"mode":<12}{"time, s":>10}{"peak, MiB":>12}')
+    print(f'{"full body":<12}{full_time:>10.2f}{full_peak:>12.1f}')
+    print(f'{"streaming":<12}{stream_time:>10.2f}{stream_peak:>12.1f}')
+
+    assert stream_peak < full_peak
@@ -8,7 +8,7 @@ from web3.types import Timestamp
 import src.variables
 from src.variables import CONSENSUS_CLIENT_URI, EXECUTION_CLIENT_URI, KEYS_API_URI
 from src.typings import BlockStamp, SlotNumber, BlockNumber, EpochNumber, ReferenceBlockStamp
-from src.web3py.extensions import LidoContracts, TransactionUtils, LidoValidatorsProvider
+from src.web3py.extensions import LidoContracts, TransactionUtils, LidoValidatorsProvider, ValidatorSetStatsProvider
 from src.web3py.typings import Web3
 
 from src.web3py.contract_tweak import tweak_w3_contracts
@@ -30,6 +30,22 @@ def pytest_addoption(parser):
         help="Update responses from web3 providers. "
              "New responses will be added to the files, unused responses will be removed.",
     )
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run tests marked as benchmark. They are skipped by default because they take a while.",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="Benchmarks run only with --run-benchmarks flag.")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
 
 
 @pytest.fixture()
@@ -60,10 +76,13 @@ def provider(request, responses_path) -> UpdateResponsesProvider | ResponseFromF
 
 
 @pytest.fixture()
-def web3(provider) -> Web3:
+def web3(provider, monkeypatch) -> Web3:
+    # Responses are recorded with contract calls sent one by one
+    monkeypatch.setattr(src.variables, 'MULTICALL3_ADDRESS', '')
     web3 = Web3(provider)
     tweak_w3_contracts(web3)
     web3.middleware_onion.add(construct_simple_cache_middleware())
+    web3.attach_modules({'validator_set_stats': ValidatorSetStatsProvider})
 
     with provider.use_mock(Path('common/chainId.json')):
         _ = web3.eth.chain_id
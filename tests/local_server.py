@@ -0,0 +1,97 @@
+"""Local stand-in HTTP server for tests that need real sockets."""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterable, Iterator
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes
+
+
+@dataclass
+class StubResponse:
+    status: int = 200
+    # Bytes are sent with Content-Length, iterable of bytes is sent chunk by chunk until connection is closed
+    body: bytes | Iterable[bytes] = b''
+    headers: dict[str, str] = field(default_factory=dict)
+    delay: float = 0
+
+    @classmethod
+    def json(cls, data: Any, status: int = 200, delay: float = 0) -> 'StubResponse':
+        return cls(status, json.dumps(data).encode(), {'Content-Type': 'application/json'}, delay)
+
+
+Route = Callable[[StubRequest], StubResponse]
+
+
+@dataclass
+class LocalServer:
+    url: str
+    requests: list[StubRequest]
+
+
+@contextmanager
+def local_server(routes: dict[str, Route]) -> Iterator[LocalServer]:
+    """
+    Runs HTTP server in a background thread and yields its address with log of received requests.
+    Requests are dispatched by path (without query string and leading slash), unknown paths get 404.
+    """
+    requests_log: list[StubRequest] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def _handle(self):
+            url = urlparse(self.path)
+            length = int(self.headers.get('Content-Length') or 0)
+            request = StubRequest(
+                method=self.command,
+                path=url.path,
+                query=parse_qs(url.query),
+                headers=dict(self.headers),
+                body=self.rfile.read(length) if length else b'',
+            )
+            requests_log.append(request)
+
+            route = routes.get(url.path.lstrip('/'))
+            response = route(request) if route else StubResponse(404, b'{"message": "Not found"}')
+
+            if response.delay:
+                time.sleep(response.delay)
+
+            self.send_response(response.status)
+            for key, value in response.headers.items():
+                self.send_header(key, value)
+
+            if isinstance(response.body, bytes):
+                self.send_header('Content-Length', str(len(response.body)))
+                self.end_headers()
+                self.wfile.write(response.body)
+                return
+
+            self.end_headers()
+            for chunk in response.body:
+                self.wfile.write(chunk)
+
+        do_GET = _handle
+        do_POST = _handle
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield LocalServer(f'http://127.0.0.1:{server.server_address[1]}', requests_log)
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -3,7 +3,7 @@ from unittest.mock import Mock
 import pytest
 
 from src.modules.submodules.typings import ChainConfig
-from src.providers.consensus.typings import Validator, ValidatorStatus, ValidatorState
+from src.providers.consensus.typings import Validator, ValidatorBalance, ValidatorStatus, ValidatorState
 from src.services.bunker import BunkerService
 from src.providers.keys.typings import LidoKey
 from src.services.bunker_cases.abnormal_cl_rebase import AbnormalClRebase
@@ -19,23 +19,27 @@ def simple_blockstamp(block_number: int) -> BlockStamp:
     return BlockStamp(f"0x{block_number}", block_number, '', block_number, 0)
 
 
+def simple_pubkey(pubkey: str) -> str:
+    return '0x' + pubkey[2:].rjust(96, '0')
+
+
 def simple_key(pubkey: str) -> LidoKey:
     key = object.__new__(LidoKey)
-    key.key = pubkey
+    key.key = simple_pubkey(pubkey)
     return key
 
 
-def simple_validator(index, pubkey, balance, slashed=False, withdrawable_epoch='') -> Validator:
+def simple_validator(index, pubkey, balance, slashed=False, withdrawable_epoch='100756') -> Validator:
     return Validator(
         index=str(index),
         balance=str(balance),
         status=ValidatorStatus.ACTIVE_ONGOING,
         validator=ValidatorState(
-            pubkey=pubkey,
-            withdrawal_credentials='',
+            pubkey=simple_pubkey(pubkey),
+            withdrawal_credentials='0x' + '00' * 32,
             effective_balance=str(32 * 10 ** 9),
             slashed=slashed,
-            activation_eligibility_epoch='',
+            activation_eligibility_epoch='0',
             activation_epoch='0',
             exit_epoch='100500',
             withdrawable_epoch=withdrawable_epoch,
@@ -203,7 +207,14 @@ def mock_get_validators(web3):
         }
         return validators[state.slot_number]
 
+    def _get_validators_balances(state: BlockStamp, indices):
+        return [
+            ValidatorBalance(index=v.index, balance=v.balance)
+            for v in _get_validators(state) if int(v.index) in indices
+        ]
+
     web3.cc.get_validators_no_cache = Mock(side_effect=_get_validators)
+    web3.cc.get_validators_balances = Mock(side_effect=_get_validators_balances)
 
 
 @pytest.fixture
@@ -1,7 +1,9 @@
+from unittest.mock import Mock
+
 import pytest
 
 from src.constants import FAR_FUTURE_EPOCH
-from src.providers.consensus.typings import Validator, ValidatorStatus, ValidatorState
+from src.providers.consensus.typings import Validator, ValidatorBalance, ValidatorStatus, ValidatorState
 from src.services.bunker_cases.abnormal_cl_rebase import AbnormalClRebase
 from src.services.bunker_cases.typings import BunkerConfig
 from tests.modules.accounting.bunker.conftest import simple_ref_blockstamp, simple_key, simple_blockstamp
@@ -17,11 +19,11 @@ def simple_validators(
             balance=balance,
             status=ValidatorStatus.ACTIVE_ONGOING,
             validator=ValidatorState(
-                pubkey=f"0x{index}",
-                withdrawal_credentials='',
+                pubkey=f"0x{index:096x}",
+                withdrawal_credentials='0x' + '00' * 32,
                 effective_balance=effective_balance,
                 slashed=False,
-                activation_eligibility_epoch='',
+                activation_eligibility_epoch='0',
                 activation_epoch='0',
                 exit_epoch=FAR_FUTURE_EPOCH,
                 withdrawable_epoch=FAR_FUTURE_EPOCH,
@@ -184,11 +186,8 @@ def test_get_nearest_and_distant_blockstamps(
     [
         (simple_ref_blockstamp(0), simple_ref_blockstamp(10), 100),
         (simple_ref_blockstamp(10), simple_ref_blockstamp(20), -32000100800),
-        (
-                simple_ref_blockstamp(20),
-                simple_ref_blockstamp(30),
-            "Validators count diff should be positive or 0. Something went wrong with CL API"
-        ),
+        # Validator 5 is not in the previous state yet, it is accounted by validators count diff
+        (simple_ref_blockstamp(30), simple_ref_blockstamp(40), 64001157445),
     ]
 )
 def test_calculate_cl_rebase_between_blocks(
@@ -212,6 +211,33 @@ def test_calculate_cl_rebase_between_blocks(
     else:
         result = abnormal_case._calculate_cl_rebase_between_blocks(prev_blockstamp, blockstamp)
         assert result == expected_rebase
+        abnormal_case.w3.cc.get_validators_balances.assert_called_once_with(prev_blockstamp, [3, 4, 5])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "prev_indices",
+    [
+        [2, 3, 4, 5],
+        [3, 4, 4, 5],
+    ]
+)
+def test_calculate_cl_rebase_between_blocks_with_not_requested_validators(
+    abnormal_case,
+    mock_get_eth_distributed_events,
+    mock_get_withdrawal_vault_balance,
+    prev_indices,
+):
+    prev_blockstamp = simple_ref_blockstamp(10)
+    blockstamp = simple_ref_blockstamp(20)
+    abnormal_case.lido_validators = abnormal_case.w3.cc.get_validators(blockstamp)[3:6]
+    prev_validators = {int(v.index): v for v in abnormal_case.w3.cc.get_validators(prev_blockstamp)}
+    abnormal_case.w3.cc.get_validators_balances = Mock(
+        return_value=[ValidatorBalance(index=str(i), balance=prev_validators[i].balance) for i in prev_indices]
+    )
+
+    with pytest.raises(ValueError, match="Response contains validators that were not requested"):
+        abnormal_case._calculate_cl_rebase_between_blocks(prev_blockstamp, blockstamp)
 
 
 @pytest.mark.unit
@@ -1,10 +1,16 @@
+import random
+
 import pytest
 
+from src.constants import EPOCHS_PER_SLASHINGS_VECTOR
 from src.modules.submodules.consensus import FrameConfig
 from src.modules.submodules.typings import ChainConfig
+from src.providers.consensus.registry import ValidatorRegistry
 from src.providers.consensus.typings import Validator, ValidatorStatus, ValidatorState
-from src.services.bunker_cases.midterm_slashing_penalty import MidtermSlashingPenalty
+from src.services.bunker_cases.midterm_slashing_penalty import MidtermSlashingPenalty, SlashedEpochsIndex
 from src.typings import EpochNumber, ReferenceBlockStamp
+from src.web3py.extensions.validator_set_stats import ValidatorSetStats
+from tests.providers_clients.test_consensus_client import validator_response
 
 
 def simple_blockstamp(block_number: int,) -> ReferenceBlockStamp:
@@ -23,11 +29,11 @@ def simple_validators(
             balance=str(32 * 10 ** 9),
             status=ValidatorStatus.ACTIVE_ONGOING,
             validator=ValidatorState(
-                pubkey=f"0x{index}",
-                withdrawal_credentials='',
+                pubkey=f"0x{index:096x}",
+                withdrawal_credentials='0x' + '00' * 32,
                 effective_balance=str(32 * 10 ** 9),
                 slashed=slashed,
-                activation_eligibility_epoch='',
+                activation_eligibility_epoch='0',
                 activation_epoch='0',
                 exit_epoch=exit_epoch,
                 withdrawable_epoch=withdrawable_epoch,
@@ -132,8 +138,10 @@ def test_is_high_midterm_slashing_penalty(
         fast_lane_length_slots=0,
     )
 
+    validator_set_stats = ValidatorSetStats.from_validators(all_validators, blockstamp.ref_epoch)
+
     result = MidtermSlashingPenalty.is_high_midterm_slashing_penalty(
-        blockstamp, frame_config, chain_config, all_validators, lido_validators, report_cl_rebase, 0
+        blockstamp, frame_config, chain_config, validator_set_stats, lido_validators, report_cl_rebase, 0
     )
     assert result == expected_result
 
@@ -338,7 +346,7 @@ def test_predict_midterm_penalty_in_frame(
 ):
 
     result = MidtermSlashingPenalty.predict_midterm_penalty_in_frame(
-        EpochNumber(ref_epoch), all_slashed_validators, total_balance, validators_in_frame
+        SlashedEpochsIndex(EpochNumber(ref_epoch), all_slashed_validators), total_balance, validators_in_frame
     )
 
     assert result == expected_result
@@ -398,33 +406,74 @@ def test_get_bound_with_midterm_epoch_slashed_validators(
     assert result == expected_bounded
 
 
+def random_slashed_validators(rnd: random.Random, count: int) -> list[Validator]:
+    validators = []
+    for index in range(count):
+        withdrawable_epoch = rnd.randrange(8192, 30000)
+        # Determined slashing epoch or exit epoch shifted by the exit queue
+        exit_epoch = withdrawable_epoch - rnd.choice([8192, rnd.randrange(256, 300)])
+        validators.extend(simple_validators(
+            index, index, slashed=True, exit_epoch=str(exit_epoch), withdrawable_epoch=str(withdrawable_epoch),
+        ))
+    return validators
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(20))
+def test_slashed_epochs_index_matches_scan(seed):
+    rnd = random.Random(seed)
+    ref_epoch = EpochNumber(rnd.randrange(0, 25000))
+    slashed_validators = random_slashed_validators(rnd, rnd.randrange(0, 50))
+    index = SlashedEpochsIndex(ref_epoch, slashed_validators)
+
+    # Bound epochs range starting or ending right at the edges of possible slashing epochs ranges
+    edges = [
+        edge + shift
+        for first, last in map(
+            lambda v: MidtermSlashingPenalty.get_possible_slashed_epochs_range(v, ref_epoch), slashed_validators,
+        )
+        for edge in (first, last + EPOCHS_PER_SLASHINGS_VECTOR)
+        for shift in (-1, 0, 1)
+    ]
+    midterm_epochs = [rnd.randrange(0, 30000) for _ in range(50)] + [edge for edge in edges if edge >= 0]
+
+    for epoch in midterm_epochs:
+        midterm_penalty_epoch = EpochNumber(epoch)
+        bound = [
+            v for v in slashed_validators
+            if any(
+                MidtermSlashingPenalty.get_min_bound_epoch(midterm_penalty_epoch) <= epoch <= midterm_penalty_epoch
+                for epoch in MidtermSlashingPenalty.get_possible_slashed_epochs(v, ref_epoch)
+            )
+        ]
+        assert MidtermSlashingPenalty.get_bound_with_midterm_epoch_slashed_validators(
+            ref_epoch, slashed_validators, midterm_penalty_epoch,
+        ) == bound
+        assert index.count_bound_with_midterm_epoch(midterm_penalty_epoch) == len(bound)
+
+
 @pytest.mark.unit
 @pytest.mark.parametrize(
-    ("lido_validators", "ref_epoch", "expected_len"),
+    ("slashed", "ref_epoch", "expected_len"),
     [
-        (
-            # no one slashed
-            simple_validators(0, 9),
-            EpochNumber(20000000),
-            0
-        ),
-        (
-            # slashed and withdrawable epoch greater than ref_epoch
-            simple_validators(0, 9, slashed=True),
-            EpochNumber(0),
-            10
-        ),
-        (
-            # slashed and withdrawable epoch less than ref_epoch
-            simple_validators(0, 9, slashed=True),
-            EpochNumber(20000000),
-            0
-        )
+        # no one slashed
+        (False, EpochNumber(0), 0),
+        # slashed and withdrawable epoch greater than ref_epoch
+        (True, EpochNumber(8191), 3),
+        # slashed and withdrawable epoch equal or less than ref_epoch
+        (True, EpochNumber(8192), 0),
     ]
 )
-def test_get_slashed_validators_with_impact_to_midterm_penalties(lido_validators, ref_epoch, expected_len):
-    result = MidtermSlashingPenalty.get_slashed_validators_with_impact_on_midterm_penalties(lido_validators, ref_epoch)
+def test_slashed_validators_with_impact_to_midterm_penalties(slashed, ref_epoch, expected_len):
+    responses = [validator_response(i) for i in range(10)]
+    for response in responses[2:5]:
+        response['validator'].update(slashed=slashed, withdrawable_epoch='8192')
+    registry = ValidatorRegistry.from_responses(responses)
+
+    result = ValidatorSetStats.from_validators(registry, ref_epoch).slashed_with_midterm_impact
+
     assert len(result) == expected_len
+    assert all(v.validator.slashed and int(v.validator.withdrawable_epoch) > ref_epoch for v in result)
 
 
 @pytest.mark.unit
@@ -250,6 +250,24 @@ def test_get_last_finalized_withdrawal_request_slot_no_requests(subject):
 
     assert subject._get_last_finalized_withdrawal_request_slot() == 0
 
+@pytest.mark.parametrize(("slashed", "expected"), [(False, False), (True, True)])
+def test_slashings_in_frame(chain_config, frame_config, past_blockstamp, monkeypatch, slashed, expected):
+    subject = object.__new__(SafeBorder)
+    subject.w3 = Mock()
+    subject.blockstamp = past_blockstamp
+    subject.chain_config = chain_config
+    subject.frame_config = frame_config
+
+    frame_blockstamp = ReferenceBlockStampFactory.build()
+    monkeypatch.setattr('src.services.safe_border.get_blockstamp', Mock(return_value=frame_blockstamp))
+    subject.w3.cc.get_validators_by_indices = Mock(
+        return_value=[create_validator_stub(100, 105), create_validator_stub(100, 105, slashed)]
+    )
+
+    assert subject._slashings_in_frame(3, [5, 7]) == expected
+    subject.w3.cc.get_validators_by_indices.assert_called_once_with(frame_blockstamp, [5, 7])
+
+
 def create_validator_stub(exit_epoch, withdrawable_epoch, slashed = False):
     return create_validator(create_validator_state(exit_epoch, withdrawable_epoch, slashed))
 
@@ -1,4 +1,5 @@
-from typing import Iterable, cast
+import random
+from typing import cast
 from unittest.mock import Mock
 
 import pytest
@@ -9,7 +10,8 @@ from src.modules.ejector.ejector import Ejector, EjectorProcessingState
 from src.modules.ejector.ejector import logger as ejector_logger
 from src.modules.submodules.oracle_module import ModuleExecuteDelay
 from src.modules.submodules.typings import ChainConfig
-from src.typings import BlockStamp, ReferenceBlockStamp
+from src.typings import BlockStamp, EpochNumber, ReferenceBlockStamp
+from src.utils.validator_state import is_fully_withdrawable_validator
 from src.web3py.extensions.contracts import LidoContracts
 from src.web3py.extensions.lido_validators import NodeOperatorId, StakingModuleId
 from src.web3py.typings import Web3
@@ -218,34 +220,63 @@ def test_get_predicted_withdrawable_epoch(ejector: Ejector) -> None:
     assert result == 3824, "Unexpected predicted withdrawable epoch"
 
 
+def build_lido_validator(balance: int, withdrawable_epoch: int, withdrawal_credentials: str = '0x01'):
+    validator = LidoValidatorFactory.build(balance=str(balance))
+    validator.validator.withdrawable_epoch = str(withdrawable_epoch)
+    validator.validator.withdrawal_credentials = withdrawal_credentials + '00' * 31
+    return validator
+
+
 @pytest.mark.unit
 @pytest.mark.usefixtures("consensus_client", "lido_validators")
 def test_get_withdrawable_lido_validators(
     ejector: Ejector,
     ref_blockstamp: ReferenceBlockStamp,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     ejector.w3.lido_validators.get_lido_validators = Mock(
         return_value=[
-            LidoValidatorFactory.build(balance="0"),
-            LidoValidatorFactory.build(balance="0"),
-            LidoValidatorFactory.build(balance="31"),
-            LidoValidatorFactory.build(balance="42"),
+            build_lido_validator(balance=0, withdrawable_epoch=0),
+            build_lido_validator(balance=31, withdrawable_epoch=FAR_FUTURE_EPOCH),
+            build_lido_validator(balance=42, withdrawable_epoch=42),
+            build_lido_validator(balance=50, withdrawable_epoch=43),
+            build_lido_validator(balance=60, withdrawable_epoch=10, withdrawal_credentials='0x00'),
         ]
     )
 
-    with monkeypatch.context() as m:
-        m.setattr(
-            ejector_module,
-            "is_fully_withdrawable_validator",
-            Mock(side_effect=lambda v, _: int(v.balance) > 32),
-        )
+    result = ejector._get_withdrawable_lido_validators_balance(ref_blockstamp, 42)
+    assert result == 42 * 10**9, "Unexpected withdrawable amount"
 
-        result = ejector._get_withdrawable_lido_validators_balance(ref_blockstamp, 42)
-        assert result == 42 * 10**9, "Unexpected withdrawable amount"
+    assert ejector._get_withdrawable_lido_validators_balance(ref_blockstamp, 41) == 0
+    assert ejector._get_withdrawable_lido_validators_balance(ref_blockstamp, 100) == 92 * 10**9
+    ejector.w3.lido_validators.get_lido_validators.assert_called_once()
 
-        ejector._get_withdrawable_lido_validators_balance(ref_blockstamp, 42)
-        ejector.w3.lido_validators.get_lido_validators.assert_called_once()
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("consensus_client", "lido_validators")
+@pytest.mark.parametrize("seed", range(10))
+def test_get_withdrawable_lido_validators_matches_scan(
+    ejector: Ejector,
+    ref_blockstamp: ReferenceBlockStamp,
+    seed: int,
+) -> None:
+    rnd = random.Random(seed)
+    validators = [
+        build_lido_validator(
+            balance=rnd.choice([0, rnd.randrange(1, 2 * MAX_EFFECTIVE_BALANCE)]),
+            withdrawable_epoch=rnd.choice([FAR_FUTURE_EPOCH, rnd.randrange(100)]),
+            withdrawal_credentials=rnd.choice(['0x00', '0x01']),
+        )
+        for _ in range(200)
+    ]
+    ejector.w3.lido_validators.get_lido_validators = Mock(return_value=validators)
+
+    for epoch in range(101):
+        expected = sum(
+            ejector._get_predicted_withdrawable_balance(v)
+            for v in validators
+            if is_fully_withdrawable_validator(v, EpochNumber(epoch))
+        )
+        assert ejector._get_withdrawable_lido_validators_balance(ref_blockstamp, EpochNumber(epoch)) == expected
 
 
 @pytest.mark.unit
@@ -263,48 +294,28 @@ def test_get_predicted_withdrawable_balance(ejector: Ejector) -> None:
     assert result == MAX_EFFECTIVE_BALANCE * 10**9, "Expect MAX_EFFECTIVE_BALANCE"
 
 
+def mock_validator_set_stats(ejector: Ejector, **stats) -> None:
+    ejector.w3.validator_set_stats.get_validator_set_stats = Mock(return_value=Mock(**stats))
+
+
 @pytest.mark.unit
-@pytest.mark.usefixtures("consensus_client")
 def test_get_sweep_delay_in_epochs(
     ejector: Ejector,
     ref_blockstamp: ReferenceBlockStamp,
     chain_config: ChainConfig,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    ejector.w3.cc.get_validators = Mock(return_value=LidoValidatorFactory.batch(1024))
     ejector.get_chain_config = Mock(return_value=chain_config)
 
-    with monkeypatch.context() as m:
-        m.setattr(
-            ejector_module,
-            "is_partially_withdrawable_validator",
-            Mock(return_value=False),
-        )
-        m.setattr(
-            ejector_module,
-            "is_fully_withdrawable_validator",
-            Mock(return_value=False),
-        )
-
-        # no validators at all
-        result = ejector._get_sweep_delay_in_epochs(ref_blockstamp)
-        assert result == 0, "Unexpected sweep delay in epochs"
+    # no withdrawable validators at all
+    mock_validator_set_stats(ejector, withdrawable_validators_count=0)
+    result = ejector._get_sweep_delay_in_epochs(ref_blockstamp)
+    assert result == 0, "Unexpected sweep delay in epochs"
 
-    with monkeypatch.context() as m:
-        m.setattr(
-            ejector_module,
-            "is_partially_withdrawable_validator",
-            Mock(return_value=False),
-        )
-        m.setattr(
-            ejector_module,
-            "is_fully_withdrawable_validator",
-            Mock(return_value=True),
-        )
-
-        # all 1024 validators
-        result = ejector._get_sweep_delay_in_epochs(ref_blockstamp)
-        assert result == 1, "Unexpected sweep delay in epochs"
+    # 1024 withdrawable validators
+    mock_validator_set_stats(ejector, withdrawable_validators_count=1024)
+    result = ejector._get_sweep_delay_in_epochs(ref_blockstamp)
+    assert result == 1, "Unexpected sweep delay in epochs"
+    ejector.w3.validator_set_stats.get_validator_set_stats.assert_called_once_with(ref_blockstamp)
 
 
 @pytest.mark.unit
@@ -331,30 +342,18 @@ def test_get_total_balance(ejector: Ejector, blockstamp: BlockStamp) -> None:
 class TestChurnLimit:
     """_get_churn_limit tests"""
 
-    @pytest.fixture(autouse=True)
-    def mock_is_active_validator(self, monkeypatch: pytest.MonkeyPatch) -> Iterable:
-        with monkeypatch.context() as m:
-            m.setattr(
-                ejector_module,
-                "is_active_validator",
-                Mock(side_effect=lambda v, _: bool(v)),
-            )
-            yield
-
     @pytest.mark.unit
-    @pytest.mark.usefixtures("consensus_client")
     def test_get_churn_limit_no_validators(
         self, ejector: Ejector, ref_blockstamp: ReferenceBlockStamp
     ) -> None:
-        ejector.w3.cc.get_validators = Mock(return_value=[])
+        mock_validator_set_stats(ejector, active_validators_count=0)
         result = ejector._get_churn_limit(ref_blockstamp)
         assert (
             result == ejector_module.MIN_PER_EPOCH_CHURN_LIMIT
         ), "Unexpected churn limit"
-        ejector.w3.cc.get_validators.assert_called_once_with(ref_blockstamp)
+        ejector.w3.validator_set_stats.get_validator_set_stats.assert_called_once_with(ref_blockstamp)
 
     @pytest.mark.unit
-    @pytest.mark.usefixtures("consensus_client")
     def test_get_churn_limit_validators_less_than_min_churn(
         self,
         ejector: Ejector,
@@ -362,15 +361,13 @@ class TestChurnLimit:
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         with monkeypatch.context() as m:
-            ejector.w3.cc.get_validators = Mock(return_value=[1, 1, 0])
+            mock_validator_set_stats(ejector, active_validators_count=2)
             m.setattr(ejector_module, "MIN_PER_EPOCH_CHURN_LIMIT", 4)
             m.setattr(ejector_module, "CHURN_LIMIT_QUOTIENT", 1)
             result = ejector._get_churn_limit(ref_blockstamp)
             assert result == 4, "Unexpected churn limit"
-            ejector.w3.cc.get_validators.assert_called_once_with(ref_blockstamp)
 
     @pytest.mark.unit
-    @pytest.mark.usefixtures("consensus_client")
     def test_get_churn_limit_basic(
         self,
         ejector: Ejector,
@@ -378,13 +375,11 @@ class TestChurnLimit:
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         with monkeypatch.context() as m:
-            ejector.w3.cc.get_validators = Mock(return_value=[1] * 99)
+            mock_validator_set_stats(ejector, active_validators_count=99)
             m.setattr(ejector_module, "MIN_PER_EPOCH_CHURN_LIMIT", 0)
             m.setattr(ejector_module, "CHURN_LIMIT_QUOTIENT", 2)
             result = ejector._get_churn_limit(ref_blockstamp)
             assert result == 49, "Unexpected churn limit"
-            ejector._get_churn_limit(ref_blockstamp)
-            ejector.w3.cc.get_validators.assert_called_once_with(ref_blockstamp)
 
 
 @pytest.mark.unit
@@ -396,20 +391,9 @@ def test_get_processing_state(ejector: Ejector, blockstamp: BlockStamp) -> None:
 
 
 @pytest.mark.unit
-@pytest.mark.usefixtures("consensus_client")
-def test_get_latest_exit_epoch(ejector: Ejector, blockstamp: BlockStamp) -> None:
-    ejector.w3.cc.get_validators = Mock(
-        return_value=[
-            Mock(validator=Mock(exit_epoch=FAR_FUTURE_EPOCH)),
-            Mock(validator=Mock(exit_epoch=42)),
-            Mock(validator=Mock(exit_epoch=42)),
-            Mock(validator=Mock(exit_epoch=1)),
-        ]
-    )
+def test_get_latest_exit_epoch(ejector: Ejector, ref_blockstamp: ReferenceBlockStamp) -> None:
+    mock_validator_set_stats(ejector, max_exit_epoch=42, max_exit_epoch_validators_count=2)
 
-    (max_epoch, count) = ejector._get_latest_exit_epoch(blockstamp)
+    (max_epoch, count) = ejector._get_latest_exit_epoch(ref_blockstamp)
     assert count == 2, "Unexpected count of exiting validators"
     assert max_epoch == 42, "Unexpected max epoch"
-
-    ejector._get_latest_exit_epoch(blockstamp)
-    ejector.w3.cc.get_validators.assert_called_once_with(blockstamp)
@@ -1,3 +1,7 @@
+import contextlib
+import copy
+import random
+
 import pytest
 
 from src.providers.consensus.typings import ValidatorState
@@ -125,3 +129,82 @@ def test_decrease_node_operator_stats():
             validator_exit.lido_node_operator_stats[
                 (StakingModuleId(4), NodeOperatorId(2))] == expected_after_decrease_second
     )
+
+
+def build_random_exit_order(rnd: random.Random, validators_count: int) -> tuple[ExitOrderIterator, list[LidoValidator]]:
+    ref_epoch = 10000
+    operators = [
+        (StakingModuleId(module), NodeOperatorId(operator))
+        for module in range(rnd.randint(1, 3))
+        for operator in range(rnd.randint(1, 8))
+    ]
+
+    validators = []
+    for index in rnd.sample(range(validators_count * 10), validators_count):
+        module, operator = rnd.choice(operators)
+        validator = object.__new__(LidoValidator)
+        validator.lido_id = object.__new__(LidoKey)
+        validator.validator = object.__new__(ValidatorState)
+        validator.lido_id.moduleAddress = f'0x{module}'
+        validator.lido_id.operatorIndex = operator
+        validator.index = str(index)
+        validator.validator.activation_epoch = str(rnd.randint(0, ref_epoch))
+        validators.append(validator)
+
+    stats = {}
+    for operator in operators:
+        count = sum(1 for v in validators if (int(v.lido_id.moduleAddress, 16), v.lido_id.operatorIndex) == operator)
+        count += rnd.randint(0, 5)
+        stats[operator] = NodeOperatorPredictableState(
+            predictable_validators_total_age=count * rnd.randint(0, ref_epoch),
+            predictable_validators_count=count,
+            targeted_validators_limit_is_enabled=rnd.random() < 0.3,
+            targeted_validators_limit_count=rnd.randint(0, count),
+            # Few distinct values to get ties by the first predicate
+            delayed_validators_count=rnd.choice([0, 0, 0, 1, 2]),
+        )
+
+    iterator = object.__new__(ExitOrderIterator)
+    iterator.blockstamp = ReferenceBlockStampFactory.build(ref_epoch=ref_epoch)
+    iterator.staking_module_id = {f'0x{module}': StakingModuleId(module) for module, _ in operators}
+    iterator.lido_node_operator_stats = stats
+    iterator.total_predictable_validators_count = sum(s.predictable_validators_count for s in stats.values()) + rnd.randint(1, 50)
+    # Threshold near the operators shares, so they exceed it while validators leave the queue
+    iterator.operator_network_penetration_threshold = rnd.uniform(0.5, 1.5) / len(operators)
+    iterator.max_validators_to_exit = rnd.randint(1, validators_count + 1)
+    iterator.left_queue_count = 0
+    return iterator, validators
+
+
+def brute_force_exit_order(iterator: ExitOrderIterator, validators: list[LidoValidator]) -> list[LidoValidator]:
+    """Reference implementation: resort the whole queue before each pop"""
+    validators = list(validators)
+    result = []
+    while validators and len(result) < iterator.max_validators_to_exit:
+        validators.sort(key=iterator._predicates)
+        to_exit = validators.pop(0)
+        iterator._decrease_node_operator_stats(to_exit)
+        result.append(to_exit)
+    return result
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('seed', range(100))
+def test_exit_order_matches_full_resort(seed):
+    rnd = random.Random(seed)
+    iterator, validators = build_random_exit_order(rnd, rnd.randint(0, 150))
+    reference = copy.deepcopy(iterator)
+
+    # Skip __iter__, it collects state from the chain
+    iterator._prepare_queue(validators)
+    result = []
+    with contextlib.suppress(StopIteration):
+        while True:
+            result.append(next(iterator))
+
+    expected = brute_force_exit_order(reference, validators)
+    assert [v.index for _, v in result] == [v.index for v in expected]
+    assert all(
+        operator == ExitOrderIterator.operator_index_by_validator(iterator.staking_module_id, v) for operator, v in result
+    )
+    assert iterator.lido_node_operator_stats == reference.lido_node_operator_stats
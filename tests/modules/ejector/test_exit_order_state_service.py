@@ -27,11 +27,11 @@ def simple_validators(
             balance=str(32 * 10 ** 9),
             status=ValidatorStatus.ACTIVE_ONGOING,
             validator=ValidatorState(
-                pubkey=f"0x{index}",
-                withdrawal_credentials='',
+                pubkey=f"0x{index:096x}",
+                withdrawal_credentials='0x' + '00' * 32,
                 effective_balance=str(32 * 10 ** 9),
                 slashed=slashed,
-                activation_eligibility_epoch='',
+                activation_eligibility_epoch='0',
                 activation_epoch=str(activation_epoch),
                 exit_epoch=exit_epoch,
                 withdrawable_epoch=exit_epoch,
@@ -2,7 +2,7 @@ import json
 import os
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional, Sequence
+from typing import Any, Iterator, Optional, Sequence
 
 from web3 import Web3
 from web3.module import Module
@@ -13,6 +13,7 @@ from web3_multi_provider import MultiProvider
 from src.providers.consensus.client import ConsensusClient
 from src.providers.http_provider import HTTPProvider
 from src.providers.keys.client import KeysAPIClient
+from src.utils.json_stream import iter_json_array_field
 
 BASE_FIXTURES_PATH = Path().absolute() / 'fixtures'
 
@@ -105,6 +106,13 @@ class UpdateResponsesProvider(MultiProvider, UpdateResponses):
             yield
 
 
+def iter_recorded_response(response: Any, field: str, other_fields: Optional[dict]) -> Iterator[Any]:
+    """Streams recorded (data, meta) response the same way HTTPProvider streams the response body"""
+    data, meta = response
+    body = json.dumps({**meta, 'data': data}).encode()
+    return iter_json_array_field([body], field, other_fields)
+
+
 class ResponseFromFileHTTPProvider(HTTPProvider, Module, FromFile):
     def __init__(self, mock_path: Path, w3: Web3):
         self.w3 = w3
@@ -119,6 +127,16 @@ class ResponseFromFileHTTPProvider(HTTPProvider, Module, FromFile):
                 return response["response"]
         raise NoMockException('There is no mock for response')
 
+    def _get_stream(
+        self,
+        endpoint: str,
+        path_params: Optional[Sequence[str | int]] = None,
+        query_params: Optional[dict] = None,
+        field: str = 'data',
+        other_fields: Optional[dict] = None,
+    ) -> Iterator[Any]:
+        return iter_recorded_response(self._get(endpoint, path_params, query_params), field, other_fields)
+
 
 class UpdateResponsesHTTPProvider(HTTPProvider, Module, UpdateResponses):
     def __init__(self, mock_path: Path, host: str, w3: Web3):
@@ -138,6 +156,16 @@ class UpdateResponsesHTTPProvider(HTTPProvider, Module, UpdateResponses):
         self.responses.append({"url": url, "params": query_params, "response": response})
         return response
 
+    def _get_stream(
+        self,
+        endpoint: str,
+        path_params: Optional[Sequence[str | int]] = None,
+        query_params: Optional[dict] = None,
+        field: str = 'data',
+        other_fields: Optional[dict] = None,
+    ) -> Iterator[Any]:
+        return iter_recorded_response(self._get(endpoint, path_params, query_params), field, other_fields)
+
     @contextmanager
     def use_mock(self, mock_path: Path):
         with self.from_file.use_mock(mock_path), super().use_mock(mock_path):
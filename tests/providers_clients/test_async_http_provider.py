@@ -0,0 +1,206 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from aiohttp import ClientConnectorError
+from urllib3 import Retry
+
+from src.metrics.prometheus.basic import CL_REQUESTS_DURATION
+from src.providers.consensus.client import AsyncConsensusClient, ConsensusClient
+from src.providers.http_provider import NotOkResponse
+from tests.local_server import StubResponse, local_server
+
+pytestmark = pytest.mark.unit
+
+HEADER_ENDPOINT = 'eth/v1/beacon/headers/{}'
+
+
+def header_response(slot: int) -> dict:
+    return {
+        'execution_optimistic': False,
+        'finalized': True,
+        'data': {
+            'root': f'0x{slot}',
+            'canonical': True,
+            'header': {
+                'message': {
+                    'slot': str(slot),
+                    'proposer_index': '1',
+                    'parent_root': f'0x{slot - 1}',
+                    'state_root': '0x',
+                    'body_root': '0x',
+                },
+                'signature': '0x',
+            },
+        },
+    }
+
+
+def headers_routes(slots, delay: float = 0) -> dict:
+    return {
+        HEADER_ENDPOINT.format(slot): (lambda _, slot=slot: StubResponse.json(header_response(slot), delay=delay))
+        for slot in slots
+    }
+
+
+def requests_count(endpoint: str, code: int) -> float:
+    return sum(
+        sample.value
+        for metric in CL_REQUESTS_DURATION.collect()
+        for sample in metric.samples
+        if sample.name.endswith('_count') and sample.labels['endpoint'] == endpoint and sample.labels['code'] == str(code)
+    )
+
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def make(url: str) -> AsyncConsensusClient:
+        clients.append(AsyncConsensusClient(url))
+        return clients[-1]
+
+    yield make
+    for client in clients:
+        client.shutdown()
+
+
+def loops_count() -> int:
+    return sum(thread.name == 'AsyncConsensusClientLoop' for thread in threading.enumerate())
+
+
+def get_headers_concurrently(client: AsyncConsensusClient, slots) -> list:
+    with ThreadPoolExecutor(max_workers=len(slots)) as executor:
+        return list(executor.map(lambda slot: client.get_sync(HEADER_ENDPOINT, (slot,)), slots))
+
+
+def test_get_concurrently(make_client):
+    with local_server(headers_routes(range(6), delay=0.2)) as server:
+        client = make_client(server.url)
+
+        started = time.monotonic()
+        headers = get_headers_concurrently(client, range(6))
+        elapsed = time.monotonic() - started
+
+    assert [data['header']['message']['slot'] for data, _ in headers] == [str(slot) for slot in range(6)]
+    assert elapsed < 6 * 0.2
+
+
+def test_connections_per_host_are_limited(make_client):
+    with local_server(headers_routes(range(6), delay=0.1)) as server:
+        client = make_client(server.url)
+        client.POOL_SIZE_PER_HOST = 2
+
+        started = time.monotonic()
+        get_headers_concurrently(client, range(6))
+
+    # Six requests are sent by three pairs
+    assert time.monotonic() - started >= 3 * 0.1
+
+
+def test_retry_on_status(make_client):
+    statuses = iter([HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.OK])
+    count_before = requests_count(HEADER_ENDPOINT, HTTPStatus.OK)
+
+    def route(_):
+        status = next(statuses)
+        return StubResponse.json(header_response(1), status=status)
+
+    with local_server({HEADER_ENDPOINT.format(1): route}) as server:
+        client = make_client(server.url)
+        data, meta = client.get_sync(HEADER_ENDPOINT, (1,))
+
+    assert data['root'] == '0x1'
+    assert meta == {'execution_optimistic': False, 'finalized': True}
+    assert len(server.requests) == 2
+    # Retries are measured as one request, like in the sync provider
+    assert requests_count(HEADER_ENDPOINT, HTTPStatus.OK) == count_before + 1
+
+
+def test_retries_exhausted(make_client):
+    route = lambda _: StubResponse(HTTPStatus.BAD_GATEWAY, b'Bad gateway')
+
+    with local_server({HEADER_ENDPOINT.format(1): route}) as server:
+        client = make_client(server.url)
+        client.RETRY = Retry(total=2, status_forcelist=[HTTPStatus.BAD_GATEWAY], backoff_factor=0)
+
+        with pytest.raises(NotOkResponse) as error:
+            client.get_sync(HEADER_ENDPOINT, (1,))
+
+    assert error.value.status == HTTPStatus.BAD_GATEWAY
+    assert len(server.requests) == 3
+
+
+def test_not_retried_status(make_client):
+    with local_server({}) as server:
+        client = make_client(server.url)
+
+        with pytest.raises(NotOkResponse) as error:
+            client.get_sync(HEADER_ENDPOINT, (1,))
+
+    assert error.value.status == HTTPStatus.NOT_FOUND
+    assert len(server.requests) == 1
+
+
+def test_connection_error(make_client):
+    with local_server({}) as server:
+        url = server.url
+
+    client = make_client(url)
+    client.RETRY = Retry(total=1, backoff_factor=0)
+
+    with pytest.raises(ClientConnectorError):
+        client.get_sync('eth/v1/beacon/genesis')
+
+
+def test_query_params_encoding(make_client):
+    route = lambda _: StubResponse.json({'data': []})
+
+    with local_server({'validators': route}) as server:
+        client = make_client(server.url)
+        client.get_sync('validators', query_params={'id': ('1', '2'), 'status': None, 'limit': 5})
+
+    assert server.requests[0].query == {'id': ['1', '2'], 'limit': ['5']}
+
+
+def test_sync_client_in_async_mode():
+    loops_before = loops_count()
+
+    with local_server(headers_routes(range(8), delay=0.2)) as server:
+        client = ConsensusClient(server.url)
+        client.ASYNC_MODE = True
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            headers = list(executor.map(client.get_block_header, range(8)))
+        elapsed = time.monotonic() - started
+
+        with pytest.raises(NotOkResponse):
+            client.get_block_header(100)
+
+    assert [header.data.root for header in headers] == [f'0x{slot}' for slot in range(8)]
+    assert elapsed < 8 * 0.2
+    # All threads share one async client and its event loop
+    assert isinstance(client.async_client, AsyncConsensusClient)
+    assert loops_count() == loops_before + 1
+
+    client.close()
+    assert loops_count() == loops_before
+
+
+def test_shutdown(make_client):
+    with local_server(headers_routes([1])) as server:
+        client = make_client(server.url)
+        loops_before = loops_count()
+        client.get_sync(HEADER_ENDPOINT, (1,))
+        session = client._get_session()  # pylint: disable=protected-access
+
+        client.shutdown()
+        assert session.closed
+        assert loops_count() == loops_before
+
+        # Loop and session are created again on the next request
+        data, _ = client.get_sync(HEADER_ENDPOINT, (1,))
+        assert data['root'] == '0x1'
@@ -1,10 +1,17 @@
 """Simple tests for the consensus client responses validity."""
+import json
+from http import HTTPStatus
+
 import pytest
 
 from src.providers.consensus.client import ConsensusClient
-from src.providers.consensus.typings import Validator
+from src.providers.consensus.registry import ValidatorRegistry
+from src.providers.consensus.typings import Validator, ValidatorBalance, ValidatorStatus
+from src.providers.http_provider import NotOkResponse
 from src.utils.blockstamp import build_blockstamp
 from src.variables import CONSENSUS_CLIENT_URI
+from tests.factory.blockstamp import BlockStampFactory
+from tests.local_server import StubResponse, local_server
 
 
 @pytest.fixture
@@ -37,3 +44,147 @@ def test_get_validators(consensus_client: ConsensusClient):
     validator = validators[0]
     validator_by_pub_key = consensus_client.get_validators_no_cache(blockstamp, pub_keys=validator.validator.pubkey)
     assert validator_by_pub_key[0] == validator
+
+
+def validator_response(index: int) -> dict:
+    return {
+        'index': str(index),
+        'balance': '32000000000',
+        'status': 'active_ongoing',
+        'validator': {
+            'pubkey': '0x' + f'{index:096x}',
+            'withdrawal_credentials': '0x01' + '0' * 62,
+            'effective_balance': '32000000000',
+            'slashed': False,
+            'activation_eligibility_epoch': '0',
+            'activation_epoch': '0',
+            'exit_epoch': '18446744073709551615',
+            'withdrawable_epoch': '18446744073709551615',
+        },
+    }
+
+
+@pytest.mark.unit
+def test_get_validators_no_cache_streaming():
+    blockstamp = BlockStampFactory.build()
+    body = {'execution_optimistic': False, 'data': [validator_response(i) for i in range(50)]}
+    routes = {
+        f'eth/v1/beacon/states/{blockstamp.state_root}/validators': lambda _: StubResponse.json(body),
+    }
+
+    with local_server(routes) as server:
+        client = ConsensusClient(server.url)
+        client.STREAM_CHUNK_SIZE = 100
+
+        validators = client.get_validators_no_cache(blockstamp)
+
+    assert isinstance(validators, ValidatorRegistry)
+    assert [v.status for v in validators] == [ValidatorStatus.ACTIVE_ONGOING] * 50
+    assert [v.validator for v in validators] == [Validator.from_response(**v).validator for v in body['data']]
+    assert validators[7].validator.pubkey == '0x' + f'{7:096x}'
+
+
+@pytest.mark.unit
+def test_iter_validators_no_cache_fallback_to_slot():
+    blockstamp = BlockStampFactory.build()
+    routes = {
+        f'eth/v1/beacon/states/{blockstamp.state_root}/validators': lambda _: StubResponse(
+            404, b'{"message": "State not found: state not found in the last 8192 state roots"}',
+        ),
+        f'eth/v1/beacon/states/{blockstamp.slot_number}/validators': lambda _: StubResponse.json(
+            {'data': [validator_response(1)]},
+        ),
+    }
+
+    with local_server(routes) as server:
+        validators = ConsensusClient(server.url).iter_validators_no_cache(blockstamp)
+        assert [v.index for v in validators] == ['1']
+
+
+@pytest.mark.unit
+def test_iter_validators_no_cache_not_ok():
+    blockstamp = BlockStampFactory.build()
+
+    with local_server({}) as server:
+        with pytest.raises(NotOkResponse):
+            ConsensusClient(server.url).iter_validators_no_cache(blockstamp)
+
+
+@pytest.mark.unit
+def test_get_validators_by_indices_in_chunks():
+    blockstamp = BlockStampFactory.build()
+    records = {str(i): validator_response(i) for i in range(10)}
+
+    def post_validators(request):
+        ids = json.loads(request.body)['ids']
+        return StubResponse.json({'data': [records[i] for i in ids if i in records]})
+
+    routes = {f'eth/v1/beacon/states/{blockstamp.state_root}/validators': post_validators}
+
+    with local_server(routes) as server:
+        client = ConsensusClient(server.url)
+        client.VALIDATORS_IDS_CHUNK_SIZE = 2
+
+        validators = client.get_validators_by_indices(blockstamp, [1, 3, 5, 20, 7])
+
+    assert isinstance(validators, ValidatorRegistry)
+    assert [v.index for v in validators] == ['1', '3', '5', '7']
+    assert [request.method for request in server.requests] == ['POST'] * 3
+    assert [json.loads(request.body) for request in server.requests] == [
+        {'ids': ['1', '3']}, {'ids': ['5', '20']}, {'ids': ['7']},
+    ]
+
+
+@pytest.mark.unit
+def test_get_validators_balances_fallback_to_get():
+    blockstamp = BlockStampFactory.build()
+
+    def validator_balances(request):
+        if request.method == 'POST':
+            return StubResponse(405, b'{"message": "Method not allowed"}')
+        return StubResponse.json({'data': [{'index': i, 'balance': f'{i}0'} for i in request.query['id']]})
+
+    routes = {f'eth/v1/beacon/states/{blockstamp.state_root}/validator_balances': validator_balances}
+
+    with local_server(routes) as server:
+        client = ConsensusClient(server.url)
+        client.VALIDATORS_IDS_CHUNK_SIZE = 2
+
+        balances = client.get_validators_balances(blockstamp, [1, 2, 3])
+
+    assert balances == [ValidatorBalance('1', '10'), ValidatorBalance('2', '20'), ValidatorBalance('3', '30')]
+    # Last index is checked first. Rejected POST is not retried for the next chunks
+    assert [request.method for request in server.requests] == ['GET', 'POST', 'GET', 'GET']
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('status', [HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND])
+def test_get_validators_balances_skips_not_existed_indices(status):
+    blockstamp = BlockStampFactory.build()
+    validators_count = 6
+
+    def validator_balances(request):
+        ids = [int(i) for i in json.loads(request.body)] if request.method == 'POST' else [int(i) for i in request.query['id']]
+        if request.method == 'POST' and len(ids) > 1:
+            return StubResponse(status, b'{"message": "Not supported"}')
+        if any(i >= validators_count for i in ids):
+            return StubResponse(status, b'{"message": "Invalid validator index"}')
+        return StubResponse.json({'data': [{'index': str(i), 'balance': f'{i}0'} for i in ids]})
+
+    routes = {f'eth/v1/beacon/states/{blockstamp.state_root}/validator_balances': validator_balances}
+
+    with local_server(routes) as server:
+        client = ConsensusClient(server.url)
+        balances = client.get_validators_balances(blockstamp, [7, 1, 3, 5, 6, 10])
+
+    assert balances == [ValidatorBalance('1', '10'), ValidatorBalance('3', '30'), ValidatorBalance('5', '50')]
+    assert not client.post_validators_ids
+
+
+@pytest.mark.unit
+def test_get_validators_by_indices_not_ok():
+    blockstamp = BlockStampFactory.build()
+
+    with local_server({}) as server:
+        with pytest.raises(NotOkResponse):
+            ConsensusClient(server.url).get_validators_by_indices(blockstamp, [1])
@@ -0,0 +1,160 @@
+import struct
+
+import pytest
+
+from src.constants import FAR_FUTURE_EPOCH
+from src.providers.consensus.client import ConsensusClient
+from src.providers.consensus.registry import ValidatorRegistry
+from src.providers.consensus.ssz import (
+    BALANCES_END_OFFSET_POSITION,
+    BALANCES_OFFSET_POSITION,
+    OFFSET_SIZE,
+    SLOTS_PER_EPOCH,
+    STATE_SLOT_POSITION,
+    VALIDATORS_OFFSET_POSITION,
+    decode_state_validators,
+)
+from src.providers.http_provider import SSZ_CONTENT_TYPE
+from tests.factory.blockstamp import BlockStampFactory
+from tests.local_server import StubResponse, local_server
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.unit
+
+STATE_EPOCH = 1000
+
+
+def encode_state(records: list[dict], slot: int = STATE_EPOCH * SLOTS_PER_EPOCH) -> bytes:
+    """Encodes BeaconState with given validators. All other fields are zeroed."""
+    fixed = bytearray(BALANCES_END_OFFSET_POSITION + OFFSET_SIZE)
+    validators = b''.join(
+        bytes.fromhex(r['validator']['pubkey'][2:])
+        + bytes.fromhex(r['validator']['withdrawal_credentials'][2:])
+        + struct.pack(
+            '<Q?QQQQ',
+            int(r['validator']['effective_balance']),
+            r['validator']['slashed'],
+            int(r['validator']['activation_eligibility_epoch']),
+            int(r['validator']['activation_epoch']),
+            int(r['validator']['exit_epoch']),
+            int(r['validator']['withdrawable_epoch']),
+        )
+        for r in records
+    )
+    balances = b''.join(struct.pack('<Q', int(r['balance'])) for r in records)
+
+    struct.pack_into('<Q', fixed, STATE_SLOT_POSITION, slot)
+    struct.pack_into('<I', fixed, VALIDATORS_OFFSET_POSITION, len(fixed))
+    struct.pack_into('<I', fixed, BALANCES_OFFSET_POSITION, len(fixed) + len(validators))
+    struct.pack_into('<I', fixed, BALANCES_END_OFFSET_POSITION, len(fixed) + len(validators) + len(balances))
+    return bytes(fixed) + validators + balances
+
+
+def with_state(status: str, balance: int = 32 * 10 ** 9, slashed: bool = False, **epochs: int) -> dict:
+    response = validator_response(0)
+    response['status'] = status
+    response['balance'] = str(balance)
+    response['validator']['slashed'] = slashed
+    response['validator'].update({key: str(value) for key, value in epochs.items()})
+    return response
+
+
+STATUSES_CASES = [
+    with_state('pending_initialized', activation_eligibility_epoch=FAR_FUTURE_EPOCH, activation_epoch=FAR_FUTURE_EPOCH),
+    with_state('pending_queued', activation_eligibility_epoch=999, activation_epoch=FAR_FUTURE_EPOCH),
+    with_state('pending_queued', activation_epoch=STATE_EPOCH + 1),
+    with_state('active_ongoing', activation_epoch=STATE_EPOCH),
+    with_state('active_exiting', exit_epoch=STATE_EPOCH + 1, withdrawable_epoch=STATE_EPOCH + 257),
+    with_state('active_slashed', slashed=True, exit_epoch=STATE_EPOCH + 1, withdrawable_epoch=STATE_EPOCH + 8192),
+    with_state('exited_unslashed', exit_epoch=STATE_EPOCH, withdrawable_epoch=STATE_EPOCH + 256),
+    with_state('exited_slashed', slashed=True, exit_epoch=STATE_EPOCH - 1, withdrawable_epoch=STATE_EPOCH + 1),
+    with_state('withdrawal_possible', exit_epoch=10, withdrawable_epoch=STATE_EPOCH),
+    with_state('withdrawal_done', balance=0, exit_epoch=10, withdrawable_epoch=STATE_EPOCH),
+]
+
+
+@pytest.fixture
+def records() -> list[dict]:
+    records = [validator_response(i) for i in range(5)] + STATUSES_CASES
+    for index, record in enumerate(records):
+        record['index'] = str(index)
+        record['validator']['pubkey'] = '0x' + f'{index:096x}'
+    return records
+
+
+def test_decode_state_validators(records):
+    state = memoryview(encode_state(records))
+
+    registry = decode_state_validators(state)
+
+    assert list(registry) == list(ValidatorRegistry.from_responses(records))
+    # Columns are views into the state buffer
+    assert not registry.balance.flags.owndata
+    assert not registry.exit_epoch.flags.owndata
+
+
+def test_decode_state_validators_empty():
+    assert len(decode_state_validators(memoryview(encode_state([])))) == 0
+
+
+@pytest.mark.parametrize('size', [0, 100, BALANCES_END_OFFSET_POSITION + OFFSET_SIZE + 121])
+def test_decode_state_validators_truncated(records, size):
+    with pytest.raises(ValueError):
+        decode_state_validators(memoryview(encode_state(records)[:size]))
+
+
+def ssz_client_routes(blockstamp, state_response: StubResponse, records: list[dict]) -> dict:
+    return {
+        f'eth/v2/debug/beacon/states/{blockstamp.state_root}': lambda _: state_response,
+        f'eth/v1/beacon/states/{blockstamp.state_root}/validators': lambda _: StubResponse.json({'data': records}),
+    }
+
+
+def test_get_validators_ssz_mode(records):
+    blockstamp = BlockStampFactory.build()
+    state_response = StubResponse(body=encode_state(records), headers={'Content-Type': SSZ_CONTENT_TYPE})
+
+    with local_server(ssz_client_routes(blockstamp, state_response, records)) as server:
+        client = ConsensusClient(server.url)
+        client.SSZ_MODE = True
+        registry = client.get_validators_no_cache(blockstamp)
+
+    assert [request.path for request in server.requests] == [f'/eth/v2/debug/beacon/states/{blockstamp.state_root}']
+    assert server.requests[0].headers['Accept'] == SSZ_CONTENT_TYPE
+    assert list(registry) == list(ValidatorRegistry.from_responses(records))
+
+
+@pytest.mark.parametrize(
+    'state_response',
+    [
+        # Debug endpoints are disabled
+        StubResponse(404, b'{"message": "Not found"}'),
+        # Accept header is ignored, body should not be downloaded
+        StubResponse(body=iter([b'{"data": {']), headers={'Content-Type': 'application/json'}),
+        # Broken state
+        StubResponse(body=b'\x00' * 10, headers={'Content-Type': SSZ_CONTENT_TYPE}),
+    ],
+)
+def test_get_validators_ssz_mode_fallback_to_json(records, state_response):
+    blockstamp = BlockStampFactory.build()
+
+    with local_server(ssz_client_routes(blockstamp, state_response, records)) as server:
+        client = ConsensusClient(server.url)
+        client.SSZ_MODE = True
+        registry = client.get_validators_no_cache(blockstamp)
+
+    assert len(server.requests) == 2
+    assert list(registry) == list(ValidatorRegistry.from_responses(records))
+
+
+def test_get_validators_ssz_mode_disabled_or_by_keys(records):
+    blockstamp = BlockStampFactory.build()
+    state_response = StubResponse(body=encode_state(records), headers={'Content-Type': SSZ_CONTENT_TYPE})
+
+    with local_server(ssz_client_routes(blockstamp, state_response, records)) as server:
+        client = ConsensusClient(server.url)
+        client.get_validators_no_cache(blockstamp)
+        client.SSZ_MODE = True
+        client.get_validators_no_cache(blockstamp, pub_keys=records[0]['validator']['pubkey'])
+
+    assert all(request.path.endswith('/validators') for request in server.requests)
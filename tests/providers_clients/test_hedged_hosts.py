@@ -0,0 +1,168 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from requests import ConnectionError as RequestsConnectionError
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+
+from src.providers.consensus.client import AsyncConsensusClient, ConsensusClient
+from src.providers.hedging import HostStats
+from src.providers.http_provider import NotOkResponse
+from tests.factory.blockstamp import BlockStampFactory
+from tests.local_server import StubResponse, local_server
+from tests.providers_clients.test_async_http_provider import HEADER_ENDPOINT, header_response
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.unit
+
+SLOW = 2
+
+
+def make_client(*urls: str) -> ConsensusClient:
+    client = ConsensusClient(','.join(urls))
+    # Hedge after the first answer and fail over without urllib3 retries
+    client.hosts.MIN_SAMPLES = 1
+    adapter = HTTPAdapter(max_retries=0)
+    client.session.mount('http://', adapter)
+    return client
+
+
+def test_host_stats_percentile():
+    stats = HostStats(window=10)
+    assert stats.get_latency_percentile('endpoint', 95, min_samples=1) is None
+
+    for latency in range(1, 21):
+        stats.add_latency('endpoint', latency)
+
+    # Only the latest answers are kept
+    assert stats.get_latency_percentile('endpoint', 50, min_samples=1) == 15
+    assert stats.get_latency_percentile('endpoint', 95, min_samples=1) == 20
+    assert stats.get_latency_percentile('endpoint', 95, min_samples=11) is None
+    assert stats.get_latency_percentile('another', 95, min_samples=1) is None
+
+
+def test_single_host():
+    client = ConsensusClient('http://localhost:5052')
+    assert client.host == 'http://localhost:5052'
+    assert client.hosts.hosts == ['http://localhost:5052']
+
+
+def test_slow_host_is_hedged():
+    delays = iter([0, SLOW])
+    slow_route = lambda _: StubResponse.json(header_response(1), delay=next(delays))
+
+    with local_server({HEADER_ENDPOINT.format(1): slow_route}) as slow, \
+            local_server({HEADER_ENDPOINT.format(1): lambda _: StubResponse.json(header_response(1))}) as fast:
+        client = make_client(slow.url, fast.url)
+
+        client.get_block_header(1)
+        assert (len(slow.requests), len(fast.requests)) == (1, 0)
+
+        client.get_block_header.cache_clear()
+        started = time.monotonic()
+        header = client.get_block_header(1)
+
+        assert time.monotonic() - started < SLOW
+        assert header.data.root == '0x1'
+        assert (len(slow.requests), len(fast.requests)) == (2, 1)
+
+
+def test_stream_is_taken_from_the_first_answered_host():
+    blockstamp = BlockStampFactory.build()
+    endpoint = f'eth/v1/beacon/states/{blockstamp.state_root}/validators'
+    delays = iter([0, SLOW])
+    slow_route = lambda _: StubResponse.json({'data': [validator_response(1)]}, delay=next(delays))
+    fast_route = lambda _: StubResponse.json({'data': [validator_response(2)]})
+
+    with local_server({endpoint: slow_route}) as slow, local_server({endpoint: fast_route}) as fast:
+        client = make_client(slow.url, fast.url)
+
+        assert [v.index for v in client.iter_validators_no_cache(blockstamp)] == ['1']
+
+        started = time.monotonic()
+        assert [v.index for v in client.iter_validators_no_cache(blockstamp)] == ['2']
+        assert time.monotonic() - started < SLOW
+
+
+def test_ssz_body_is_downloaded_from_the_first_answered_host():
+    endpoint = 'eth/v2/debug/beacon/states/head'
+    ssz_headers = {'Content-Type': 'application/octet-stream'}
+    delays = iter([0, SLOW])
+    sent_chunks = []
+
+    def slow_body():
+        for _ in range(64):
+            sent_chunks.append(1)
+            yield b'\x01' * 2 ** 20
+
+    def slow_route(_):
+        delay = next(delays)
+        return StubResponse(body=b'\x01' if not delay else slow_body(), headers=ssz_headers, delay=delay)
+
+    fast_route = lambda _: StubResponse(body=b'\x02', headers=ssz_headers)
+
+    with local_server({endpoint: slow_route}) as slow, local_server({endpoint: fast_route}) as fast:
+        client = make_client(slow.url, fast.url)
+        assert bytes(client._get_ssz(endpoint)) == b'\x01'  # pylint: disable=protected-access
+
+        started = time.monotonic()
+        assert bytes(client._get_ssz(endpoint)) == b'\x02'  # pylint: disable=protected-access
+        assert time.monotonic() - started < SLOW
+
+        # Late answer of the slow host is closed after the headers, its body is not downloaded
+        time.sleep(SLOW + 0.5)
+        assert len(sent_chunks) < 64
+
+
+def test_async_mode_is_hedged():
+    with local_server({}) as failed:
+        failed_url = failed.url
+
+    with local_server({HEADER_ENDPOINT.format(1): lambda _: StubResponse.json(header_response(1))}) as healthy:
+        client = make_client(failed_url, healthy.url)
+        client.ASYNC_MODE = True
+        client.async_client = AsyncConsensusClient(client.host)
+        client.async_client.RETRY = Retry(total=0)
+
+        assert client.get_block_header(1).data.root == '0x1'
+        assert len(healthy.requests) == 1
+        client.close()
+
+
+def test_failed_host_is_skipped():
+    failed_route = lambda _: StubResponse(HTTPStatus.SERVICE_UNAVAILABLE, b'Unavailable')
+    route = lambda _: StubResponse.json(header_response(1))
+
+    with local_server({HEADER_ENDPOINT.format(1): failed_route}) as failed, \
+            local_server({HEADER_ENDPOINT.format(1): route}) as healthy:
+        client = make_client(failed.url, healthy.url)
+
+        assert client.get_block_header(1).data.root == '0x1'
+        assert (len(failed.requests), len(healthy.requests)) == (1, 1)
+
+        # Failed host is tried last until cooldown is over
+        client.get_block_header.cache_clear()
+        client.get_block_header(1)
+        assert (len(failed.requests), len(healthy.requests)) == (1, 2)
+
+
+def test_all_hosts_failed():
+    with local_server({}) as first, local_server({}) as second:
+        urls = first.url, second.url
+
+    client = make_client(*urls)
+
+    with pytest.raises(RequestsConnectionError):
+        client.get_genesis()
+
+
+def test_not_found_is_not_retried_on_other_hosts():
+    with local_server({}) as first, local_server({}) as second:
+        client = make_client(first.url, second.url)
+
+        with pytest.raises(NotOkResponse) as error:
+            client.get_block_header(100)
+
+        assert error.value.status == HTTPStatus.NOT_FOUND
+        assert (len(first.requests), len(second.requests)) == (1, 0)
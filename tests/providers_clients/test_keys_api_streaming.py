@@ -0,0 +1,192 @@
+from typing import Optional
+
+import pytest
+
+from src.providers.consensus.registry import ValidatorRegistry, ValidatorsPubkeyIndex
+from src.providers.keys.client import KeysAPIClient, KeysOutdatedException
+from src.providers.keys.table import LidoKeysTable
+from src.providers.keys.typings import LidoKey
+from src.web3py.extensions.lido_validators import LidoValidatorsProvider
+from tests.factory.blockstamp import BlockStampFactory
+from tests.local_server import StubResponse, local_server
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.unit
+
+MODULE_ADDRESSES = {1: '0x' + '1' * 40, 2: '0x' + '2' * 40}
+
+
+def pubkey(i: int) -> str:
+    return '0x' + f'{i:096x}'
+
+
+def snapshot(block_number: int) -> dict:
+    return {'elBlockSnapshot': {'blockNumber': block_number, 'blockHash': f'0x{block_number}', 'timestamp': 0}}
+
+
+def modules_response(block_number: int, nonces: Optional[dict] = None) -> dict:
+    nonces = nonces or {}
+    modules = [
+        {'id': module_id, 'stakingModuleAddress': address, 'nonce': nonces.get(module_id, 1), 'name': 'module'}
+        for module_id, address in MODULE_ADDRESSES.items()
+    ]
+    return {'data': modules, 'meta': snapshot(block_number)}
+
+
+def status_response(block_number: int) -> dict:
+    return {'appVersion': '0.10.0', 'chainId': 1, **snapshot(block_number)}
+
+
+def module_keys_response(module_id: int, keys: list[tuple[int, int, bool]], block_number: int, nonce: int = 1) -> dict:
+    return {
+        'data': {
+            'keys': [
+                {
+                    'key': pubkey(key),
+                    'depositSignature': '0x' + 'ab' * 96,
+                    'operatorIndex': operator,
+                    'used': used,
+                    'moduleAddress': MODULE_ADDRESSES[module_id],
+                }
+                for key, operator, used in keys
+            ],
+            'module': {'id': module_id, 'stakingModuleAddress': MODULE_ADDRESSES[module_id], 'nonce': nonce},
+        },
+        'meta': snapshot(block_number),
+    }
+
+
+def keys_routes(block_numbers=None, nonces=None) -> dict:
+    block_numbers = block_numbers or {}
+    nonces = {} if nonces is None else nonces
+    return {
+        'v1/status': lambda _: StubResponse.json(status_response(block_numbers.get(0, 10))),
+        'v1/modules': lambda _: StubResponse.json(modules_response(block_numbers.get(0, 10), nonces)),
+        'v1/modules/1/keys': lambda _: StubResponse.json(module_keys_response(
+            1, [(1, 0, True), (2, 1, True), (3, 1, False)], block_numbers.get(1, 10), nonces.get(1, 1),
+        )),
+        'v1/modules/2/keys': lambda _: StubResponse.json(
+            module_keys_response(2, [(4, 0, True)], block_numbers.get(2, 10), nonces.get(2, 1)),
+        ),
+    }
+
+
+def make_client(url: str) -> KeysAPIClient:
+    client = KeysAPIClient(url)
+    client.SLEEP_SECONDS = 0
+    client.STREAM_CHUNK_SIZE = 64
+    return client
+
+
+def test_get_all_lido_keys_by_modules():
+    with local_server(keys_routes()) as server:
+        keys = make_client(server.url).get_all_lido_keys(BlockStampFactory.build(block_number=10))
+
+    assert isinstance(keys, LidoKeysTable)
+    assert keys.nbytes == 3 * (48 + 8 + 4)
+    assert list(keys) == [
+        LidoKey(key=pubkey(1), depositSignature='', operatorIndex=0, used=True, moduleAddress=MODULE_ADDRESSES[1]),
+        LidoKey(key=pubkey(2), depositSignature='', operatorIndex=1, used=True, moduleAddress=MODULE_ADDRESSES[1]),
+        LidoKey(key=pubkey(4), depositSignature='', operatorIndex=0, used=True, moduleAddress=MODULE_ADDRESSES[2]),
+    ]
+    keys_requests = [request for request in server.requests if request.path.endswith('/keys')]
+    assert all(request.query == {'used': ['true']} for request in keys_requests)
+
+
+def test_keys_from_another_snapshot_are_taken_if_module_is_not_changed():
+    with local_server(keys_routes({1: 11, 2: 12})) as server:
+        keys = make_client(server.url).get_all_lido_keys(BlockStampFactory.build(block_number=10))
+
+    assert len(keys) == 3
+    assert sum(request.path == '/v1/modules' for request in server.requests) == 1
+
+
+def test_keys_of_changed_module_are_downloaded_again():
+    nonces = iter([2, 2])
+    routes = keys_routes()
+    routes['v1/modules/2/keys'] = lambda _: StubResponse.json(
+        module_keys_response(2, [(4, 0, True)], 11, nonce=next(nonces, 1)),
+    )
+
+    with local_server(routes) as server:
+        keys = make_client(server.url).get_all_lido_keys(BlockStampFactory.build(block_number=10))
+
+        assert len(keys) == 3
+        paths = [request.path for request in server.requests]
+        assert paths.count('/v1/modules') == 3
+        # Keys of the not changed module are downloaded once
+        assert paths.count('/v1/modules/1/keys') == 1
+        assert paths.count('/v1/modules/2/keys') == 3
+
+        routes['v1/modules/2/keys'] = lambda _: StubResponse.json(module_keys_response(2, [(4, 0, True)], 11, nonce=2))
+        client = make_client(server.url)
+        with pytest.raises(KeysOutdatedException):
+            client.get_all_lido_keys(BlockStampFactory.build(block_number=10))
+
+
+def test_outdated_keys_api():
+    with local_server(keys_routes({0: 9})) as server:
+        client = make_client(server.url)
+
+        with pytest.raises(KeysOutdatedException):
+            client.get_all_lido_keys(BlockStampFactory.build(block_number=10))
+
+    # Nothing is downloaded from the outdated snapshot
+    assert all(request.path == '/v1/status' for request in server.requests)
+
+
+def test_freshness_is_checked_with_status(monkeypatch):
+    status_blocks = iter([0, 5, 9])
+    routes = keys_routes()
+    routes['v1/status'] = lambda _: StubResponse.json(status_response(next(status_blocks, 10)))
+    sleeps: list[float] = []
+    monkeypatch.setattr('src.providers.keys.client.sleep', sleeps.append)
+
+    with local_server(routes) as server:
+        client = make_client(server.url)
+        client.SLEEP_SECONDS = 12
+        modules, _ = client.get_modules(BlockStampFactory.build(block_number=10))
+
+    assert [module.id for module in modules] == [1, 2]
+    # Sleep grows while lag is large and shrinks when Keys API is almost synced
+    assert sleeps == [12, 24, 12]
+    assert [request.path for request in server.requests] == ['/v1/status'] * 4 + ['/v1/modules']
+    assert client._get_sleep_seconds(1000, 4) == client.MAX_SLEEP_SECONDS  # pylint: disable=protected-access
+
+
+def test_data_from_older_snapshot_is_requested_again():
+    modules_blocks = iter([9, 9])
+    routes = keys_routes()
+    routes['v1/modules'] = lambda _: StubResponse.json(modules_response(next(modules_blocks, 10)))
+
+    with local_server(routes) as server:
+        client = make_client(server.url)
+        modules, modules_snapshot = client.get_modules(BlockStampFactory.build(block_number=10))
+
+        assert [module.id for module in modules] == [1, 2]
+        assert modules_snapshot['blockNumber'] == 10
+        assert [request.path for request in server.requests] == ['/v1/status', '/v1/modules'] * 3
+
+        # Data is never fresh
+        routes['v1/modules'] = lambda _: StubResponse.json(modules_response(9))
+        with pytest.raises(KeysOutdatedException, match='from block 9'):
+            client.get_modules(BlockStampFactory.build(block_number=10))
+
+
+def test_merge_validators_with_keys_table():
+    keys = LidoKeysTable.concat([
+        LidoKeysTable.from_responses(
+            module_keys_response(1, [(5, 3, True), (100, 4, True)], 10)['data']['keys'], 1, MODULE_ADDRESSES[1],
+        ),
+        LidoKeysTable.from_responses(module_keys_response(2, [(2, 7, True)], 10)['data']['keys'], 2, MODULE_ADDRESSES[2]),
+    ])
+    validators = ValidatorRegistry.from_responses(validator_response(i) for i in range(10))
+    provider = object.__new__(LidoValidatorsProvider)
+    provider.pubkey_index = ValidatorsPubkeyIndex()
+
+    lido_validators = provider.merge_validators_with_keys(keys, validators)
+
+    assert [(v.index, v.lido_id.operatorIndex, v.lido_id.moduleAddress) for v in lido_validators] == [
+        ('5', 3, MODULE_ADDRESSES[1]),
+        ('2', 7, MODULE_ADDRESSES[2]),
+    ]
@@ -0,0 +1,64 @@
+import pytest
+
+from src.providers.keys.store import LidoKeysStore
+from src.providers.keys.typings import KeysApiModule
+from tests.factory.blockstamp import BlockStampFactory
+from tests.local_server import StubResponse, local_server
+from tests.providers_clients.test_keys_api_streaming import (
+    MODULE_ADDRESSES,
+    keys_routes,
+    make_client,
+    pubkey,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def keys_requests(server) -> list[str]:
+    return [request.path for request in server.requests if request.path.endswith('/keys')]
+
+
+def test_keys_of_unchanged_modules_are_not_downloaded():
+    nonces = {1: 1, 2: 1}
+    routes = keys_routes(nonces=nonces)
+
+    with local_server(routes) as server:
+        client = make_client(server.url)
+        client.keys_store = LidoKeysStore()
+
+        keys = client.get_all_lido_keys(BlockStampFactory.build(slot_number=1, block_number=10))
+        assert len(keys_requests(server)) == 2
+
+        same_keys = client.get_all_lido_keys(BlockStampFactory.build(slot_number=2, block_number=10))
+        assert len(keys_requests(server)) == 2
+
+        nonces[2] = 2
+        updated_keys = client.get_all_lido_keys(BlockStampFactory.build(slot_number=3, block_number=10))
+
+    assert keys_requests(server)[2:] == ['/v1/modules/2/keys']
+    assert list(same_keys) == list(keys)
+    assert list(updated_keys) == list(keys)
+
+
+def test_keys_are_reused_after_restart(tmp_path):
+    with local_server(keys_routes()) as server:
+        client = make_client(server.url)
+        client.keys_store = LidoKeysStore(tmp_path)
+        keys = client.get_all_lido_keys(BlockStampFactory.build(block_number=10))
+
+        restarted_client = make_client(server.url)
+        restarted_client.keys_store = LidoKeysStore(tmp_path)
+        restored_keys = restarted_client.get_all_lido_keys(BlockStampFactory.build(block_number=10))
+
+    assert len(keys_requests(server)) == 2
+    assert list(restored_keys) == list(keys)
+    assert restored_keys.pubkey_hex(0) == pubkey(1)
+
+
+def test_broken_keys_file_is_removed(tmp_path):
+    module = KeysApiModule(id=1, stakingModuleAddress=MODULE_ADDRESSES[1], nonce=1)
+    keys_file = tmp_path / '1.keys'
+    keys_file.write_bytes(b'LOKS-broken')
+
+    assert LidoKeysStore(tmp_path).get(module) is None
+    assert not keys_file.exists()
@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.metrics.prometheus.basic import CL_REQUESTS_COALESCED
+from src.providers.consensus.client import ConsensusClient
+from src.providers.single_flight import SingleFlight, freeze_params
+from tests.local_server import StubResponse, local_server
+
+pytestmark = pytest.mark.unit
+
+BLOCK_ROOT_ENDPOINT = 'eth/v1/beacon/blocks/{}/root'
+
+
+def coalesced_count(endpoint: str) -> float:
+    return CL_REQUESTS_COALESCED.labels(endpoint=endpoint)._value.get()  # pylint: disable=protected-access
+
+
+def run_concurrently(func, count: int) -> list:
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return [future.result() for future in [executor.submit(func) for _ in range(count)]]
+
+
+def test_concurrent_calls_are_coalesced():
+    single_flight = SingleFlight()
+    calls = []
+    barrier = threading.Barrier(4)
+    release = threading.Event()
+
+    def func():
+        calls.append(1)
+        release.wait(5)
+        return {'value': len(calls)}
+
+    def call():
+        barrier.wait(5)
+        threading.Timer(0.2, release.set).start()
+        return single_flight.do('key', func)
+
+    results = run_concurrently(call, 4)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(result is results[0][0] for result, _ in results)
+
+    # Finished call is not cached
+    assert single_flight.do('key', func) == ({'value': 2}, False)
+
+
+def test_exception_is_shared():
+    single_flight = SingleFlight()
+    started = threading.Event()
+
+    def func():
+        started.set()
+        threading.Event().wait(0.2)
+        raise ValueError('Failed')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(single_flight.do, 'key', func)
+        started.wait(5)
+        follower = executor.submit(single_flight.do, 'key', func)
+
+        with pytest.raises(ValueError) as leader_error:
+            leader.result()
+        with pytest.raises(ValueError):
+            follower.result()
+
+    # Error is raised as is, without cause referencing itself
+    assert leader_error.value.__cause__ is None
+
+
+def test_freeze_params():
+    assert not freeze_params(None)
+    assert freeze_params({'id': ['1', '2'], 'status': None}) == freeze_params({'status': None, 'id': ('1', '2')})
+    assert freeze_params({'id': ['1']}) != freeze_params({'id': ['2']})
+
+
+def test_client_requests_are_coalesced():
+    route = lambda _: StubResponse.json({'data': {'root': '0x1'}}, delay=0.3)
+    count_before = coalesced_count(BLOCK_ROOT_ENDPOINT)
+
+    with local_server({BLOCK_ROOT_ENDPOINT.format('head'): route}) as server:
+        client = ConsensusClient(server.url)
+
+        roots = run_concurrently(lambda: client.get_block_root('head'), 4)
+        assert [root.root for root in roots] == ['0x1'] * 4
+        assert len(server.requests) == 1
+        assert coalesced_count(BLOCK_ROOT_ENDPOINT) == count_before + 3
+
+        # Head is requested again after in-flight request is finished
+        client.get_block_root('head')
+        assert len(server.requests) == 2
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from unittest.mock import Mock
+
+import pytest
+
+from src.providers.consensus.client import ConsensusClient
+from src.providers.consensus.slots_index import HEADER, RECORD, SlotBlock, SlotsIndex
+from src.typings import BlockRoot, ReferenceBlockStamp, SlotNumber
+from src.utils.slot import get_blockstamp, get_reference_blockstamp
+from tests.factory.blockstamp import BlockStampFactory
+
+pytestmark = pytest.mark.unit
+
+GENESIS_A = '0x' + 'a' * 64
+GENESIS_B = '0x' + 'b' * 64
+
+
+def slot_block(slot: int, block_slot: int) -> SlotBlock:
+    return SlotBlock(
+        slot=SlotNumber(slot),
+        block_root=BlockRoot('0x' + f'{block_slot:064x}'),
+        blockstamp=BlockStampFactory.build(
+            slot_number=block_slot,
+            state_root='0x' + f'{block_slot + 1:064x}',
+            block_hash='0x' + f'{block_slot + 2:064x}',
+        ),
+    )
+
+
+def test_add_and_load(tmp_path):
+    path = tmp_path / 'cache' / 'slots.index'
+    index = SlotsIndex(path, GENESIS_A)
+    assert index.get(SlotNumber(10)) is None
+
+    blocks = [slot_block(10, 10), slot_block(12, 11), slot_block(10, 9)]
+    for block in blocks:
+        index.add(block)
+
+    # Slot is indexed once
+    assert index.get(SlotNumber(10)) == blocks[0]
+    assert path.stat().st_size == HEADER.size + 2 * RECORD.size
+
+    loaded = SlotsIndex(path, GENESIS_A)
+    assert len(loaded) == 2
+    assert loaded.get(SlotNumber(10)) == blocks[0]
+    assert loaded.get(SlotNumber(12)) == blocks[1]
+    assert not loaded.get(SlotNumber(10)).missed
+    assert loaded.get(SlotNumber(12)).missed
+
+
+def test_index_of_another_chain_is_dropped(tmp_path):
+    path = tmp_path / 'slots.index'
+    SlotsIndex(path, GENESIS_A).add(slot_block(10, 10))
+
+    index = SlotsIndex(path, GENESIS_B)
+
+    assert index.get(SlotNumber(10)) is None
+    # Index is started again with the header of the current chain
+    assert path.stat().st_size == HEADER.size
+    index.add(slot_block(10, 10))
+    assert len(SlotsIndex(path, GENESIS_B)) == 1
+
+
+def test_slots_are_added_concurrently(tmp_path):
+    path = tmp_path / 'slots.index'
+    index = SlotsIndex(path, GENESIS_A)
+    assert path.stat().st_size == HEADER.size
+
+    blocks = [slot_block(slot, slot) for slot in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(index.add, blocks + blocks))
+
+    assert path.stat().st_size == HEADER.size + len(blocks) * RECORD.size
+    loaded = SlotsIndex(path, GENESIS_A)
+    assert [loaded.get(block.slot) for block in blocks] == blocks
+
+
+def test_partially_written_record_is_truncated(tmp_path):
+    path = tmp_path / 'slots.index'
+    index = SlotsIndex(path, GENESIS_A)
+    index.add(slot_block(10, 10))
+    index.add(slot_block(11, 11))
+    with open(path, 'r+b') as file:
+        file.truncate(HEADER.size + RECORD.size + 7)
+
+    index = SlotsIndex(path, GENESIS_A)
+    assert len(index) == 1
+    assert path.stat().st_size == HEADER.size + RECORD.size
+
+    # Next records are appended right after the last complete one
+    index.add(slot_block(11, 11))
+    assert SlotsIndex(path, GENESIS_A).get(SlotNumber(11)) == slot_block(11, 11)
+
+
+def test_blockstamp_is_resolved_from_index(tmp_path, monkeypatch):
+    resolved = slot_block(20, 18)
+    cc = object.__new__(ConsensusClient)
+    cc.slots_index = SlotsIndex(tmp_path / 'slots.index', GENESIS_A)
+
+    header = Mock()
+    header.data.root = resolved.block_root
+    get_header = Mock(return_value=header)
+    monkeypatch.setattr('src.utils.slot._get_first_non_missed_slot_header', get_header)
+    cc.get_block_details = Mock()
+    monkeypatch.setattr('src.utils.slot.build_blockstamp', Mock(return_value=resolved.blockstamp))
+
+    assert get_blockstamp(cc, SlotNumber(20), SlotNumber(30)) == resolved.blockstamp
+    ref_blockstamp = get_reference_blockstamp(cc, SlotNumber(20), SlotNumber(30), ref_epoch=0)
+    assert ref_blockstamp == ReferenceBlockStamp(**asdict(resolved.blockstamp), ref_slot=SlotNumber(20), ref_epoch=0)
+    get_header.assert_called_once_with(cc, 20, 30)
+    cc.get_block_details.assert_called_once_with(resolved.block_root)
+
+    # Index is persisted, so after restart slot is resolved without requests
+    cc.slots_index = SlotsIndex(tmp_path / 'slots.index', GENESIS_A)
+    assert get_blockstamp(cc, SlotNumber(20), SlotNumber(30)) == resolved.blockstamp
+    get_header.assert_called_once()
+
+    with pytest.raises(ValueError):
+        get_blockstamp(cc, SlotNumber(31), SlotNumber(30))
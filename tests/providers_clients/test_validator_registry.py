@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from src.constants import FAR_FUTURE_EPOCH
+from src.providers.consensus.registry import ValidatorRegistry, ValidatorsPubkeyIndex
+from src.providers.consensus.typings import Validator, ValidatorStatus
+from tests.providers_clients.test_consensus_client import validator_response
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def responses() -> list[dict]:
+    records = [validator_response(i) for i in range(10)]
+    records[3]['status'] = 'exited_slashed'
+    records[3]['validator'].update(slashed=True, exit_epoch='100', withdrawable_epoch='8292')
+    records[5]['balance'] = '0'
+    records[5]['validator']['withdrawal_credentials'] = '0x00' + 'ab' * 31
+    return records
+
+
+def to_validator(response: dict) -> Validator:
+    return Validator.from_response(**{**response, 'status': ValidatorStatus(response['status'])})
+
+
+@pytest.fixture
+def registry(responses) -> ValidatorRegistry:
+    return ValidatorRegistry.from_responses(responses)
+
+
+def test_registry_rows_equal_dataclasses(registry, responses):
+    expected = [to_validator(r) for r in responses]
+
+    assert len(registry) == len(expected)
+    assert list(registry) == expected
+    assert registry[3] == expected[3]
+    assert registry[-1] == expected[-1]
+    assert registry[3].status is ValidatorStatus.EXITED_SLASHED
+
+
+def test_registry_columns(registry):
+    assert registry.validator_index.dtype == np.uint64
+    assert registry.validator_index.tolist() == list(range(10))
+    assert registry.balance[5] == 0
+    assert registry.slashed.tolist() == [i == 3 for i in range(10)]
+    assert registry.exit_epoch[0] == FAR_FUTURE_EPOCH
+    assert registry.pubkey.shape == (10, 48)
+    assert registry.withdrawal_credentials.shape == (10, 32)
+    assert registry.pubkey_hex(7) == '0x' + f'{7:096x}'
+    assert registry.nbytes == 10 * (7 * 8 + 1 + 48 + 32 + 1)
+
+
+def test_registry_take(registry, responses):
+    sliced = registry[2:4]
+    assert isinstance(sliced, ValidatorRegistry)
+    assert [v.index for v in sliced] == ['2', '3']
+    assert np.shares_memory(sliced.balance, registry.balance)
+
+    slashed = registry.take(registry.slashed)
+    assert list(slashed) == [to_validator(responses[3])]
+
+    assert [v.index for v in registry.take(np.array([9, 0]))] == ['9', '0']
+
+
+def test_registry_index_error(registry):
+    with pytest.raises(IndexError):
+        registry[10]  # pylint: disable=pointless-statement
+
+
+def test_registry_from_validators(responses):
+    # Status could be both raw string and enum member
+    validators = [Validator.from_response(**r) for r in responses]
+    assert list(ValidatorRegistry.from_validators(validators)) == [to_validator(r) for r in responses]
+
+
+def test_registry_empty():
+    registry = ValidatorRegistry.from_responses([])
+    assert len(registry) == 0
+    assert not list(registry)
+    assert registry.pubkey.shape == (0, 48)
+
+
+def test_registry_invalid_pubkey(responses):
+    responses[0]['validator']['pubkey'] = '0x01'
+    with pytest.raises(ValueError, match='Expected 48 bytes'):
+        ValidatorRegistry.from_responses(responses)
+
+
+def test_pubkey_index_reused_for_other_states():
+    registry = ValidatorRegistry.from_responses(validator_response(i) for i in range(100))
+    index = ValidatorsPubkeyIndex()
+    pubkeys = [registry.pubkey_hex(i) for i in (5, 50, 99)] + ['0x' + 'ff' * 48]
+
+    assert index.find(registry, pubkeys) == [5, 50, 99, None]
+    # Older state does not contain validators appended later
+    assert index.find(registry[:60], pubkeys) == [5, 50, None, None]
+    assert index.find(list(registry[:60]), pubkeys) == [5, 50, None, None]
+
+    newer_state = ValidatorRegistry.from_responses(validator_response(i) for i in range(150))
+    assert index.find(newer_state, [newer_state.pubkey_hex(120), *pubkeys]) == [120, 5, 50, 99, None]
+
+
+def test_pubkey_index_other_registry():
+    index = ValidatorsPubkeyIndex()
+    registry = ValidatorRegistry.from_responses(validator_response(i) for i in range(10))
+    assert index.find(registry, [registry.pubkey_hex(3)]) == [3]
+
+    # Validators are reordered, so this is not a state of the indexed registry
+    other = list(reversed(list(registry)))
+    assert index.find(other, [registry.pubkey_hex(3), registry.pubkey_hex(9)]) == [6, 0]
+
+
+def test_pubkey_index_confirms_missed_pubkeys():
+    index = ValidatorsPubkeyIndex()
+    registry = ValidatorRegistry.from_responses(validator_response(i) for i in range(10))
+    assert index.find(registry, [registry.pubkey_hex(9)]) == [9]
+
+    # Only the first validator differs, so found positions and the last indexed validator still match
+    other = ValidatorRegistry.from_responses([validator_response(100)] + [validator_response(i) for i in range(1, 10)])
+    assert index.find(other, [other.pubkey_hex(0), other.pubkey_hex(9)]) == [0, 9]
+    assert index.find(list(registry), [registry.pubkey_hex(0), '0x' + 'ff' * 48]) == [0, None]
+
+
+def test_pubkey_index_maxsize():
+    index = ValidatorsPubkeyIndex(maxsize=5)
+    registry = ValidatorRegistry.from_responses(validator_response(i) for i in range(10))
+    pubkeys = [registry.pubkey_hex(i) for i in (1, 7)] + ['0x' + 'ff' * 48]
+
+    assert index.find(registry, pubkeys) == [1, 7, None]
+    assert index.find(list(registry), pubkeys) == [1, 7, None]
+    assert index.find(registry[:5], pubkeys) == [1, None, None]
@@ -0,0 +1,145 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.providers.consensus.client import ConsensusClient
+from src.providers.consensus.registry import ValidatorRegistry
+from src.providers.consensus.snapshots import HEADER, ROW_SIZE, SNAPSHOT_SUFFIX, ValidatorsSnapshotStore
+from src.providers.consensus.ssz import decode_state_validators
+from src.typings import StateRoot
+from tests.factory.blockstamp import BlockStampFactory
+from tests.local_server import StubResponse, local_server
+from tests.providers_clients.test_consensus_client import validator_response
+from tests.providers_clients.test_consensus_client_ssz import encode_state
+
+pytestmark = pytest.mark.unit
+
+ROOT_A = StateRoot('0x' + 'a' * 64)
+ROOT_B = StateRoot('0x' + 'b' * 64)
+ROOT_C = StateRoot('0x' + 'c' * 64)
+
+
+@pytest.fixture
+def records() -> list[dict]:
+    records = [validator_response(i) for i in range(10)]
+    records[4]['validator'].update(slashed=True, exit_epoch='100', withdrawable_epoch='8292')
+    records[4]['status'] = 'exited_slashed'
+    return records
+
+
+@pytest.fixture
+def registry(records) -> ValidatorRegistry:
+    return ValidatorRegistry.from_responses(records)
+
+
+def snapshot_size(count: int) -> int:
+    return HEADER.size + ROW_SIZE * count
+
+
+def test_save_and_load(tmp_path, registry):
+    store = ValidatorsSnapshotStore(tmp_path, 10 ** 6)
+    assert store.load(ROOT_A) is None
+
+    store.save(ROOT_A, registry)
+    loaded = store.load(ROOT_A)
+
+    assert loaded is not None
+    assert list(loaded) == list(registry)
+    assert (tmp_path / f'{ROOT_A}{SNAPSHOT_SUFFIX}').stat().st_size == snapshot_size(len(registry))
+    # Columns are mapped from the file
+    assert not loaded.exit_epoch.flags.owndata
+
+
+def test_concurrent_saves_of_the_same_snapshot(tmp_path, registry):
+    # Processes sharing the cache directory are emulated with separate stores
+    stores = [ValidatorsSnapshotStore(tmp_path, 10 ** 6) for _ in range(8)]
+
+    with ThreadPoolExecutor(max_workers=len(stores)) as executor:
+        list(executor.map(lambda store: store.save(ROOT_A, registry), stores))
+
+    loaded = ValidatorsSnapshotStore(tmp_path, 10 ** 6).load(ROOT_A)
+    assert loaded is not None
+    assert list(loaded) == list(registry)
+    assert [file.name for file in tmp_path.iterdir()] == [f'{ROOT_A}{SNAPSHOT_SUFFIX}']
+
+
+def test_save_ssz_registry(tmp_path, records):
+    # Columns of SSZ registry are strided views into the state
+    registry = decode_state_validators(memoryview(encode_state(records)))
+    store = ValidatorsSnapshotStore(tmp_path, 10 ** 6)
+
+    store.save(ROOT_A, registry)
+
+    assert list(store.load(ROOT_A)) == list(registry)
+
+
+def test_save_and_load_empty(tmp_path):
+    store = ValidatorsSnapshotStore(tmp_path, 10 ** 6)
+    store.save(ROOT_A, ValidatorRegistry.from_responses([]))
+    assert len(store.load(ROOT_A)) == 0
+
+
+@pytest.mark.parametrize('content', [b'', b'LOVS', b'XXXX' + b'\x00' * 12, HEADER.pack(b'LOVS', 1, 2) + b'\x00'])
+def test_load_broken_snapshot(tmp_path, content):
+    store = ValidatorsSnapshotStore(tmp_path, 10 ** 6)
+    file_path = tmp_path / f'{ROOT_A}{SNAPSHOT_SUFFIX}'
+    file_path.write_bytes(content)
+
+    assert store.load(ROOT_A) is None
+    assert not file_path.exists()
+
+
+def test_not_a_state_root(tmp_path, registry):
+    store = ValidatorsSnapshotStore(tmp_path, 10 ** 6)
+    store.save(StateRoot('../head'), registry)
+
+    assert store.load(StateRoot('../head')) is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_snapshot_bigger_than_max_size(tmp_path, registry):
+    store = ValidatorsSnapshotStore(tmp_path, snapshot_size(len(registry)) - 1)
+    store.save(ROOT_A, registry)
+    assert store.load(ROOT_A) is None
+
+
+def test_least_recently_used_eviction(tmp_path, registry):
+    store = ValidatorsSnapshotStore(tmp_path, 2 * snapshot_size(len(registry)))
+
+    store.save(ROOT_A, registry)
+    store.save(ROOT_B, registry)
+    os.utime(tmp_path / f'{ROOT_A}{SNAPSHOT_SUFFIX}', (1, 1))
+    os.utime(tmp_path / f'{ROOT_B}{SNAPSHOT_SUFFIX}', (2, 2))
+    # A becomes the most recently used
+    assert store.load(ROOT_A) is not None
+
+    store.save(ROOT_C, registry)
+
+    assert store.load(ROOT_B) is None
+    assert store.load(ROOT_A) is not None
+    assert store.load(ROOT_C) is not None
+
+
+def test_consensus_client_uses_snapshots(tmp_path, records):
+    blockstamp = BlockStampFactory.build()
+    routes = {
+        f'eth/v1/beacon/states/{blockstamp.state_root}/validators': lambda _: StubResponse.json({'data': records}),
+    }
+
+    with local_server(routes) as server:
+        client = ConsensusClient(server.url)
+        client.validators_snapshots = ValidatorsSnapshotStore(tmp_path, 10 ** 6)
+        downloaded = client.get_validators_no_cache(blockstamp)
+
+        restarted_client = ConsensusClient(server.url)
+        restarted_client.validators_snapshots = ValidatorsSnapshotStore(tmp_path, 10 ** 6)
+        loaded = restarted_client.get_validators_no_cache(blockstamp)
+
+        restarted_client.get_validators_no_cache(blockstamp, pub_keys=records[0]['validator']['pubkey'])
+
+    assert len(server.requests) == 2
+    assert server.requests[1].query == {'id': [records[0]['validator']['pubkey']]}
+    assert list(loaded) == list(downloaded)
+    assert np.array_equal(loaded.pubkey, downloaded.pubkey)
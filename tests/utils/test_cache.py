@@ -0,0 +1,133 @@
+import gc
+import weakref
+
+import pytest
+
+from src.metrics.prometheus.basic import CACHE_HITS, CACHE_MISSES, CACHE_SIZE
+from src.providers.consensus.client import ConsensusClient
+from src.providers.keys.client import KeysAPIClient
+from src.utils.cache import REGISTRY_REGION_SIZE, CacheManager, cached
+from src.web3py.extensions.lido_validators import LidoValidatorsProvider
+from tests.factory.blockstamp import BlockStampFactory
+
+pytestmark = pytest.mark.unit
+
+
+def metric_value(metric, region: str) -> float:
+    return metric.labels(region=region)._value.get()  # pylint: disable=protected-access
+
+
+def blockstamps(count: int) -> list:
+    return [BlockStampFactory.build(slot_number=slot) for slot in range(count)]
+
+
+def make_provider(manager: CacheManager, region: str, maxsize: int = 2):
+    class Provider:
+        def __init__(self):
+            self.calls = []
+
+        @cached(region=region, maxsize=maxsize, manager=manager)
+        def get_data(self, blockstamp, extra=None):
+            self.calls.append(blockstamp)
+            return {'slot': blockstamp.slot_number, 'extra': extra}
+
+    return Provider()
+
+
+def test_alternating_blockstamps_are_cached():
+    provider = make_provider(CacheManager(), 'test_alternating')
+    reference, historical = blockstamps(2)
+
+    for _ in range(3):
+        provider.get_data(reference)
+        provider.get_data(historical)
+
+    assert provider.calls == [reference, historical]
+    assert provider.get_data(reference, extra=1) == {'slot': reference.slot_number, 'extra': 1}
+    # Least recently used entry is evicted
+    provider.get_data(historical)
+    provider.get_data(reference)
+    assert provider.calls == [reference, historical, reference, reference]
+
+
+def test_registry_regions_keep_one_entry():
+    for method in (
+        ConsensusClient.get_validators,
+        KeysAPIClient.get_all_lido_keys,
+        LidoValidatorsProvider.get_lido_validators,
+        LidoValidatorsProvider.get_lido_validators_by_node_operators,
+    ):
+        assert method.cache_region.maxsize == REGISTRY_REGION_SIZE == 1  # type: ignore[attr-defined]
+
+
+def test_region_size_is_configurable():
+    manager = CacheManager({'test_sized': 3})
+    provider = make_provider(manager, 'test_sized')
+    sized_blockstamps = blockstamps(3)
+
+    for _ in range(2):
+        for blockstamp in sized_blockstamps:
+            provider.get_data(blockstamp)
+
+    assert manager.regions['test_sized'].maxsize == 3
+    assert provider.calls == sized_blockstamps
+
+
+def test_metrics():
+    region = 'test_metrics'
+    manager = CacheManager()
+    provider = make_provider(manager, region)
+    blockstamp = BlockStampFactory.build()
+    hits, misses = metric_value(CACHE_HITS, region), metric_value(CACHE_MISSES, region)
+
+    provider.get_data(blockstamp)
+    provider.get_data(blockstamp)
+
+    assert metric_value(CACHE_HITS, region) == hits + 1
+    assert metric_value(CACHE_MISSES, region) == misses + 1
+    assert metric_value(CACHE_SIZE, region) == 1
+
+    manager.clear()
+    assert metric_value(CACHE_SIZE, region) == 0
+
+
+def test_instance_is_not_kept_alive():
+    manager = CacheManager()
+    provider = make_provider(manager, 'test_weakref')
+    blockstamp = BlockStampFactory.build()
+    provider.get_data(blockstamp)
+    provider_ref = weakref.ref(provider)
+
+    del provider
+    gc.collect()
+
+    assert provider_ref() is None
+    # Results of different instances are not mixed
+    another = make_provider(manager, 'test_weakref')
+    another.get_data(blockstamp)
+    assert another.calls == [blockstamp]
+
+
+def test_entries_are_evicted_by_generation():
+    manager = CacheManager()
+    provider = make_provider(manager, 'test_generation', maxsize=10)
+    old, last_report, reference = blockstamps(3)
+
+    manager.set_generation(100)
+    provider.get_data(old)
+    provider.get_data(last_report)
+
+    manager.set_generation(200)
+    provider.get_data(last_report)
+    provider.get_data(reference)
+    # The same frame does not start new generation
+    manager.set_generation(200)
+    assert len(manager.regions['test_generation']) == 3
+
+    manager.set_generation(300)
+    # Entries not used in the previous frame are dropped
+    assert len(manager.regions['test_generation']) == 2
+    provider.get_data(last_report)
+    provider.get_data(reference)
+    provider.get_data(old)
+    assert provider.calls == [old, last_report, reference, old]
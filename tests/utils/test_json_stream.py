@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from src.utils.json_stream import iter_json_array_field
+
+pytestmark = pytest.mark.unit
+
+
+def chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 10 ** 6])
+def test_iter_json_array_field_any_chunk_size(chunk_size):
+    response = {
+        'execution_optimistic': False,
+        'meta': {'nested': [1, {'data': []}], 'number': 12345},
+        'data': [{'index': str(i), 'balance': 32 * 10 ** 9 + i, 'name': 'тест'} for i in range(20)],
+        'finalized': True,
+    }
+
+    items = list(iter_json_array_field(chunked(json.dumps(response).encode(), chunk_size)))
+
+    assert items == response['data']
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 1000])
+def test_iter_json_array_field_numbers_on_chunk_border(chunk_size):
+    body = b'{"count": 1234567, "data": [1234567, 89, 1.5e10]}'
+
+    assert list(iter_json_array_field(chunked(body, chunk_size))) == [1234567, 89, 1.5e10]
+
+
+def test_iter_json_array_field_empty_array():
+    assert not list(iter_json_array_field([b'{"data": [ ] }']))
+
+
+def test_iter_json_array_field_no_field():
+    with pytest.raises(ValueError, match='Expected array field "data"'):
+        list(iter_json_array_field([b'{"meta": {}}']))
+
+
+def test_iter_json_array_field_not_an_array():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array_field([b'{"data": {"index": "1"}}']))
+
+
+def test_iter_json_array_field_truncated_body():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array_field([b'{"data": [{"index": "1"}, {"ind']))
+
+
+def test_iter_json_array_field_is_lazy():
+    def chunks():
+        yield b'{"data": [{"index": "1"},'
+        raise AssertionError('Second chunk should not be read')
+
+    assert next(iter_json_array_field(chunks())) == {'index': '1'}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1000])
+def test_iter_json_array_field_nested_with_other_fields(chunk_size):
+    response = {
+        'data': {'module': {'id': 1, 'keys': ['not this one']}, 'keys': [{'key': '0x1'}, {'key': '0x2'}]},
+        'meta': {'elBlockSnapshot': {'blockNumber': 10}},
+    }
+    other_fields: dict = {}
+
+    items = list(iter_json_array_field(chunked(json.dumps(response).encode(), chunk_size), 'data.keys', other_fields))
+
+    assert items == response['data']['keys']
+    assert other_fields == {'data': {'module': response['data']['module']}, 'meta': response['meta']}
+
+
+def test_iter_json_array_field_nested_no_field():
+    with pytest.raises(ValueError, match='Expected array field "data.keys"'):
+        list(iter_json_array_field([b'{"data": {"module": {}}, "keys": []}'], 'data.keys'))
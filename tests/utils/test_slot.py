@@ -1,11 +1,14 @@
 # ------ Get first non missed slot ------------
+import threading
 from http import HTTPStatus
 from unittest.mock import Mock
 
 import pytest
 
+from src.providers.consensus.typings import BlockHeaderFullResponse, BlockHeaderResponseData
 from src.providers.http_provider import NotOkResponse
-from src.utils.slot import NoSlotsAvailable, get_first_non_missed_slot
+from src.typings import SlotNumber
+from src.utils.slot import MISSED_SLOTS_PROBE_WINDOW, NoSlotsAvailable, get_first_non_missed_slot
 from tests.conftest import get_blockstamp_by_state
 
 
@@ -26,16 +29,17 @@ def test_get_first_non_missed_slot(web3, consensus_client):
 
 @pytest.mark.unit
 def test_get_third_non_missed_slot(web3, consensus_client):
-    def get_block_header(_):
-        setattr(get_block_header, "call_count", getattr(get_block_header, "call_count", 0) + 1)
-        if getattr(get_block_header, "call_count") == 3:
-            web3.cc.get_block_header = original
-        raise NotOkResponse("No slots", status=HTTPStatus.NOT_FOUND, text="text")
+    # Slots are requested concurrently, so missed ones are picked by number, not by calls order
+    def get_block_header(state_id):
+        if state_id in (139456, 139457, 139458):
+            raise NotOkResponse("No slots", status=HTTPStatus.NOT_FOUND, text="text")
+        return original(state_id)
 
     finalized_blockstamp = get_blockstamp_by_state(web3, 'finalized')
 
-    original = web3.cc.get_block_header
+    original = web3.cc.get_block_header_no_cache
     web3.cc.get_block_header = Mock(side_effect=get_block_header)
+    web3.cc.get_block_header_no_cache = web3.cc.get_block_header
     slot_details = get_first_non_missed_slot(
         web3.cc,
         slot=139456,
@@ -50,9 +54,84 @@ def test_get_third_non_missed_slot(web3, consensus_client):
 def test_all_slots_are_missed(web3, consensus_client):
     finalized_blockstamp = get_blockstamp_by_state(web3, 'finalized')
     web3.cc.get_block_header = Mock(side_effect=NotOkResponse("No slots", status=HTTPStatus.NOT_FOUND, text="text"))
+    web3.cc.get_block_header_no_cache = web3.cc.get_block_header
     with pytest.raises(NoSlotsAvailable):
         get_first_non_missed_slot(
             cc=web3.cc,
             slot=finalized_blockstamp.ref_slot,
             last_finalized_slot_number=finalized_blockstamp.ref_slot + 50,
         )
+
+
+@pytest.mark.unit
+def test_missed_slots_probed_by_windows():
+    headers = {slot: _header(slot) for slot in (14, 17)}
+
+    def get_block_header(state_id):
+        if isinstance(state_id, str):
+            return _header(10)
+        if state_id == 16:
+            raise NotOkResponse("Internal error", status=HTTPStatus.INTERNAL_SERVER_ERROR, text="text")
+        if state_id not in headers:
+            raise NotOkResponse("No slots", status=HTTPStatus.NOT_FOUND, text="text")
+        return headers[state_id]
+
+    cc = Mock()
+    cc.get_block_header = Mock(side_effect=get_block_header)
+    cc.get_block_header_no_cache = Mock(side_effect=get_block_header)
+    cc.get_block_details = Mock(side_effect=lambda root: root)
+
+    # 14 is the first existed slot, error of the slot after it is ignored
+    assert get_first_non_missed_slot(cc, slot=SlotNumber(11), last_finalized_slot_number=SlotNumber(30)) == '0x10'
+    # Only the ref slot and the finally taken header are requested through the cache
+    assert [c.args[0] for c in cc.get_block_header.call_args_list] == [11, _header(14).data.header.message.parent_root]
+    probed = [c.args[0] for c in cc.get_block_header_no_cache.call_args_list]
+    assert sorted(probed) == list(range(12, 12 + MISSED_SLOTS_PROBE_WINDOW))
+
+    # Error of the slot before the first existed one is raised
+    with pytest.raises(NotOkResponse, match="Internal error"):
+        get_first_non_missed_slot(cc, slot=SlotNumber(15), last_finalized_slot_number=SlotNumber(30))
+
+    # Window is cut by the last finalized slot
+    cc.get_block_header_no_cache.reset_mock()
+    with pytest.raises(NoSlotsAvailable):
+        get_first_non_missed_slot(cc, slot=SlotNumber(18), last_finalized_slot_number=SlotNumber(20))
+    assert sorted(c.args[0] for c in cc.get_block_header_no_cache.call_args_list) == [19, 20]
+
+
+@pytest.mark.unit
+def test_ref_slot_probed_in_calling_thread():
+    threads = []
+
+    def get_block_header(state_id):
+        threads.append(threading.current_thread())
+        return _header(state_id)
+
+    cc = Mock()
+    cc.get_block_header = Mock(side_effect=get_block_header)
+    cc.get_block_details = Mock(side_effect=lambda root: root)
+
+    assert get_first_non_missed_slot(cc, slot=SlotNumber(11), last_finalized_slot_number=SlotNumber(30)) == '0x11'
+    assert threads == [threading.current_thread()]
+    cc.get_block_header_no_cache.assert_not_called()
+
+
+def _header(slot: int) -> BlockHeaderFullResponse:
+    return BlockHeaderFullResponse.from_response(
+        execution_optimistic=False,
+        finalized=True,
+        data=BlockHeaderResponseData.from_response(
+            root=f'0x{slot}',
+            canonical=True,
+            header={
+                'message': {
+                    'slot': str(slot),
+                    'proposer_index': '0',
+                    'parent_root': f'0xparent{slot}',
+                    'state_root': '0x',
+                    'body_root': '0x',
+                },
+                'signature': '0x',
+            },
+        ),
+    )
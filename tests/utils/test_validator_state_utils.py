@@ -1,25 +1,46 @@
 import pytest
+from hypothesis import given, strategies as st
 
-from src.constants import FAR_FUTURE_EPOCH
+from src.constants import FAR_FUTURE_EPOCH, MAX_EFFECTIVE_BALANCE, SHARD_COMMITTEE_PERIOD
+from src.providers.consensus.registry import ValidatorRegistry
 from src.providers.consensus.typings import Validator, ValidatorStatus, ValidatorState
 from src.typings import EpochNumber
-from src.utils.validator_state import calculate_active_effective_balance_sum, is_on_exit, get_validator_age
+from src.utils.validator_state import (
+    active_validators_mask,
+    calculate_active_effective_balance_sum,
+    eth1_withdrawal_credential_mask,
+    exited_validators_mask,
+    fully_withdrawable_validators_mask,
+    get_validator_age,
+    has_eth1_withdrawal_credential,
+    is_active_validator,
+    is_exited_validator,
+    is_fully_withdrawable_validator,
+    is_on_exit,
+    is_partially_withdrawable_validator,
+    is_validator_eligible_to_exit,
+    on_exit_mask,
+    partially_withdrawable_validators_mask,
+    validators_eligible_to_exit_mask,
+)
+
+def simple_validator(index: int, status: ValidatorStatus, effective_balance: str, slashed: bool, exit_epoch: str) -> Validator:
+    return Validator(
+        str(index), '1', status,
+        ValidatorState(f'0x{index:096x}', '0x' + '00' * 32, effective_balance, slashed, '0', '1', exit_epoch, exit_epoch),
+    )
+
 
 test_data_calculate_total_effective_balance = [
     (
-        {'0x0': Validator('0', '1', ValidatorStatus.ACTIVE_ONGOING,
-                          ValidatorState('0x0', '', '2', False, '', '1', '100500', '')),
-         '0x1': Validator('1', '1', ValidatorStatus.ACTIVE_EXITING,
-                          ValidatorState('0x1', '', '3', False, '', '1', '100500', '')),
-         '0x2': Validator('2', '1', ValidatorStatus.ACTIVE_SLASHED,
-                          ValidatorState('0x2', '', '4', True, '', '1', '100500', ''))},
+        {'0x0': simple_validator(0, ValidatorStatus.ACTIVE_ONGOING, '2', False, '100500'),
+         '0x1': simple_validator(1, ValidatorStatus.ACTIVE_EXITING, '3', False, '100500'),
+         '0x2': simple_validator(2, ValidatorStatus.ACTIVE_SLASHED, '4', True, '100500')},
         9,
     ),
     (
-        {'0x0': Validator('0', '1', ValidatorStatus.ACTIVE_ONGOING,
-                          ValidatorState('0x0', '', '2', False, '', '1', '100500', '')),
-         '0x1': Validator('1', '1', ValidatorStatus.EXITED_SLASHED,
-                          ValidatorState('0x1', '', '2', True, '', '1', '200', ''))},
+        {'0x0': simple_validator(0, ValidatorStatus.ACTIVE_ONGOING, '2', False, '100500'),
+         '0x1': simple_validator(1, ValidatorStatus.EXITED_SLASHED, '2', True, '200')},
         2,
     ),
 ]
@@ -59,3 +80,53 @@ def test_get_validator_age(validator_activation_epoch, ref_epoch, expected_resul
     validator.validator = object.__new__(ValidatorState)
     validator.validator.activation_epoch = validator_activation_epoch
     assert get_validator_age(validator, ref_epoch) == expected_result
+
+
+# Border values are much more interesting than uniformly distributed ones
+epochs = st.sampled_from([0, 1, SHARD_COMMITTEE_PERIOD, FAR_FUTURE_EPOCH - 1, FAR_FUTURE_EPOCH]) | st.integers(0, 2 ** 64 - 1)
+balances = st.sampled_from([0, MAX_EFFECTIVE_BALANCE - 1, MAX_EFFECTIVE_BALANCE, MAX_EFFECTIVE_BALANCE + 1]) | st.integers(0, 2 ** 40)
+
+
+@st.composite
+def validators_strategy(draw, index: int) -> Validator:
+    return Validator(
+        index=str(index),
+        balance=str(draw(balances)),
+        status=draw(st.sampled_from(ValidatorStatus)),
+        validator=ValidatorState(
+            pubkey='0x' + draw(st.binary(min_size=48, max_size=48)).hex(),
+            withdrawal_credentials=draw(st.sampled_from(['0x00', '0x01', '0x02', '0x10'])) + draw(
+                st.binary(min_size=31, max_size=31)
+            ).hex(),
+            effective_balance=str(draw(balances)),
+            slashed=draw(st.booleans()),
+            activation_eligibility_epoch=str(draw(epochs)),
+            activation_epoch=str(draw(epochs)),
+            exit_epoch=str(draw(epochs)),
+            withdrawable_epoch=str(draw(epochs)),
+        ),
+    )
+
+
+@st.composite
+def registries(draw) -> list[Validator]:
+    size = draw(st.integers(0, 30))
+    return [draw(validators_strategy(i)) for i in range(size)]
+
+
+@pytest.mark.unit
+@given(validators=registries(), epoch=epochs)
+def test_batch_predicates_match_single_ones(validators: list[Validator], epoch: int):
+    registry = ValidatorRegistry.from_validators(validators)
+
+    def expected(predicate, *args) -> list[bool]:
+        return [predicate(v, *args) for v in validators]
+
+    assert active_validators_mask(registry, epoch).tolist() == expected(is_active_validator, epoch)
+    assert exited_validators_mask(registry, epoch).tolist() == expected(is_exited_validator, epoch)
+    assert on_exit_mask(registry).tolist() == expected(is_on_exit)
+    assert eth1_withdrawal_credential_mask(registry).tolist() == expected(has_eth1_withdrawal_credential)
+    assert partially_withdrawable_validators_mask(registry).tolist() == expected(is_partially_withdrawable_validator)
+    assert fully_withdrawable_validators_mask(registry, epoch).tolist() == expected(is_fully_withdrawable_validator, epoch)
+    assert validators_eligible_to_exit_mask(registry, epoch).tolist() == expected(is_validator_eligible_to_exit, epoch)
+    assert calculate_active_effective_balance_sum(registry, epoch) == calculate_active_effective_balance_sum(validators, epoch)
@@ -0,0 +1,111 @@
+import json
+from urllib.parse import urlparse
+
+import pytest
+from web3 import Web3
+
+from src.metrics.prometheus.basic import EL_REQUESTS_DURATION
+from src.web3py.batch_provider import BatchMultiProvider, batch_requests
+from src.web3py.middleware import metrics_collector
+from tests.local_server import StubResponse, local_server
+
+pytestmark = pytest.mark.unit
+
+ADDRESSES = ['0x' + f'{i:040x}' for i in range(1, 4)]
+
+
+def rpc_result(method: str, params: list):
+    if method == 'eth_getBalance':
+        return hex(int(params[0], 16) * 10)
+    if method == 'eth_chainId':
+        return '0x1'
+    raise ValueError(method)
+
+
+def rpc_response(request: dict) -> dict:
+    return {'jsonrpc': '2.0', 'id': request['id'], 'result': rpc_result(request['method'], request['params'])}
+
+
+def rpc_route(request) -> StubResponse:
+    body = json.loads(request.body)
+    if isinstance(body, list):
+        # Answer in reverse order, responses should be matched by id
+        return StubResponse.json([rpc_response(item) for item in reversed(body)])
+    return StubResponse.json(rpc_response(body))
+
+
+def batches(server) -> list:
+    return [json.loads(request.body) for request in server.requests]
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    yield
+    EL_REQUESTS_DURATION.clear()
+
+
+def test_requests_are_sent_in_one_batch():
+    with local_server({'rpc': rpc_route}) as server:
+        w3 = Web3(BatchMultiProvider([f'{server.url}/rpc']), middlewares=[metrics_collector])
+
+        results = batch_requests(w3, [
+            lambda: w3.eth.get_balance(ADDRESSES[0]),
+            lambda: w3.eth.get_balance(ADDRESSES[1]),
+            lambda: w3.eth.chain_id,
+        ])
+
+    assert results == [10, 20, 1]
+    # Requests order in batch depends on threads
+    assert [sorted(item['method'] for item in batch) for batch in batches(server)] == [
+        ['eth_chainId', 'eth_getBalance', 'eth_getBalance'],
+    ]
+    # Metrics are collected per request
+    counts = {
+        (sample.labels['endpoint'], sample.labels['call_to'])
+        for sample in EL_REQUESTS_DURATION.collect()[0].samples
+        if sample.name.endswith('_count') and sample.value == 1
+    }
+    assert counts == {('eth_getBalance', ADDRESSES[0]), ('eth_getBalance', ADDRESSES[1]), ('eth_chainId', '')}
+
+
+def test_dependent_requests_are_sent_in_next_batch():
+    def sum_balances():
+        return w3.eth.get_balance(ADDRESSES[0]) + w3.eth.get_balance(ADDRESSES[1])
+
+    with local_server({'rpc': rpc_route}) as server:
+        w3 = Web3(BatchMultiProvider([f'{server.url}/rpc']))
+        results = batch_requests(w3, [sum_balances, lambda: w3.eth.get_balance(ADDRESSES[2])])
+
+    assert results == [30, 30]
+    sent = batches(server)
+    assert len(sent) == 2
+    assert sorted(item['params'][0] for item in sent[0]) == [ADDRESSES[0], ADDRESSES[2]]
+    # The last request is not wrapped into array
+    assert sent[1]['params'][0] == ADDRESSES[1]
+
+
+def test_batch_fails_over_to_next_provider():
+    routes = {'broken': lambda _: StubResponse(500, b'Internal error'), 'rpc': rpc_route}
+
+    with local_server(routes) as server:
+        w3 = Web3(BatchMultiProvider([f'{server.url}/broken', f'{server.url}/rpc']))
+        results = batch_requests(w3, [lambda: w3.eth.get_balance(ADDRESSES[0]), lambda: w3.eth.chain_id])
+
+    assert results == [10, 1]
+    assert urlparse(w3.provider.endpoint_uri).path == '/rpc'
+    assert [request.path for request in server.requests] == ['/broken', '/rpc']
+
+
+def test_batch_is_not_supported():
+    def route(request) -> StubResponse:
+        body = json.loads(request.body)
+        if isinstance(body, list):
+            return StubResponse.json({'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600, 'message': 'No batch'}})
+        return StubResponse.json(rpc_response(body))
+
+    with local_server({'rpc': route}) as server:
+        w3 = Web3(BatchMultiProvider([f'{server.url}/rpc']))
+        results = batch_requests(w3, [lambda: w3.eth.get_balance(ADDRESSES[0]), lambda: w3.eth.chain_id])
+
+    assert results == [10, 1]
+    assert len(server.requests) == 3
@@ -0,0 +1,135 @@
+from typing import Any
+
+import pytest
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+from web3._utils.contracts import find_matching_event_abi
+from web3.providers import BaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from src.metrics.prometheus.basic import CACHE_SIZE
+from src.web3py.events_index import REGION, EventsIndex
+from src.web3py.extensions.contracts import LidoContracts
+
+pytestmark = pytest.mark.unit
+
+LIDO_ADDRESS = '0x' + '1' * 40
+FINALIZED_BLOCK = 100
+
+
+class LogsProvider(BaseProvider):
+    """Answers eth_getLogs from the prepared logs, refuses to return more than max_logs of them"""
+    def __init__(self, logs: list[dict], max_logs: int = 1000):
+        self.logs = logs
+        self.max_logs = max_logs
+        self.requests: list[tuple[int, int]] = []
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method == 'eth_chainId':
+            return {'jsonrpc': '2.0', 'id': 0, 'result': '0x1'}
+        if method == 'eth_getBlockByNumber':
+            assert params[0] == 'finalized'
+            return {'jsonrpc': '2.0', 'id': 0, 'result': {'number': hex(FINALIZED_BLOCK)}}  # type: ignore[typeddict-item]
+
+        assert method == 'eth_getLogs'
+        from_block, to_block = int(params[0]['fromBlock'], 16), int(params[0]['toBlock'], 16)
+        self.requests.append((from_block, to_block))
+        logs = [log for log in self.logs if from_block <= int(log['blockNumber'], 16) <= to_block]
+        if len(logs) > self.max_logs:
+            return {'jsonrpc': '2.0', 'id': 0, 'error': {'code': -32005, 'message': 'query returned more than 1 results'}}
+        return {'jsonrpc': '2.0', 'id': 0, 'result': logs}  # type: ignore[typeddict-item]
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+
+@pytest.fixture()
+def lido():
+    return Web3().eth.contract(address=Web3.to_checksum_address(LIDO_ADDRESS), abi=LidoContracts.load_abi('Lido'))
+
+
+def eth_distributed_log(lido, block_number: int) -> dict:
+    event_abi = find_matching_event_abi(lido.abi, event_name='ETHDistributed')
+    return {
+        'address': LIDO_ADDRESS,
+        'topics': [
+            Web3.to_hex(event_abi_to_log_topic(event_abi)),
+            Web3.to_hex(lido.w3.codec.encode(['uint256'], [block_number * 12])),
+        ],
+        'data': Web3.to_hex(lido.w3.codec.encode(['uint256'] * 5, [block_number, 2, 3, 4, 5])),
+        'blockNumber': hex(block_number),
+        'blockHash': '0x' + f'{block_number:064x}',
+        'transactionHash': '0x' + f'{block_number:064x}',
+        'transactionIndex': '0x0',
+        'logIndex': '0x0',
+        'removed': False,
+    }
+
+
+def index_size() -> float:
+    return CACHE_SIZE.labels(region=REGION)._value.get()  # pylint: disable=protected-access
+
+
+def use_provider(lido, provider: LogsProvider):
+    lido.w3.provider = provider
+    return lido.events.ETHDistributed
+
+
+def test_indexed_blocks_are_not_requested_again(lido, tmp_path):
+    provider = LogsProvider([eth_distributed_log(lido, block) for block in (10, 20, 30, 40)])
+    event = use_provider(lido, provider)
+    index = EventsIndex(tmp_path / 'events.sqlite')
+
+    events = index.get_events(event, 15, 35)
+    assert [e['blockNumber'] for e in events] == [20, 30]
+    assert events[0]['args']['reportTimestamp'] == 20 * 12
+    assert events[0]['args']['preCLBalance'] == 20
+    assert events[0]['transactionHash'] == lido.w3.to_bytes(hexstr='0x' + f'{20:064x}')
+
+    # Only new blocks are requested, logs of both ranges are answered from the index
+    events = index.get_events(event, 5, 45)
+    assert [e['blockNumber'] for e in events] == [10, 20, 30, 40]
+    assert provider.requests == [(15, 35), (5, 14), (36, 45)]
+
+    # Index is reused after restart
+    events = EventsIndex(tmp_path / 'events.sqlite').get_events(event, 10, 30)
+    assert [e['blockNumber'] for e in events] == [10, 20, 30]
+    assert len(provider.requests) == 3
+
+
+def test_not_finalized_blocks_are_not_indexed(lido):
+    provider = LogsProvider([eth_distributed_log(lido, block) for block in (90, 110)])
+    event = use_provider(lido, provider)
+    index = EventsIndex()
+
+    for _ in range(2):
+        events = index.get_events(event, 80, 120)
+        assert [e['blockNumber'] for e in events] == [90, 110]
+
+    assert provider.requests == [(80, 100), (101, 120), (101, 120)]
+
+
+def test_range_is_split_if_node_limits_logs(lido):
+    provider = LogsProvider([eth_distributed_log(lido, block) for block in (10, 11, 40)], max_logs=1)
+    event = use_provider(lido, provider)
+    index = EventsIndex()
+    index.MAX_BLOCKS_RANGE = 50
+
+    events = index.get_events(event, 0, 99)
+
+    assert [e['blockNumber'] for e in events] == [10, 11, 40]
+    assert provider.requests == [
+        (0, 49), (0, 24), (0, 12), (0, 6), (7, 12), (7, 9), (10, 12), (10, 11), (10, 10), (11, 11), (12, 12),
+        (13, 24), (25, 49), (50, 99),
+    ]
+
+    assert index_size() == 3
+
+    # Requested range far from the indexed one starts the index again
+    provider.logs.append(eth_distributed_log(lido, 2000))
+    index._finalized_block_number = 3000  # pylint: disable=protected-access
+    assert [e['blockNumber'] for e in index.get_events(event, 1000, 3000)] == [2000]
+    assert index_size() == 1
+    requests_count = len(provider.requests)
+    assert [e['blockNumber'] for e in index.get_events(event, 10, 11)] == [10, 11]
+    assert provider.requests[requests_count] == (10, 11)
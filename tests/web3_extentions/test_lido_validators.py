@@ -1,9 +1,13 @@
+from dataclasses import asdict
 from unittest.mock import Mock
 
 import pytest
 
+from src.providers.consensus.registry import ValidatorRegistry
+from src.web3py.extensions.lido_validators import LidoValidator
 from tests.factory.blockstamp import ReferenceBlockStampFactory
 from tests.factory.no_registry import ValidatorFactory, LidoKeyFactory
+from tests.providers_clients.test_consensus_client import validator_response
 
 blockstamp = ReferenceBlockStampFactory.build()
 
@@ -49,3 +53,24 @@ def test_get_lido_validators_by_node_operator(web3, lido_validators, contracts):
     assert len(no_validators.keys()) == 2
     assert len(no_validators[(1, 0)]) == 10
     assert len(no_validators[(1, 1)]) == 7
+
+
+@pytest.mark.unit
+def test_merge_validators_with_keys(web3, lido_validators):
+    registry = ValidatorRegistry.from_responses(validator_response(i) for i in range(30))
+    validators = list(registry)
+    lido_keys = LidoKeyFactory.generate_for_validators(validators[10:20])
+    lido_keys.extend(LidoKeyFactory.batch(5))
+
+    merged = web3.lido_validators.merge_validators_with_keys(lido_keys, validators)
+
+    assert [v.index for v in merged] == [str(i) for i in range(10, 20)]
+    for lido_validator, key, validator in zip(merged, lido_keys, validators[10:20]):
+        assert lido_validator.lido_id is key
+        # Validator state is referenced, not copied
+        assert lido_validator.validator is validator.validator
+        assert lido_validator == LidoValidator(lido_id=key, **asdict(validator))
+
+    assert web3.lido_validators.merge_validators_with_keys(lido_keys, registry) == merged
+    # Previous state of the same registry
+    assert web3.lido_validators.merge_validators_with_keys(lido_keys, registry[:15]) == merged[:5]
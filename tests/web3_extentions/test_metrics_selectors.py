@@ -0,0 +1,33 @@
+import pytest
+from web3 import Web3
+
+from src.metrics.prometheus.basic import EL_REQUESTS_DURATION
+from src.web3py.extensions.contracts import LidoContracts
+from src.web3py.middleware import metrics_collector
+
+pytestmark = pytest.mark.unit
+
+ADDRESS = '0x' + '1' * 40
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    yield
+    EL_REQUESTS_DURATION.clear()
+
+
+def test_call_method_label():
+    w3 = Web3()
+    config = w3.eth.contract(address=ADDRESS, abi=LidoContracts.load_abi('OracleDaemonConfig'))
+    middleware = metrics_collector(lambda method, params: {'jsonrpc': '2.0', 'id': 0, 'result': '0x'}, w3)
+
+    # Call data with arguments
+    middleware('eth_call', [{'to': ADDRESS, 'data': config.encodeABI('get', ['KEY'])}, 'latest'])
+    middleware('eth_call', [{'to': ADDRESS, 'data': '0xdeadbeef'}, 'latest'])
+
+    labels = {
+        sample.labels['call_method']
+        for sample in EL_REQUESTS_DURATION.collect()[0].samples
+        if sample.name.endswith('_count')
+    }
+    assert labels == {'get', ''}
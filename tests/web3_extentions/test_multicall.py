@@ -0,0 +1,140 @@
+from typing import Any, Optional
+
+import pytest
+from eth_utils import to_bytes
+from web3.exceptions import ContractLogicError
+from web3.providers import BaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+import src.variables
+from src.web3py.contract_tweak import tweak_w3_contracts
+from src.web3py.extensions.contracts import LidoContracts
+from src.web3py.multicall import aggregate_calls
+from src.web3py.typings import Web3
+
+pytestmark = pytest.mark.unit
+
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+CONFIG_ADDRESS = '0x' + '1' * 40
+SANITY_CHECKER_ADDRESS = '0x' + '2' * 40
+BLOCK_HASH = '0x' + 'ab' * 32
+
+
+class EVMStandIn(BaseProvider):
+    """Answers eth_call with prepared return data by call data, executes Multicall3.aggregate3 calls the same way"""
+    def __init__(self, w3: Web3):
+        self.w3 = w3
+        self.calls: list[dict[str, Any]] = []
+        self.return_data: dict[tuple[str, str], bytes] = {}
+        # Response of the Multicall3 address: None to execute calls, otherwise the raw JSON-RPC answer
+        self.multicall_response: Optional[dict] = None
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method == 'eth_chainId':
+            return {'jsonrpc': '2.0', 'id': 0, 'result': '0x1'}
+
+        if method == 'eth_getCode':
+            return {'jsonrpc': '2.0', 'id': 0, 'result': '0x'}
+
+        assert method == 'eth_call'
+        transaction, block_identifier = params
+        assert block_identifier == BLOCK_HASH
+        self.calls.append(transaction)
+
+        if transaction['to'].lower() != MULTICALL3_ADDRESS.lower():
+            return_data = self.return_data.get((transaction['to'].lower(), transaction['data']))
+            if return_data is None:
+                return {'jsonrpc': '2.0', 'id': 0, 'error': {'code': 3, 'message': 'execution reverted'}}
+            return {'jsonrpc': '2.0', 'id': 0, 'result': '0x' + return_data.hex()}
+
+        if self.multicall_response is not None:
+            return {'jsonrpc': '2.0', 'id': 0, **self.multicall_response}  # type: ignore[typeddict-item]
+
+        (calls,) = self.w3.codec.decode(['(address,bool,bytes)[]'], to_bytes(hexstr=transaction['data'])[4:])
+        results = []
+        for target, allow_failure, call_data in calls:
+            return_data = self.return_data.get((target.lower(), '0x' + call_data.hex()))
+            assert allow_failure
+            results.append((return_data is not None, return_data or b''))
+
+        result = self.w3.codec.encode(['(bool,bytes)[]'], [results])
+        return {'jsonrpc': '2.0', 'id': 0, 'result': '0x' + result.hex()}
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+
+@pytest.fixture()
+def w3(monkeypatch):
+    monkeypatch.setattr(src.variables, 'MULTICALL3_ADDRESS', MULTICALL3_ADDRESS)
+    w3 = Web3()
+    w3.provider = EVMStandIn(w3)
+    tweak_w3_contracts(w3)
+    return w3
+
+
+@pytest.fixture()
+def config(w3):
+    contract = w3.eth.contract(address=CONFIG_ADDRESS, abi=LidoContracts.load_abi('OracleDaemonConfig'))
+    for key, value in (('A', 1), ('B', 2)):
+        w3.provider.return_data[(CONFIG_ADDRESS, contract.functions.get(key).encode_call_data())] = w3.codec.encode(
+            ['bytes'], [value.to_bytes(32, 'big')],
+        )
+    return contract
+
+
+@pytest.fixture()
+def sanity_checker(w3):
+    contract = w3.eth.contract(
+        address=SANITY_CHECKER_ADDRESS,
+        abi=LidoContracts.load_abi('OracleReportSanityChecker'),
+        decode_tuples=True,
+    )
+    w3.provider.return_data[(SANITY_CHECKER_ADDRESS, contract.functions.getOracleReportLimits().encode_call_data())] = (
+        w3.codec.encode(['(' + ','.join(['uint256'] * 10) + ')'], [tuple(range(10))])
+    )
+    return contract
+
+
+def test_calls_are_aggregated(w3, config, sanity_checker):
+    functions = [config.functions.get('A'), sanity_checker.functions.getOracleReportLimits(), config.functions.get('B')]
+
+    results = aggregate_calls(w3, functions, BLOCK_HASH)
+
+    assert len(w3.provider.calls) == 1
+    assert w3.to_int(results[0]) == 1
+    assert results[1].churnValidatorsPerDayLimit == 0
+    assert results[1].oneOffCLBalanceDecreaseBPLimit == 1
+    assert w3.to_int(results[2]) == 2
+    # Results are the same as from the direct calls
+    assert results == [function.call(block_identifier=BLOCK_HASH) for function in functions]
+
+
+def test_failed_call_raises_contract_error(w3, config):
+    with pytest.raises(ContractLogicError):
+        aggregate_calls(w3, [config.functions.get('A'), config.functions.get('UNKNOWN')], BLOCK_HASH)
+
+    assert [call['to'].lower() for call in w3.provider.calls] == [MULTICALL3_ADDRESS.lower(), CONFIG_ADDRESS]
+
+
+def test_calls_are_not_aggregated_without_multicall(w3, config, monkeypatch):
+    monkeypatch.setattr(src.variables, 'MULTICALL3_ADDRESS', '')
+
+    results = aggregate_calls(w3, [config.functions.get('A'), config.functions.get('B')], BLOCK_HASH)
+
+    assert [w3.to_int(result) for result in results] == [1, 2]
+    assert [call['to'] for call in w3.provider.calls] == [CONFIG_ADDRESS, CONFIG_ADDRESS]
+
+
+@pytest.mark.parametrize('multicall_response', [
+    # Multicall3 is not deployed
+    {'result': '0x'},
+    {'error': {'code': 3, 'message': 'execution reverted'}},
+])
+def test_calls_are_not_aggregated_if_multicall_fails(w3, config, multicall_response):
+    w3.provider.multicall_response = multicall_response
+
+    results = aggregate_calls(w3, [config.functions.get('A'), config.functions.get('B')], BLOCK_HASH)
+
+    assert [w3.to_int(result) for result in results] == [1, 2]
+    assert [call['to'].lower() for call in w3.provider.calls] == [MULTICALL3_ADDRESS.lower(), CONFIG_ADDRESS, CONFIG_ADDRESS]
@@ -0,0 +1,139 @@
+import sqlite3
+from typing import Any, Optional
+from unittest.mock import Mock
+
+import pytest
+from web3 import Web3
+from web3.providers import BaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from src.metrics.prometheus.basic import CACHE_HITS, CACHE_SIZE
+from src.web3py import responses_cache
+from src.web3py.responses_cache import REGION, ELResponsesCache, construct_responses_cache_middleware
+
+pytestmark = pytest.mark.unit
+
+ADDRESS = '0x' + '1' * 40
+BLOCK_HASH = '0x' + 'ab' * 32
+FINALIZED_BLOCK = 100
+
+
+class CountingProvider(BaseProvider):
+    def __init__(self):
+        self.requests: list[tuple[str, Any]] = []
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self.requests.append((method, params))
+        results = {
+            'eth_chainId': '0x1',
+            'eth_call': '0x' + '00' * 31 + '2a',
+            'eth_getBalance': '0x10',
+            'eth_getLogs': [],
+            'eth_getBlockByNumber': {'number': hex(FINALIZED_BLOCK)},
+        }
+        return {'jsonrpc': '2.0', 'id': 0, 'result': results[method]}  # type: ignore[typeddict-item]
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+    def methods(self) -> list[str]:
+        # Chain id is requested by web3 to validate transactions
+        return [method for method, _ in self.requests if method != 'eth_chainId']
+
+
+def make_web3(path, cache: Optional[ELResponsesCache] = None) -> Web3:
+    w3 = Web3(CountingProvider())
+    cache = cache or ELResponsesCache(path / 'el_responses.sqlite', 2 ** 20)
+    w3.middleware_onion.inject(construct_responses_cache_middleware(cache), layer=0)
+    return w3
+
+
+def test_responses_are_reused_after_restart(tmp_path):
+    w3 = make_web3(tmp_path)
+    result = w3.eth.call({'to': ADDRESS, 'data': '0x'}, BLOCK_HASH)
+    balance = w3.eth.get_balance(ADDRESS, BLOCK_HASH)
+
+    restarted = make_web3(tmp_path)
+    hits = CACHE_HITS.labels(region=f'{REGION}:eth_call')._value.get()  # pylint: disable=protected-access
+
+    assert restarted.eth.call({'to': ADDRESS, 'data': '0x'}, BLOCK_HASH) == result
+    assert restarted.eth.get_balance(ADDRESS, BLOCK_HASH) == balance == 16
+    assert restarted.provider.methods() == []
+    assert CACHE_HITS.labels(region=f'{REGION}:eth_call')._value.get() == hits + 1  # pylint: disable=protected-access
+
+
+def test_only_finalized_blocks_are_cached(tmp_path):
+    w3 = make_web3(tmp_path)
+
+    for _ in range(2):
+        w3.eth.get_balance(ADDRESS, 'latest')
+        w3.eth.get_balance(ADDRESS, FINALIZED_BLOCK)
+        w3.eth.get_balance(ADDRESS, FINALIZED_BLOCK + 1)
+        w3.eth.get_logs({'fromBlock': 1, 'toBlock': FINALIZED_BLOCK})
+
+    assert w3.provider.methods() == [
+        'eth_getBalance',  # latest
+        'eth_getBlockByNumber',
+        'eth_getBalance',  # finalized
+        'eth_getBlockByNumber',
+        'eth_getBalance',  # not finalized yet
+        'eth_getLogs',
+        'eth_getBalance',  # latest
+        'eth_getBlockByNumber',
+        'eth_getBalance',  # not finalized yet
+    ]
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(responses_cache, 'EVICTION_PERIOD', 1)
+    cache = ELResponsesCache(tmp_path / 'el_responses.sqlite', 100)
+
+    cache.save('first', 'x' * 40)
+    cache.save('second', 'x' * 40)
+    assert cache.get('first') is not None
+    cache.save('third', 'x' * 40)
+
+    assert cache.get('second') is None
+    assert cache.get('first') == cache.get('third') == 'x' * 40
+    assert cache_size() == 2
+
+    # Saved again response is not counted twice
+    cache.save('third', 'y' * 10)
+    assert cache.get('third') == 'y' * 10
+    assert cache_size() == 2
+
+    # Size is counted once on start
+    ELResponsesCache(tmp_path / 'el_responses.sqlite', 100)
+    assert cache_size() == 2
+
+
+
+def test_use_time_is_saved_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(responses_cache, 'USED_FLUSH_PERIOD', 2)
+    cache = ELResponsesCache(tmp_path / 'el_responses.sqlite', 2 ** 20)
+    cache.save('first', 1)
+    cache.save('second', 2)
+
+    def used() -> dict:
+        return dict(cache._db.execute('SELECT key, used FROM responses').fetchall())  # pylint: disable=protected-access
+
+    saved_used = used()
+    cache.get('first')
+    assert used() == saved_used
+    cache.get('second')
+    assert used()['first'] > saved_used['first']
+    assert used()['second'] > saved_used['second']
+
+
+def test_database_errors_do_not_fail_requests(tmp_path):
+    cache = ELResponsesCache(tmp_path / 'el_responses.sqlite', 2 ** 20)
+    cache._db = Mock(execute=Mock(side_effect=sqlite3.OperationalError('database is locked')))  # pylint: disable=protected-access
+    w3 = make_web3(tmp_path, cache)
+
+    assert w3.eth.get_balance(ADDRESS, BLOCK_HASH) == 16
+    assert w3.eth.get_balance(ADDRESS, BLOCK_HASH) == 16
+    assert w3.provider.methods() == ['eth_getBalance', 'eth_getBalance']
+
+
+def cache_size() -> float:
+    return CACHE_SIZE.labels(region=REGION)._value.get()  # pylint: disable=protected-access
@@ -0,0 +1,94 @@
+import random
+from unittest.mock import Mock
+
+import pytest
+
+from src.constants import FAR_FUTURE_EPOCH, MAX_EFFECTIVE_BALANCE
+from src.providers.consensus.registry import ValidatorRegistry
+from src.typings import EpochNumber
+from src.utils.validator_state import (
+    calculate_active_effective_balance_sum,
+    is_active_validator,
+    is_fully_withdrawable_validator,
+    is_on_exit,
+    is_partially_withdrawable_validator,
+)
+from src.web3py.extensions.validator_set_stats import ValidatorSetStats
+from tests.factory.blockstamp import ReferenceBlockStampFactory
+from tests.providers_clients.test_consensus_client import validator_response
+
+
+def random_validators_responses(rnd: random.Random, count: int) -> list[dict]:
+    responses = [validator_response(i) for i in range(count)]
+    for response in responses:
+        state = response['validator']
+        response['balance'] = str(rnd.choice([0, MAX_EFFECTIVE_BALANCE - 1, MAX_EFFECTIVE_BALANCE + 1]))
+        state['withdrawal_credentials'] = rnd.choice(['0x00', '0x01']) + '0' * 62
+        state['slashed'] = rnd.random() < 0.2
+        state['activation_epoch'] = str(rnd.choice([0, 50, FAR_FUTURE_EPOCH]))
+        state['exit_epoch'] = str(rnd.choice([0, 90, 100, 110, FAR_FUTURE_EPOCH]))
+        state['withdrawable_epoch'] = str(rnd.choice([90, 100, 8300, FAR_FUTURE_EPOCH]))
+    return responses
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(10))
+def test_validator_set_stats(seed):
+    rnd = random.Random(seed)
+    registry = ValidatorRegistry.from_responses(random_validators_responses(rnd, 200))
+    validators = list(registry)
+    ref_epoch = EpochNumber(100)
+
+    exit_epochs = [int(v.validator.exit_epoch) for v in validators if is_on_exit(v)]
+    expected = ValidatorSetStats(
+        active_validators_count=sum(is_active_validator(v, ref_epoch) for v in validators),
+        active_effective_balance_sum=calculate_active_effective_balance_sum(validators, ref_epoch),
+        max_exit_epoch=EpochNumber(max(exit_epochs, default=0)),
+        max_exit_epoch_validators_count=exit_epochs.count(max(exit_epochs, default=0)),
+        withdrawable_validators_count=sum(
+            is_partially_withdrawable_validator(v) or is_fully_withdrawable_validator(v, ref_epoch)
+            for v in validators
+        ),
+        not_on_exit_validators_count=sum(not is_on_exit(v) for v in validators),
+        slashed_with_midterm_impact=[
+            v for v in validators if v.validator.slashed and int(v.validator.withdrawable_epoch) > ref_epoch
+        ],
+    )
+
+    assert ValidatorSetStats.from_validators(validators, ref_epoch) == expected
+    assert ValidatorSetStats.from_validators(registry, ref_epoch) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("exit_epochs", "expected"),
+    [
+        ([], (0, 0)),
+        ([FAR_FUTURE_EPOCH, FAR_FUTURE_EPOCH], (0, 0)),
+        ([FAR_FUTURE_EPOCH, 42, 42, 1], (42, 2)),
+        ([7, FAR_FUTURE_EPOCH, 3], (7, 1)),
+        ([0, FAR_FUTURE_EPOCH], (0, 1)),
+    ],
+)
+def test_validator_set_stats_max_exit_epoch(exit_epochs, expected):
+    responses = [validator_response(i) for i in range(len(exit_epochs))]
+    for response, exit_epoch in zip(responses, exit_epochs):
+        response['validator']['exit_epoch'] = str(exit_epoch)
+    registry = ValidatorRegistry.from_responses(responses)
+
+    for validators in (list(registry), registry):
+        stats = ValidatorSetStats.from_validators(validators, EpochNumber(100))
+        assert (stats.max_exit_epoch, stats.max_exit_epoch_validators_count) == expected
+
+
+@pytest.mark.unit
+def test_get_validator_set_stats(web3, consensus_client):
+    blockstamp = ReferenceBlockStampFactory.build(ref_epoch=100)
+    registry = ValidatorRegistry.from_responses(random_validators_responses(random.Random(0), 50))
+    web3.cc.get_validators = Mock(return_value=registry)
+
+    stats = web3.validator_set_stats.get_validator_set_stats(blockstamp)
+    assert stats == ValidatorSetStats.from_validators(registry, blockstamp.ref_epoch)
+
+    web3.validator_set_stats.get_validator_set_stats(blockstamp)
+    web3.cc.get_validators.assert_called_once_with(blockstamp)